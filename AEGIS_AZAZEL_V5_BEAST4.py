@@ -19,12 +19,70 @@ v5 — SONIC BOOM · F22 AIR SUPERIORITY
   + Resonance Judas + Cascade Echo (lethality 9.9)
 
   "Light as the wind. Fast and lethal."
+
+Importing runs nothing; the battery is main() (run as a script):
+  import AEGIS_AZAZEL_V5_BEAST4 as az
+  w = az.Wall(cache="/tmp/azazel")     # built or mmap'd on first use
+  o = w.oracle(b"SALT")                # Av5 session bound to w
+  o.query(42)
 """
-import time, hashlib, random
+import time, hashlib, random, os, sys, io, mmap, struct, argparse, json, importlib.util
+import gc as pygc   # gc() is the GF(4) coordinate getter below
+import resource, tempfile, socket, signal
+from itertools import accumulate
 from math import log2, sqrt
-from collections import deque
+from collections import deque, OrderedDict
+from array import array
+def _lazy(name):
+    """Module that executes on first attribute access (importlib LazyLoader),
+    None if not installed: importing this file stays cheap."""
+    if name in sys.modules: return sys.modules[name]
+    spec=importlib.util.find_spec(name)
+    if spec is None: return None
+    spec.loader=importlib.util.LazyLoader(spec.loader)
+    m=importlib.util.module_from_spec(spec); sys.modules[name]=m; spec.loader.exec_module(m)
+    return m
+np=_lazy('numpy')          # only --engine vec, the analytics and Av5L need it
+asyncio=_lazy('asyncio')   # only --serve/--loadgen and their benches
+mp=_lazy('multiprocessing')
 
-t0 = time.time()
+ap=argparse.ArgumentParser(description="AEGIS AZAZEL v5 — BEAST 4")
+ap.add_argument('--cache', metavar='DIR', default=os.environ.get('AZAZEL_CACHE'),
+                help="mmap the GORGON wall from DIR (built and stored on miss; build stages cached in DIR/stages)")
+ap.add_argument('--sr', type=int, default=5000, help="real spread lines sampled")
+ap.add_argument('--sd', type=int, default=5000, help="decoy lines")
+ap.add_argument('--full-spread', action='store_true',
+                help="use all 1,118,481 spread lines of PG(11,4) (5,592,405 columns)")
+ap.add_argument('--engine', choices=('scalar','vec'), default='scalar',
+                help="corruption engine: scalar (reference) or vec (NumPy array passes)")
+ap.add_argument('--jobs', type=int, default=1, metavar='N',
+                help="worker processes for the line build and --sweep (output is independent of N)")
+ap.add_argument('--serve', metavar='ADDR',
+                help="serve the oracle on HOST:PORT or unix:PATH instead of the battery")
+ap.add_argument('--loadgen', metavar='ADDR', help="drive a --serve instance, report p50/p99 and q/s")
+ap.add_argument('--budget-mb', type=int, default=256, metavar='MB',
+                help="--serve session memory budget (LRU eviction past it)")
+ap.add_argument('--prof', action='store_true',
+                help="--serve: per-stage query latency histograms (P frame → Prometheus text)")
+ap.add_argument('--deadline', type=float, default=0, metavar='US',
+                help="--serve: per-query latency budget; mirror mass-Judas work runs ahead in the slack")
+ap.add_argument('--workers', type=int, default=0, metavar='N',
+                help="--serve with N forked query workers over a shared-memory wall (0: in-process)")
+ap.add_argument('--bench', metavar='NAME',
+                help="run a named benchmark (gf4, tmat, query, ...) instead of the battery")
+ap.add_argument('--reps', type=int, default=5, metavar='N', help="--bench phases: runs per stage")
+ap.add_argument('--json', metavar='PATH',
+                help="--bench phases: write the results here; --sweep: one JSON line per sample")
+ap.add_argument('--record', metavar='PATH',
+                help="trace every query of the battery or --serve here (PATH.i per --workers worker)")
+ap.add_argument('--replay', nargs='+', metavar='PATH',
+                help="replay traces offline: q/s, Av5.s counters and the response digest")
+ap.add_argument('--sweep', type=int, default=0, metavar='N',
+                help="run the attack battery over N salts/attacker seeds (--jobs processes), aggregate")
+ap.add_argument('--compare', nargs=2, metavar=('OLD','NEW'),
+                help="diff two --bench phases JSON files, exit 1 on a regression")
+ap.add_argument('--threshold', type=float, default=10.0, metavar='PCT',
+                help="--compare: slowdown (best-of-reps) that counts as a regression")
 
 # ══════════════════════════════════════════════════════════════
 # 0. GF(4) CORE — FLAT TABLES
@@ -33,23 +91,27 @@ _AF = (0,1,2,3, 1,0,3,2, 2,3,0,1, 3,2,1,0)
 _MF = (0,0,0,0, 0,1,2,3, 0,2,3,1, 0,3,1,2)
 _INV = (0,1,3,2); _FROB = (0,1,3,2); DIM = 12
 
-def pack12(vals):
-    r = 0
-    for i in range(12): r |= (vals[i]&3) << (i*2)
-    return r
-def unpack12(p): return [(p>>(i*2))&3 for i in range(12)]
+# SWAR kernel: a packed column holds coordinate i in bits 2i (lo) and 2i+1 (hi),
+# i.e. x = lo + hi·ω. Addition is XOR; ω·x = hi + (lo^hi)ω; x² = (lo^hi) + hi·ω.
+M5 = 0x555555; M24 = 0xFFFFFF
+_U6 = [(p&3,p>>2&3,p>>4&3,p>>6&3,p>>8&3,p>>10&3) for p in range(4096)]
+
+def pack12(v):
+    return ((v[0]&3)|(v[1]&3)<<2|(v[2]&3)<<4|(v[3]&3)<<6|(v[4]&3)<<8|(v[5]&3)<<10|(v[6]&3)<<12
+            |(v[7]&3)<<14|(v[8]&3)<<16|(v[9]&3)<<18|(v[10]&3)<<20|(v[11]&3)<<22)
+def unpack12(p): return [*_U6[p&4095], *_U6[(p>>12)&4095]]
 def gc(p,i): return (p>>(i*2))&3
 def sc(p,i,v): return (p & ~(3<<(i*2))) | ((v&3)<<(i*2))
 def pdist(a,b):
-    x = a^b; d = 0
-    for i in range(12):
-        if (x>>(i*2))&3: d += 1
-    return d
-def padd(a,b):
-    r = 0
-    for i in range(12):
-        r |= _AF[((a>>(i*2))&3)*4+((b>>(i*2))&3)] << (i*2)
-    return r
+    x = a^b
+    return ((x | x>>1) & M5).bit_count()
+def padd(a,b): return (a^b) & M24
+def pmul(p,a):
+    """a·p for scalar a ∈ GF(4), all 12 lanes at once."""
+    if a < 2: return p if a else 0
+    l = p & M5; h = (p>>1) & M5
+    return h | (l^h)<<1 if a == 2 else (l^h) | l<<1
+def pfrob(p): return p ^ ((p>>1) & M5)
 
 # ══════════════════════════════════════════════════════════════
 # XORSHIFT128+ PRNG (replaces per-query SHA256)
@@ -73,72 +135,88 @@ class XS:
 # INCREMENTAL WINDOW RANK (Gemini+Grok: O(12×rank) per add)
 # ══════════════════════════════════════════════════════════════
 class WRank:
-    __slots__ = ('basis','piv','rank','vecs','_rc')
+    """Exact rank of the last `win` packed vectors (timestamped echelon basis).
+
+    basis[p] has pivot lane p (coefficient 1, lanes < p zero). On insert the
+    newer of two vectors keeps the pivot and the older one is reduced onward,
+    so the basis always spans the newest vectors first and the window rank
+    is the number of pivots stamped inside the window. O(12) per add.
+    """
+    __slots__ = ('basis','bt','win','t','rank')
     def __init__(self, win=64):
-        self.basis = [[0]*12 for _ in range(12)]
-        self.piv = [-1]*12; self.rank = 0
-        self.vecs = deque(maxlen=win); self._rc = 0
+        self.basis = [0]*12; self.bt = [0]*12
+        self.win = win; self.t = 0; self.rank = 0
     def add(self, v):
-        self.vecs.append(v[:])
-        vv = list(v)
+        self.t += 1; ct = self.t; b = self.basis; bt = self.bt
         for p in range(12):
-            if self.piv[p] >= 0 and vv[p]:
-                f = vv[p]
-                b = self.basis[p]
-                for j in range(12): vv[j] = _AF[vv[j]*4 + _MF[f*4 + b[j]]]
-        for i in range(12):
-            if vv[i] and self.piv[i] < 0:
-                inv = _INV[vv[i]]
-                self.basis[i] = [_MF[inv*4+vv[j]] for j in range(12)]
-                self.piv[i] = i; self.rank += 1; break
-        self._rc += 1
-        if self._rc >= 8:
-            self._rebuild(); self._rc = 0
+            c = (v>>(p*2))&3
+            if not c: continue
+            if not bt[p]:
+                b[p] = pmul(v, _INV[c]); bt[p] = ct; break
+            if bt[p] < ct:
+                b[p], v = pmul(v, _INV[c]), b[p]; bt[p], ct = ct, bt[p]; c = 1
+            v ^= pmul(b[p], c)
+        lo = max(self.t - self.win, 0)
+        self.rank = sum(1 for x in bt if x > lo)
         return self.rank
-    def _rebuild(self):
-        old = list(self.vecs)
-        self.basis = [[0]*12 for _ in range(12)]
-        self.piv = [-1]*12; self.rank = 0; self._rc = 0
-        for v in old:
-            vv = list(v)
-            for p in range(12):
-                if self.piv[p] >= 0 and vv[p]:
-                    f = vv[p]; b = self.basis[p]
-                    for j in range(12): vv[j] = _AF[vv[j]*4 + _MF[f*4 + b[j]]]
-            for i in range(12):
-                if vv[i] and self.piv[i] < 0:
-                    inv = _INV[vv[i]]
-                    self.basis[i] = [_MF[inv*4+vv[j]] for j in range(12)]
-                    self.piv[i] = i; self.rank += 1; break
 
 # ══════════════════════════════════════════════════════════════
 # LAZY T — Row-op chain, flatten every 32 ops
 # ══════════════════════════════════════════════════════════════
 def t_identity(): return list(range(12)), [[0]*12 for _ in range(12)]
-# T stored as flat[144] but updated via row ops
+# T stored as 12 packed rows (row i = 24-bit column of lane values), so a row op
+# is one pmul + XOR and T×v is 12 bit-sliced inner products.
+
+class TMat(list):
+    """Packed-row T plus an on-demand byte-sliced LUT, dropped by any row op."""
+    __slots__ = ('lut','nd')
+    def __init__(self, rows):
+        super().__init__(rows); self.lut = None; self.nd = 0
+    def copy(self):
+        c = TMat(self); c.lut = self.lut; c.nd = self.nd; return c
 
-def mat_id_flat():
-    M = [0]*144
-    for i in range(12): M[i*12+i] = 1
-    return M
+def mat_id():
+    return TMat([1 << (i*2) for i in range(12)])
+
+# Compile once T has served LUT_MIN direct products unchanged (a compile costs
+# about that many direct products).
+LUT_MIN = 12
 
 def row_op(T, i, j, alpha):
-    """T[i] += alpha * T[j] over GF(4). O(12)."""
-    oi = i*12; oj = j*12
-    for k in range(12): T[oi+k] = _AF[T[oi+k]*4 + _MF[alpha*4 + T[oj+k]]]
+    """T[i] += alpha * T[j] over GF(4). O(1) word ops."""
+    T[i] ^= pmul(T[j], alpha); T.lut = None; T.nd = 0
 
 def row_op_frob(T, i, j, alpha):
-    """T[i] += alpha * Frob(T[j]). O(12)."""
-    oi = i*12; oj = j*12
-    for k in range(12): T[oi+k] = _AF[T[oi+k]*4 + _MF[alpha*4 + _FROB[T[oj+k]]]]
+    """T[i] += alpha * Frob(T[j]). O(1) word ops."""
+    T[i] ^= pmul(pfrob(T[j]), alpha); T.lut = None; T.nd = 0
+
+def compile_T(T):
+    """Three 256-entry tables: tab[c][b] = T × (lanes 4c..4c+3 of the column = b)."""
+    tabs = []
+    for c in range(3):
+        tab = [0]
+        for m in range(4):
+            k = 4*c + m; col = 0
+            for i in range(12): col |= ((T[i]>>(k*2))&3) << (i*2)
+            c2 = pmul(col, 2); c3 = col ^ c2
+            tab = tab + [x^col for x in tab] + [x^c2 for x in tab] + [x^c3 for x in tab]
+        tabs.append(tab)
+    return tabs
 
 def apply_T_to_packed(T, pv):
-    """T × packed_vector. O(144)."""
-    v = unpack12(pv); r = 0
+    """T × packed_vector: 3 lookups + 2 XORs when compiled, else bit-sliced rows."""
+    lut = T.lut
+    if lut is not None:
+        return lut[0][pv&255] ^ lut[1][(pv>>8)&255] ^ lut[2][(pv>>16)&255]
+    T.nd += 1
+    if T.nd >= LUT_MIN:
+        T.lut = lut = compile_T(T)
+        return lut[0][pv&255] ^ lut[1][(pv>>8)&255] ^ lut[2][(pv>>16)&255]
+    v0 = pv & M5; v1 = (pv>>1) & M5; vx = v0 ^ v1; r = 0
     for i in range(12):
-        s = 0; oi = i*12
-        for k in range(12): s = _AF[s*4 + _MF[T[oi+k]*4 + v[k]]]
-        r |= (s << (i*2))
+        t = T[i]; t0 = t & M5; t1 = (t>>1) & M5
+        r |= ((((t0&v0) ^ (t1&v1)).bit_count() & 1)
+              | (((t0&v1) ^ (t1&vx)).bit_count() & 1) << 1) << (i*2)
     return r
 
 def apply_row_ops(T, ops):
@@ -161,349 +239,1070 @@ def gen_ops(h_bytes, intensity):
         ops.append((i, j, rng.randint(1,3), frob))
     return ops
 
-print("=" * 72)
-print("  AEGIS AZAZEL v5 — BEAST 4 · SONIC BOOM")
-print("  7 Hells + Tilt · Incremental Rank · Lazy T · XorShift · Fused Battery")
-print("  'Light as the wind. Fast and lethal.'")
-print("=" * 72)
+_FOPS = {'minor':(2,2), 'major':(6,3), 'frobenius':(8,3)}
+def gen_ops_fast(h_bytes, intensity):
+    """gen_ops read directly off a 32-byte digest (no Mersenne Twister):
+    n from byte 0, then 3 bytes per op → distinct (i,j) and alpha ∈ {1,2,3}."""
+    lo, sp = _FOPS[intensity]; frob = intensity == 'frobenius'; ops = []
+    for k in range(1, 1 + 3*(lo + h_bytes[0] % sp), 3):
+        i = h_bytes[k] % 12
+        ops.append((i, (i + 1 + h_bytes[k+1] % 11) % 12, 1 + h_bytes[k+2] % 3, frob))
+    return ops
 
 # ══════════════════════════════════════════════════════════════
 # 1. GORGON HERITAGE (early CI exit)
 # ══════════════════════════════════════════════════════════════
-print("\n  ═══ GORGON ═══", flush=True)
-t_sp = time.time()
 aa = 2
 def gf16_mul(x,y):
     return (_AF[_MF[x[0]*4+y[0]]*4+_MF[_MF[x[1]*4+y[1]]*4+aa]],
             _AF[_AF[_MF[x[0]*4+y[1]]*4+_MF[x[1]*4+y[0]]]*4+_MF[x[1]*4+y[1]]])
+# GF(16) as ints e = 4a+b for (a,b) = a + bβ (same order as gf16_all); 1 is e=4.
+_G16M = tuple((lambda m: m[0]*4+m[1])(gf16_mul((x>>2,x&3),(y>>2,y&3)))
+              for x in range(16) for y in range(16))
+_G16I = tuple(next((y for y in range(16) if _G16M[x*16+y]==4), 0) for x in range(16))
+# β-multiple of coordinate pair (a,b) as a packed 2-lane nibble a | b<<2
+_G16N = tuple((m>>2)|(m&3)<<2 for m in _G16M)
 def gf16_inv(x):
-    r=(1,0)
-    for _ in range(14): r=gf16_mul(r,x)
-    return r
+    e=_G16I[x[0]*4+x[1]]; return (e>>2, e&3)
 gf16_nz=[(a,b) for a in range(4) for b in range(4) if not(a==0 and b==0)]
 def normalize(v):
     for i in range(len(v)):
         if v[i]!=0: inv=_INV[v[i]]; return tuple(_MF[inv*4+x] for x in v)
     return None
-def spread_line(pt6):
+def pnorm(x):
+    """Packed normalize: scale so the first nonzero lane is 1 (x != 0)."""
+    lo=((x|x>>1)&M5); lo&=-lo
+    return pmul(x, _INV[(x>>(lo.bit_length()-1))&3])
+def _line_pts(e6):
+    """Spread line of a normalized GF(16)^6 point (ints): its 5 GF(4) points, in
+    first-seen order over the 15 nonzero β-scalars (set order = legacy order)."""
     pts=set()
-    for s in gf16_nz:
-        v=[]
-        for k in range(6): sx=gf16_mul(s,pt6[k]); v.extend([sx[0],sx[1]])
-        p=normalize(tuple(v))
-        if p: pts.add(p)
+    for sv in range(1,16):
+        o=sv*16; x=0
+        for k in range(6): x|=_G16N[o+e6[k]]<<(k*4)
+        pts.add(tuple(unpack12(pnorm(x))))
     return list(pts)
-
-SR=5000; SD=5000; gf16_all=[(a,b) for a in range(4) for b in range(4)]
-spread_rng=random.Random(hashlib.sha256(b"GORGON_PG11_SPREAD").digest())
-real_lines=[]; rls=set(); att=0
-while len(real_lines)<SR and att<SR*5:
-    att+=1
-    pt6_raw=[gf16_all[spread_rng.randint(0,15)] for _ in range(6)]
-    if all(x==(0,0) for x in pt6_raw): continue
-    pt6n=None
-    for k in range(6):
-        if pt6_raw[k]!=(0,0):
-            inv=gf16_inv(pt6_raw[k])
-            pt6n=tuple(gf16_mul(inv,pt6_raw[j]) for j in range(6)); break
-    if pt6n is None or pt6n in rls: continue
-    rls.add(pt6n); pts=spread_line(pt6n)
-    if len(pts)==5: real_lines.append(pts)
-n_real=len(real_lines)
-
-spts=[]; spti={}
-for L in real_lines:
-    for p in L:
-        if p not in spti: spti[p]=len(spts); spts.append(p)
-
-dr=random.Random(31337); decoy_lines=[]
-for _ in range(SD*2):
-    if len(decoy_lines)>=SD: break
-    v1=tuple(dr.randint(0,3) for _ in range(DIM)); v2=tuple(dr.randint(0,3) for _ in range(DIM))
-    if all(x==0 for x in v1) or all(x==0 for x in v2): continue
-    pts=set()
+def _decoy_pts(v12):
+    """GF(4) line through two packed vectors: its normalized points."""
+    v1,v2=v12; pts=set()
     for c1 in range(4):
+        m1=pmul(v1,c1)
         for c2 in range(4):
-            v=tuple(_AF[_MF[c1*4+v1[k]]*4+_MF[c2*4+v2[k]]] for k in range(DIM))
-            if not all(x==0 for x in v):
-                p=normalize(v)
-                if p: pts.add(p)
-    if len(pts)==5: decoy_lines.append(list(pts))
-for L in decoy_lines:
-    for p in L:
-        if p not in spti: spti[p]=len(spts); spts.append(p)
-NS=len(spts)
-
-Hcp=[pack12(list(p)) for p in spts]
-rcs=set()
-for L in real_lines:
-    for p in L:
-        j=spti.get(p)
-        if j is not None: rcs.add(j)
-
-print(f"  {n_real:,}r+{len(decoy_lines):,}d={NS:,} ({time.time()-t_sp:.1f}s)", flush=True)
-
-# Corruption
-tc=time.time()
+            x=m1^pmul(v2,c2)
+            if x: pts.add(tuple(unpack12(pnorm(x))))
+    return list(pts)
+def spread_line(pt6):
+    return _line_pts(tuple(x[0]*4+x[1] for x in pt6))
+
+def _chunk(fn_items):
+    fn,items=fn_items; return [fn(x) for x in items]
+
+def pmap(fn, items, jobs=1):
+    """Order-preserving map over a fork pool. Output never depends on jobs."""
+    if jobs<=1 or len(items)<64 or 'fork' not in mp.get_all_start_methods():
+        return [fn(x) for x in items]
+    k=max(1,len(items)//(jobs*4)); parts=[(fn,items[i:i+k]) for i in range(0,len(items),k)]
+    with mp.get_context('fork').Pool(jobs) as pool:
+        return [y for part in pool.map(_chunk, parts) for y in part]
+
+def _draws(rng, n, hi):
+    """n × rng.randint(0,hi) for hi+1 a power of two, via getrandbits with
+    CPython's _randbelow rejection (k = (hi+1).bit_length()): same stream."""
+    grb=rng.getrandbits; k=(hi+1).bit_length(); out=[]
+    for _ in range(n):
+        r=grb(k)
+        while r>hi: r=grb(k)
+        out.append(r)
+    return out
+
+def sample_spread(sr, jobs=1):
+    """sr sampled spread lines. Sampling is the legacy single RNG stream; only
+    the line expansion (pure in its input) is sharded across jobs."""
+    spread_rng=random.Random(hashlib.sha256(b"GORGON_PG11_SPREAD").digest())
+    cand=[]; rls=set(); att=0
+    while len(cand)<sr and att<sr*5:
+        att+=1
+        raw=_draws(spread_rng,6,15)
+        k=next((k for k in range(6) if raw[k]), None)
+        if k is None: continue
+        o=_G16I[raw[k]]*16; pt6n=tuple(_G16M[o+x] for x in raw)
+        if pt6n in rls: continue
+        rls.add(pt6n); cand.append(pt6n)
+    # a nonzero GF(16)^6 point spans 15 vectors = 5 GF(4)*-orbits: always 5 points
+    return pmap(_line_pts, cand, jobs)
+
+def sample_decoys(sd, jobs=1):
+    """sd decoy lines (random GF(4) lines through two vectors)."""
+    dr=random.Random(31337); decoy_lines=[]; left=sd*2
+    while len(decoy_lines)<sd and left>0:   # draw only what the legacy loop would reach
+        pairs=[]
+        for _ in range(min(sd-len(decoy_lines),left)):
+            v=_draws(dr,2*DIM,3); left-=1
+            if any(v[:DIM]) and any(v[DIM:]): pairs.append((pack12(v[:DIM]),pack12(v[DIM:])))
+        for L in pmap(_decoy_pts, pairs, jobs):
+            if len(L)==5:
+                decoy_lines.append(L)
+                if len(decoy_lines)>=sd: break
+    return decoy_lines
+
+# ── Column sets and line adjacency, shared read-only by every oracle ──
+class Bits:
+    """Read-only bitmap over a u32 view. Drop-in for the rcs/thc sets."""
+    __slots__=('w','n')
+    def __init__(self, w, n): self.w=w; self.n=n
+    def __contains__(self, j): return 0<=j<len(self.w)*32 and (self.w[j>>5]>>(j&31))&1==1
+    def __iter__(self):
+        for k,x in enumerate(self.w):
+            while x:
+                b=x&-x; yield (k<<5)|(b.bit_length()-1); x^=b
+    def __len__(self): return self.n
+
+class Adj:
+    """CSR adjacency: row i is idx[off[i]:off[i+1]]. Hot loops walk off/idx directly;
+    get/[] keep the old dict-of-lists call sites working."""
+    __slots__=('off','idx')
+    def __init__(self, off, idx): self.off=off; self.idx=idx
+    def get(self, i, d=None):
+        if 0<=i<len(self.off)-1:
+            a=self.off[i]; b=self.off[i+1]
+            if a<b: return self.idx[a:b]
+        return d
+    def __getitem__(self, i):
+        r=self.get(i)
+        if r is None: raise KeyError(i)
+        return r
+    def __len__(self): return len(self.off)-1
+
+def build_lines(sr, sd, jobs=1): return sample_spread(sr,jobs), sample_decoys(sd,jobs)
+
+def sampled_geometry(sr, sd, jobs=1):
+    """sr sampled spread lines + sd decoys → columns, rcs and line adjacency."""
+    return line_geometry(*build_lines(sr,sd,jobs))
+
+def line_geometry(real_lines, decoy_lines):
+    n_real=len(real_lines)
+    spts=[]; spti={}
+    for L in real_lines:
+        for p in L:
+            if p not in spti: spti[p]=len(spts); spts.append(p)
+
+    for L in decoy_lines:
+        for p in L:
+            if p not in spti: spti[p]=len(spts); spts.append(p)
+
+    Hcp=[pack12(list(p)) for p in spts]
+    rcs=set()
+    for L in real_lines:
+        for p in L:
+            j=spti.get(p)
+            if j is not None: rcs.add(j)
+
+    off=array('I',[0]); idx=array('I')
+    for L in real_lines+decoy_lines: idx.extend(map(spti.__getitem__,L)); off.append(len(idx))
+    l2c=Adj(off,idx); c2l=csr_transpose(l2c,len(Hcp))
+    return Hcp,rcs,c2l,l2c,n_real,len(decoy_lines)
+
+# ── Full spread: all (16^6-1)/15 lines of PG(11,4), array-backed ──
+# Line E (24-bit: six GF(16) nibbles, leading nonzero = 1) has its 5 points at
+# the coset reps β^0..β^4 of GF(16)*/GF(4)*; _FSP[r] maps a nibble pair to the
+# packed β^r-multiple, so a line is 5 × (3 lookups + pnorm).
+_BREP = [4]
+for _ in range(4): _BREP.append(_G16M[_BREP[-1]*16+1])   # β = e 1 is primitive
+_FSP = [tuple(_G16N[s*16+(e>>4)] | _G16N[s*16+(e&15)]<<4 for e in range(256)) for s in _BREP]
+NP_FULL = (4**12-1)//3; NL_FULL = (16**6-1)//15
+_PROFF = [sum(4**(11-m) for m in range(k)) for k in range(12)]
+
+def prank(x):
+    """Perfect hash of a normalized packed point onto [0, NP_FULL)."""
+    lo=((x|x>>1)&M5); lo&=-lo; k=lo.bit_length()-1
+    return _PROFF[k>>1] + (x>>(k+2))
+
+def _fs_lines(span):
+    out=array('I'); f0,f1,f2,f3,f4=_FSP
+    for E in range(*span):
+        h=E>>16; m=(E>>8)&255; l=E&255
+        for t in (f0,f1,f2,f3,f4): out.append(pnorm(t[h]|t[m]<<8|t[l]<<16))
+    return out.tobytes()
+
+def full_spread(jobs=1):
+    """Every spread line, 5 packed points each (column j on line j//5), plus the
+    point → column index pos[prank(x)]. Lines enumerate E in leading-nibble order."""
+    spans=[]
+    for k in range(6):
+        a=4<<(4*(5-k)); b=a+16**(5-k)
+        spans+=[(x,min(x+8192,b)) for x in range(a,b,8192)]
+    pts=array('I')
+    for blob in pmap(_fs_lines, spans, jobs): pts.frombytes(blob)
+    pos=array('I',bytes(4*NP_FULL))
+    for j,x in enumerate(pts):
+        lo=((x|x>>1)&M5); lo&=-lo; k=lo.bit_length()-1
+        pos[_PROFF[k>>1]+(x>>(k+2))]=j
+    return pts,pos
+
+def csr_transpose(adj, n):
+    """c2l from l2c (both Adj): counting sort, line order kept per column."""
+    cnt=array('I',bytes(4*n))
+    for j in adj.idx: cnt[j]+=1
+    off=array('I',accumulate(cnt,initial=0)); fill=array('I',off[:-1])
+    idx=array('I',bytes(4*off[-1])); o=adj.off; aidx=adj.idx
+    for li in range(len(o)-1):
+        for j in aidx[o[li]:o[li+1]]: idx[fill[j]]=li; fill[j]+=1
+    return Adj(off,idx)
+
+def full_geometry(sd, jobs=1):
+    """Full spread as columns. Every point is a spread point, so the decoy class
+    is the overlay: columns on the sd decoy lines; rcs is its complement."""
+    return full_columns(*full_spread(jobs), sample_decoys(sd,jobs))
+
+def full_columns(pts, pos, decoy_lines):
+    ns=len(pts)
+    dcols=[[pos[prank(pack12(p))] for p in L] for L in decoy_lines]
+    off=array('I',range(0,ns+1,5)); idx=array('I',range(ns))
+    for L in dcols: idx.extend(L); off.append(len(idx))
+    l2c=Adj(off,idx); c2l=csr_transpose(l2c,ns)
+    dset={j for L in dcols for j in L}
+    w=array('I',[0xFFFFFFFF])*((ns+31)//32)
+    if ns&31: w[-1]=(1<<(ns&31))-1
+    for j in dset: w[j>>5]&=~(1<<(j&31))&0xFFFFFFFF
+    return pts,Bits(w,ns-len(dset)),c2l,l2c,NL_FULL,len(dcols)
+
+def peak_rss_mb():
+    ru=resource.getrusage
+    return max(ru(resource.RUSAGE_SELF).ru_maxrss, ru(resource.RUSAGE_CHILDREN).ru_maxrss)/1024
+
+TT=9
 sg=hashlib.sha256(b"AEGIS_v16_GORGON_FINAL").digest()
 sg=hashlib.sha256(sg+hashlib.sha256(b"PG11_4_7VENOMS_AZAZEL_F1").digest()).digest()
 asig=b"Rafael Amichis Luengo <tretoef@gmail.com>"
-mr=random.Random(int.from_bytes(sg,'big'))
-Hp=list(Hcp)
-def nr2(): return random.Random(mr.randint(0,2**64))
-
-r=nr2()
-for j in range(NS):
-    if r.random()<0.15:
-        cs=int.from_bytes(hashlib.sha256(sg+b"EC"+j.to_bytes(4,'big')).digest()[:4],'big')
-        cr=random.Random(cs); v=0
-        for i in range(12): v|=(cr.randint(0,3)<<(i*2))
+vrng=random.Random(int.from_bytes(hashlib.sha256(sg+b"AZAZEL_ORDER").digest()[:8],'big'))
+vid=['A','B','C','D','E','F','G']; vrng.shuffle(vid)
+
+def build_gorgon(sr=5000, sd=5000, full=False, engine='scalar', jobs=1, log=False, cache=None, tt=TT):
+    """Geometry + adjacency, then corruption + 7 Venoms + CI. Deterministic in sg.
+    With cache (a directory) every stage's output is kept under its stage key
+    and reused, so only the stages downstream of a change run again."""
+    rep=[]; t0=time.perf_counter()
+    def geo(G):
+        if log: print(f"  {G[4]:,}r+{G[5]:,}d={len(G[0]):,} ({time.perf_counter()-t0:.1f}s)"
+                      +(f" peak RSS {peak_rss_mb():,.0f} MB" if full else ""), flush=True)
+    W=build_staged(sr,sd,full,engine,jobs,cache,tt,rep,geo)
+    if log:
+        print(f"  done ({sum(r[1] for r in rep[3:]):.1f}s) gap={W[8]:.4f}"
+              +(f" peak RSS {peak_rss_mb():,.0f} MB" if full else ""), flush=True)
+        if cache:
+            print("  stage          time  cache")
+            for k,s,h in rep: print(f"  {k:<10}{s:>8.3f}s  {h}")
+    return W
+
+def _lap(tm):
+    """Stage stopwatch for the corruption engines: lap(k) adds the time since the
+    previous lap to tm[k]; a no-op without tm."""
+    if tm is None: return lambda k: None
+    t=[time.perf_counter()]
+    def lap(k):
+        n=time.perf_counter(); tm[k]=tm.get(k,0.0)+n-t[0]; t[0]=n
+    return lap
+
+# ── Corruption stages: corrupt, traps, venom_<v> in vid order, ci. Each maps the
+# state S=[Hp, thc, gap] in place given g=(Hcp, rcs, l2c, n_real, n_dec, sg, tt).
+# A scalar stage takes nr, a source of fresh Randoms seeded off the one master
+# stream; _SC_NR is how many each stage draws, so any stage's seeds are known
+# without running the stages before it.
+def cstages(fix=True):
+    return ('corrupt','traps',*('venom_'+v for v in vid))+(('ci',) if fix else ())
+
+_SC_NR={'corrupt':8,'traps':1,'venom_C':0,'ci':8}
+
+def _sc_seeds(sg, ks):
+    mr=random.Random(int.from_bytes(sg,'big'))
+    return {k:[mr.randint(0,2**64) for _ in range(_SC_NR.get(k,1))] for k in ks}
+
+def _sc_run(k, S, g, seeds):
+    it=iter(seeds); _SC[k](S,g,lambda: random.Random(next(it)))
+
+def _sc_corrupt(S, g, nr):
+    Hp=S[0]; sg=g[5]; NS=len(Hp)
+    r=nr()
+    for j in range(NS):
+        if r.random()<0.15:
+            cs=int.from_bytes(hashlib.sha256(sg+b"EC"+j.to_bytes(4,'big')).digest()[:4],'big')
+            cr=random.Random(cs); v=0
+            for i in range(12): v|=(cr.randint(0,3)<<(i*2))
+            Hp[j]=v
+    r=nr()
+    for _ in range(800):
+        c1,c2=r.randint(0,NS-1),r.randint(0,NS-1)
+        if c1!=c2:
+            v=0
+            for i in range(12): v|=_AF[gc(Hp[c1],i)*4+r.randint(0,3)]<<(i*2)
+            Hp[c2]=v
+    r=nr()
+    for _ in range(1200):
+        a1,a2=r.randint(0,NS-1),r.randint(0,NS-1)
+        if a1!=a2: Hp[a1],Hp[a2]=Hp[a2],Hp[a1]
+    r=nr()
+    for j in range(NS):
+        for i in range(6):
+            if r.random()<0.12: Hp[j]=sc(Hp[j],i,_AF[gc(Hp[j],i)*4+r.randint(1,3)])
+    r=nr()
+    for j in range(NS):
+        if r.random()<0.15: ci=r.randint(0,11); Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
+    r=nr()
+    for _ in range(200):
+        j=r.randint(0,NS-1); v=0
+        for i in range(12): v|=(r.randint(0,3)<<(i*2))
         Hp[j]=v
-r=nr2()
-for _ in range(800):
-    c1,c2=r.randint(0,NS-1),r.randint(0,NS-1)
-    if c1!=c2:
+    r=nr()
+    for _ in range(150):
+        j=r.randint(0,NS-1); h=hashlib.sha256(sg+bytes(unpack12(Hp[j]))+j.to_bytes(4,'big')).digest()
         v=0
-        for i in range(12): v|=_AF[gc(Hp[c1],i)*4+r.randint(0,3)]<<(i*2)
-        Hp[c2]=v
-r=nr2()
-for _ in range(1200):
-    a1,a2=r.randint(0,NS-1),r.randint(0,NS-1)
-    if a1!=a2: Hp[a1],Hp[a2]=Hp[a2],Hp[a1]
-r=nr2()
-for j in range(NS):
-    for i in range(6):
-        if r.random()<0.12: Hp[j]=sc(Hp[j],i,_AF[gc(Hp[j],i)*4+r.randint(1,3)])
-r=nr2()
-for j in range(NS):
-    if r.random()<0.15: ci=r.randint(0,11); Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
-r=nr2()
-for _ in range(200):
-    j=r.randint(0,NS-1); v=0
-    for i in range(12): v|=(r.randint(0,3)<<(i*2))
-    Hp[j]=v
-r=nr2()
-for _ in range(150):
-    j=r.randint(0,NS-1); h=hashlib.sha256(sg+bytes(unpack12(Hp[j]))+j.to_bytes(4,'big')).digest()
-    v=0
-    for i in range(12): v|=((h[i]%4)<<(i*2))
-    Hp[j]=v
-r=nr2()
-for _ in range(400):
-    j=r.randint(0,NS-1); v=0
-    for i in range(12): v|=(r.randint(0,3)<<(i*2))
-    Hp[j]=v
-
-# Bio-traps
-r=nr2()
-for j in range(NS):
-    if r.random()<0.10:
-        rot=int.from_bytes(hashlib.sha256(sg+b"VTX"+j.to_bytes(4,'big')).digest()[:2],'big')
-        sh=(rot%11)+1; old=unpack12(Hp[j]); v=0
-        for i in range(12): v|=(_AF[old[(i+sh)%12]*4+rot%4]<<(i*2))
+        for i in range(12): v|=((h[i]%4)<<(i*2))
+        Hp[j]=v
+    r=nr()
+    for _ in range(400):
+        j=r.randint(0,NS-1); v=0
+        for i in range(12): v|=(r.randint(0,3)<<(i*2))
         Hp[j]=v
-for j in range(NS):
-    if pdist(Hp[j],Hcp[j])<4:
-        ink=hashlib.sha256(sg+b"INK"+j.to_bytes(4,'big')).digest()
-        for i in range(12): Hp[j]=sc(Hp[j],i,_AF[gc(Hp[j],i)*4+(ink[i]%3)+1])
-
-# 7 Venoms
-vrng=random.Random(int.from_bytes(hashlib.sha256(sg+b"AZAZEL_ORDER").digest()[:8],'big'))
-vid=['A','B','C','D','E','F','G']; vrng.shuffle(vid)
-thc=set()
-for v in vid:
-    if v=='A':
-        r=nr2()
-        for _ in range(50):
-            j1,j2,j3=r.randint(0,NS-1),r.randint(0,NS-1),r.randint(0,NS-1)
-            if len({j1,j2,j3})<3: continue
-            for ci in r.sample(range(12),5): Hp[j3]=sc(Hp[j3],ci,_MF[gc(Hp[j1],ci)*4+gc(Hp[j2],ci)])
-    elif v=='B':
-        r=nr2()
-        for j in range(NS):
-            if r.random()<0.08:
-                zn=hashlib.sha256(sg+b"FOGZONE"+j.to_bytes(4,'big')).digest()[0]%7
-                zs=hashlib.sha256(sg+b"DENDRO"+zn.to_bytes(2,'big')).digest()
-                zr=random.Random(int.from_bytes(zs[:8],'big'))
-                for ci in zr.sample(range(12),2+(zs[0]%3)): Hp[j]=sc(Hp[j],ci,_FROB[gc(Hp[j],ci)])
-    elif v=='C':
-        for sh in range(2):
-            ss=hashlib.sha256(sg+b"IRUKANDJI"+sh.to_bytes(2,'big')).digest()
-            sr=random.Random(int.from_bytes(ss[:8],'big'))
-            for j in range(NS):
-                if sr.random()<0.15:
-                    for ci in sr.sample(range(12),3-sh): Hp[j]=sc(Hp[j],ci,_AF[sr.randint(0,3)*4+sr.randint(1,3)])
-    elif v=='D':
-        r=nr2()
-        for j in range(NS):
-            ci=r.randint(0,11)
-            if j in rcs:
-                if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
-            else:
-                if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci))
-    elif v=='E':
-        r=nr2()
-        for _ in range(300):
-            cols=r.sample(range(NS),7); c=r.randint(0,11)
-            vs=[r.randint(1,3) for _ in range(6)]; ps=0
-            for vv in vs: ps=_AF[ps*4+vv]
-            v7c=[vv for vv in range(1,4) if vv!=ps]
-            if not v7c: v7c=[1]
-            vs.append(r.choice(v7c))
-            for step in range(7): Hp[cols[(step+1)%7]]=sc(Hp[cols[(step+1)%7]],c,_AF[gc(Hp[cols[step]],c)*4+vs[step]])
-    elif v=='F':
-        r=nr2(); ls=[r.randint(0,3) for _ in range(4)]
-        for _ in range(750):
-            j=r.randint(0,NS-1)
-            for i in range(4): Hp[j]=sc(Hp[j],i,ls[i])
-    elif v=='G':
-        r=nr2()
-        for tli in r.sample(range(len(decoy_lines)),5):
-            for p in decoy_lines[tli]:
-                j=spti.get(p)
-                if j is not None:
-                    thc.add(j); d=pdist(Hp[j],Hcp[j]); at2=20
-                    while d>8 and at2>0:
-                        ci=r.randint(0,11)
-                        if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci)); d-=1
-                        at2-=1
-                    while d<8 and at2>0:
-                        ci=r.randint(0,11)
-                        if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)]); d+=1
-                        at2-=1
 
-# CI — fused measure+correct (single pass, adaptive)
-TT=9; ci_rng=random.Random(42)
-ci_perm=list(range(NS)); ci_rng.shuffle(ci_perm)
-for cp in range(8):
-    rs=ds=rc=dc=0
-    probe=NS//5
-    # Phase A: probe first 20% for gap estimate
-    for idx in range(probe):
-        j=ci_perm[(cp*probe+idx)%NS]
-        if j in thc: continue
-        d=pdist(Hp[j],Hcp[j])
-        if j in rcs: rs+=d; rc+=1
-        else: ds+=d; dc+=1
-    ram=rs/max(rc,1); dam=ds/max(dc,1); gci=abs(ram-dam)
-    if gci<0.02: break
-    r=nr2(); fr=min(0.65,gci*10)
-    # Phase B: correct all columns in one pass
+def _sc_traps(S, g, nr):
+    Hp=S[0]; Hcp=g[0]; sg=g[5]; NS=len(Hp)
+    r=nr()
     for j in range(NS):
-        if j in thc: continue
-        d=pdist(Hp[j],Hcp[j]); ir=j in rcs
-        if ram>dam:
-            if ir and d>TT and r.random()<fr:
-                ci=r.randint(0,11)
-                if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci))
-            elif not ir and d<TT and r.random()<fr:
-                ci=r.randint(0,11)
-                if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
+        if r.random()<0.10:
+            rot=int.from_bytes(hashlib.sha256(sg+b"VTX"+j.to_bytes(4,'big')).digest()[:2],'big')
+            sh=(rot%11)+1; old=unpack12(Hp[j]); v=0
+            for i in range(12): v|=(_AF[old[(i+sh)%12]*4+rot%4]<<(i*2))
+            Hp[j]=v
+    for j in range(NS):
+        if pdist(Hp[j],Hcp[j])<4:
+            ink=hashlib.sha256(sg+b"INK"+j.to_bytes(4,'big')).digest()
+            for i in range(12): Hp[j]=sc(Hp[j],i,_AF[gc(Hp[j],i)*4+(ink[i]%3)+1])
+
+def _sc_A(S, g, nr):
+    Hp=S[0]; NS=len(Hp); r=nr()
+    for _ in range(50):
+        j1,j2,j3=r.randint(0,NS-1),r.randint(0,NS-1),r.randint(0,NS-1)
+        if len({j1,j2,j3})<3: continue
+        for ci in r.sample(range(12),5): Hp[j3]=sc(Hp[j3],ci,_MF[gc(Hp[j1],ci)*4+gc(Hp[j2],ci)])
+
+def _sc_B(S, g, nr):
+    Hp=S[0]; sg=g[5]; r=nr()
+    for j in range(len(Hp)):
+        if r.random()<0.08:
+            zn=hashlib.sha256(sg+b"FOGZONE"+j.to_bytes(4,'big')).digest()[0]%7
+            zs=hashlib.sha256(sg+b"DENDRO"+zn.to_bytes(2,'big')).digest()
+            zr=random.Random(int.from_bytes(zs[:8],'big'))
+            for ci in zr.sample(range(12),2+(zs[0]%3)): Hp[j]=sc(Hp[j],ci,_FROB[gc(Hp[j],ci)])
+
+def _sc_C(S, g, nr):
+    Hp=S[0]; sg=g[5]
+    for sh in range(2):
+        ss=hashlib.sha256(sg+b"IRUKANDJI"+sh.to_bytes(2,'big')).digest()
+        sr=random.Random(int.from_bytes(ss[:8],'big'))
+        for j in range(len(Hp)):
+            if sr.random()<0.15:
+                for ci in sr.sample(range(12),3-sh): Hp[j]=sc(Hp[j],ci,_AF[sr.randint(0,3)*4+sr.randint(1,3)])
+
+def _sc_D(S, g, nr):
+    Hp=S[0]; Hcp,rcs=g[0],g[1]; r=nr()
+    for j in range(len(Hp)):
+        ci=r.randint(0,11)
+        if j in rcs:
+            if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
         else:
-            if not ir and d>TT and r.random()<fr:
+            if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci))
+
+def _sc_E(S, g, nr):
+    Hp=S[0]; NS=len(Hp); r=nr()
+    for _ in range(300):
+        cols=r.sample(range(NS),7); c=r.randint(0,11)
+        vs=[r.randint(1,3) for _ in range(6)]; ps=0
+        for vv in vs: ps=_AF[ps*4+vv]
+        v7c=[vv for vv in range(1,4) if vv!=ps]
+        if not v7c: v7c=[1]
+        vs.append(r.choice(v7c))
+        for step in range(7): Hp[cols[(step+1)%7]]=sc(Hp[cols[(step+1)%7]],c,_AF[gc(Hp[cols[step]],c)*4+vs[step]])
+
+def _sc_F(S, g, nr):
+    Hp=S[0]; NS=len(Hp); r=nr(); ls=[r.randint(0,3) for _ in range(4)]
+    for _ in range(750):
+        j=r.randint(0,NS-1)
+        for i in range(4): Hp[j]=sc(Hp[j],i,ls[i])
+
+def _sc_G(S, g, nr):
+    Hp,thc=S[0],S[1]; Hcp,_,l2c,n_real,n_dec=g[:5]; r=nr()
+    for tli in r.sample(range(n_dec),5):
+        for j in l2c.get(n_real+tli,()):
+            thc.add(j); d=pdist(Hp[j],Hcp[j]); at2=20
+            while d>8 and at2>0:
                 ci=r.randint(0,11)
-                if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci))
-            elif ir and d<TT and r.random()<fr:
+                if gc(Hp[j],ci)!=gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hcp[j],ci)); d-=1
+                at2-=1
+            while d<8 and at2>0:
                 ci=r.randint(0,11)
-                if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
-gg=abs(rs/max(rc,1)-ds/max(dc,1))
+                if gc(Hp[j],ci)==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)]); d+=1
+                at2-=1
+
+def _sc_ci(S, g, nr):
+    # CI — rotating 20% probe for the gap estimate + early exit, then one j-ordered
+    # correction pass. K = class per column (0 decoy, 1 real, 2 trap), D = live
+    # distance: every correction moves one lane, so D[j] moves by exactly ±1 and
+    # neither the probe nor the pass recomputes pdist or looks up rcs/thc.
+    Hp,thc=S[0],S[1]; Hcp,rcs=g[0],g[1]; TT=g[6]; NS=len(Hp)
+    K=bytearray(NS)
+    for j in rcs: K[j]=1
+    for j in thc: K[j]=2
+    D=bytearray(map(pdist,Hp,Hcp))
+    perm=list(range(NS)); random.Random(42).shuffle(perm); probe=NS//5
+    for cp in range(8):
+        rs=ds=rc=dc=0
+        for i in range(cp*probe,cp*probe+probe):
+            j=perm[i%NS]; k=K[j]
+            if k==1: rs+=D[j]; rc+=1
+            elif k==0: ds+=D[j]; dc+=1
+        ram=rs/max(rc,1); dam=ds/max(dc,1); gci=abs(ram-dam)
+        if gci<0.02: break
+        r=nr(); rnd=r.random; ri=r.randint; fr=min(0.65,gci*10)
+        hi=1 if ram>dam else 0                              # pull class hi toward Hcp, push the other away
+        for j in range(NS):
+            k=K[j]
+            if k==2: continue
+            d=D[j]
+            if k==hi:
+                if d>TT and rnd()<fr:
+                    ci=ri(0,11); c=gc(Hcp[j],ci)
+                    if gc(Hp[j],ci)!=c: Hp[j]=sc(Hp[j],ci,c); D[j]=d-1
+            elif d<TT and rnd()<fr:
+                ci=ri(0,11); a=gc(Hp[j],ci)
+                if a==gc(Hcp[j],ci): Hp[j]=sc(Hp[j],ci,_AF[a*4+ri(1,3)]); D[j]=d+1
+    rs=ds=rc=dc=0
+    for k,d in zip(K,D):
+        if k==1: rs+=d; rc+=1
+        elif k==0: ds+=d; dc+=1
+    S[2]=abs(rs/max(rc,1)-ds/max(dc,1))
+
+_SC={'corrupt':_sc_corrupt,'traps':_sc_traps,'ci':_sc_ci,
+     **{'venom_'+v:f for v,f in zip('ABCDEFG',(_sc_A,_sc_B,_sc_C,_sc_D,_sc_E,_sc_F,_sc_G))}}
+
+def corrupt_scalar(Hcp, rcs, l2c, n_real, n_dec, sg=sg, fix=True, tm=None):
+    """EC + bio-traps + 7 Venoms (vid order) + CI, column by column → Hp, thc, gap.
+    sg/fix exist for --bench venoms (alternate seeds, pre-CI snapshot); tm collects
+    per-stage seconds for --bench phases."""
+    lap=_lap(tm); g=(Hcp,rcs,l2c,n_real,n_dec,sg,TT); S=[Hcp[:],set(),0.0]
+    for k,sd in _sc_seeds(sg,cstages(fix)).items(): _sc_run(k,S,g,sd); lap(k)
+    return tuple(S)
+
+# ── Vector engine (--engine vec, NumPy): same stages, whole-array passes ──
+# Each stage draws from its own PCG64 stream seeded from sg, so the wall is
+# reproducible from sg but is not bit-identical to the scalar engine (which
+# threads one Mersenne Twister through every column); --bench venoms checks
+# the two agree statistically. Stages see g=(C, R, l2c, n_real, n_dec, sg, tt)
+# with C, R the column array and real-column mask.
+def _vrng(sg, tag):
+    return np.random.default_rng(int.from_bytes(hashlib.sha256(sg+b"VEC"+tag).digest()[:16],'big'))
+
+def _vpdist(H, C):
+    x=H^C
+    return np.bitwise_count((x|(x>>1))&M5)
+
+def _vlanes(g, n, k):
+    """Per row, a mask word covering k distinct random lanes."""
+    ln=np.argsort(g.random((n,12)),axis=1)[:,:k].astype(np.uint32)
+    return np.bitwise_or.reduce(np.uint32(3)<<(2*ln),axis=1)
 
-# Adjacency
-c2l={}; alines=real_lines+decoy_lines
-for li,L in enumerate(alines):
-    for p in L:
-        j=spti.get(p)
-        if j is not None: c2l.setdefault(j,[]).append(li)
-l2c={}
-for li,L in enumerate(alines):
-    l2c[li]=[spti[p] for p in L if p in spti]
+def _vnz(g, n):
+    """n words with every lane a random nonzero GF(4) value."""
+    return np.bitwise_or.reduce(g.integers(1,4,(n,12),dtype=np.uint32)<<(2*np.arange(12,dtype=np.uint32)),axis=1)
 
-print(f"  done ({time.time()-tc:.1f}s) gap={gg:.4f}", flush=True)
+def _vmask(cols, ns):
+    if isinstance(cols, Bits):
+        return np.unpackbits(np.frombuffer(cols.w,'<u4').view(np.uint8),bitorder='little')[:ns].astype(bool)
+    m=np.zeros(ns,bool); m[np.fromiter(cols,np.int64,len(cols))]=True; return m
+
+def _r24(g, n): return g.integers(0,1<<24,n,dtype=np.uint32)
+
+def _vgeo(Hcp, rcs, l2c, n_real, n_dec, sg, tt):
+    C=np.asarray(Hcp,dtype=np.uint32); return C,_vmask(rcs,len(C)),l2c,n_real,n_dec,sg,tt
+
+def _vc_corrupt(S, gv):
+    H=S[0]; sg=gv[5]; u=np.uint32; ns=len(H)
+    g=_vrng(sg,b"EC"); m=g.random(ns)<0.15; H[m]=_r24(g,int(m.sum()))
+    g=_vrng(sg,b"CP"); a,b=g.integers(0,ns,(2,800)); k=a!=b; H[b[k]]=H[a[k]]^_r24(g,int(k.sum()))
+    g=_vrng(sg,b"SW"); a,b=g.integers(0,ns,(2,1200)); t=H[a].copy(); H[a]=H[b]; H[b]=t
+    g=_vrng(sg,b"FL")
+    for i in range(6): H^=np.where(g.random(ns)<0.12,g.integers(1,4,ns,dtype=u),u(0))<<u(2*i)
+    m=np.flatnonzero(g.random(ns)<0.15); H[m]^=g.integers(1,4,len(m),dtype=u)<<(2*g.integers(0,12,len(m),dtype=u))
+    g=_vrng(sg,b"OW")
+    for n in (200,150,400): H[g.integers(0,ns,n)]=_r24(g,n)
+
+def _vc_traps(S, gv):
+    # VTX lane rotation + constant, INK on columns still too close
+    H=S[0]; C=gv[0]; sg=gv[5]; u=np.uint32; ns=len(H)
+    g=_vrng(sg,b"VTX"); m=np.flatnonzero(g.random(ns)<0.10); x=H[m]
+    sh=2*g.integers(1,12,len(m),dtype=u); H[m]=(((x>>sh)|(x<<(u(24)-sh)))&M24)^(g.integers(0,4,len(m),dtype=u)*u(M5))
+    g=_vrng(sg,b"INK"); m=np.flatnonzero(_vpdist(H,C)<4); H[m]^=_vnz(g,len(m))
+
+def _vc_A(S, gv):
+    H=S[0]; g=_vrng(gv[5],b"VENOMA"); ns=len(H)
+    j=g.integers(0,ns,(3,50)); j=j[:,(j[0]!=j[1])&(j[1]!=j[2])&(j[0]!=j[2])]
+    x,y=H[j[0]],H[j[1]]; x0,x1,y0,y1=x&M5,(x>>1)&M5,y&M5,(y>>1)&M5
+    pr=((x0&y0)^(x1&y1))|(((x0&y1)^(x1&y0)^(x1&y1))<<1); mk=_vlanes(g,j.shape[1],5)
+    H[j[2]]=(H[j[2]]&~mk)|(pr&mk)
+
+def _vc_B(S, gv):
+    H=S[0]; sg=gv[5]; g=_vrng(sg,b"VENOMB"); zm=[]
+    for zn in range(7):
+        zs=hashlib.sha256(sg+b"DENDRO"+zn.to_bytes(2,'big')).digest()
+        zr=random.Random(int.from_bytes(zs[:8],'big'))
+        zm.append(sum(1<<(2*ci) for ci in zr.sample(range(12),2+(zs[0]%3))))
+    m=np.flatnonzero(g.random(len(H))<0.08); x=H[m]
+    H[m]=x^((x>>1)&np.asarray(zm,dtype=np.uint32)[g.integers(0,7,len(m))])
+
+def _vc_C(S, gv):
+    H=S[0]; g=_vrng(gv[5],b"VENOMC")
+    for sh in range(2):
+        m=np.flatnonzero(g.random(len(H))<0.15); mk=_vlanes(g,len(m),3-sh)
+        val=_r24(g,len(m))^_vnz(g,len(m))
+        H[m]=(H[m]&~mk)|(val&mk)
+
+def _vc_D(S, gv):
+    H=S[0]; C,R=gv[0],gv[1]; u=np.uint32; ns=len(H); g=_vrng(gv[5],b"VENOMD")
+    sh=2*g.integers(0,12,ns,dtype=u); h=(H>>sh)&3; c=(C>>sh)&3
+    H^=np.where(R&(h==c),g.integers(1,4,ns,dtype=u),np.where(~R&(h!=c),h^c,u(0)))<<sh
+
+def _vc_E(S, gv):
+    H=S[0]; ns=len(H); g=_vrng(gv[5],b"VENOME")
+    for _ in range(300):
+        cols=[int(x) for x in g.choice(ns,7,replace=False)]; c=int(g.integers(0,12))
+        vs=[int(x) for x in g.integers(1,4,6)]; ps=0
+        for vv in vs: ps^=vv
+        vs.append(int(g.choice([vv for vv in range(1,4) if vv!=ps])))
+        for step in range(7):
+            a,b=cols[step],cols[(step+1)%7]
+            H[b]=sc(int(H[b]),c,gc(int(H[a]),c)^vs[step])
+
+def _vc_F(S, gv):
+    H=S[0]; g=_vrng(gv[5],b"VENOMF"); u=np.uint32
+    lw=pack12([int(x) for x in g.integers(0,4,4)]+[0]*8)
+    m=g.integers(0,len(H),750); H[m]=(H[m]&~u(0xFF))|u(lw)
+
+def _vc_G(S, gv):
+    H,thc=S[0],S[1]; C,_,l2c,n_real,n_dec=gv[:5]; g=_vrng(gv[5],b"VENOMG")
+    for tli in g.choice(n_dec,5,replace=False):
+        for j in l2c.get(n_real+int(tli),()):
+            thc.add(j); x=int(H[j]); cj=int(C[j]); d=pdist(x,cj); at2=20
+            while d!=8 and at2>0:
+                ci=int(g.integers(0,12)); eq=gc(x,ci)==gc(cj,ci)
+                if d>8 and not eq: x=sc(x,ci,gc(cj,ci)); d-=1
+                elif d<8 and eq: x^=int(g.integers(1,4))<<(2*ci); d+=1
+                at2-=1
+            H[j]=x
+
+def _vc_ci(S, gv):
+    # Same rotating 20% probe + early exit as the scalar loop; its correction pass as masks
+    H,thc=S[0],S[1]; C,R=gv[0],gv[1]; TT=gv[6]; u=np.uint32; ns=len(H)
+    g=_vrng(gv[5],b"CI"); ok=~_vmask(thc,ns); rr=ok&R; dd=ok&~R; gg=0.0
+    perm=g.permutation(ns); probe=ns//5
+    for cp in range(8):
+        d=_vpdist(H,C); pj=perm[(cp*probe+np.arange(probe))%ns]
+        pr=pj[rr[pj]]; pd=pj[dd[pj]]
+        ram=d[pr].mean() if len(pr) else 0.0; dam=d[pd].mean() if len(pd) else 0.0
+        gg=abs(ram-dam)
+        if gg<0.02: break
+        fr=min(0.65,gg*10); hot=g.random(ns)<fr
+        fx=(rr if ram>dam else dd)&(d>TT)&hot; push=(dd if ram>dam else rr)&(d<TT)&hot
+        sh=2*g.integers(0,12,ns,dtype=u); lm=u(3)<<sh
+        H=np.where(fx,(H&~lm)|(C&lm),H)
+        eq=((H^C)&lm)==0
+        H^=np.where(push&eq,g.integers(1,4,ns,dtype=u)<<sh,u(0))
+    S[0]=H; S[2]=float(gg)
+
+_VC={'corrupt':_vc_corrupt,'traps':_vc_traps,'ci':_vc_ci,
+     **{'venom_'+v:f for v,f in zip('ABCDEFG',(_vc_A,_vc_B,_vc_C,_vc_D,_vc_E,_vc_F,_vc_G))}}
+_VH=(_vrng,_vpdist,_vlanes,_vnz,_vmask,_r24)
+
+def corrupt_vec(Hcp, rcs, l2c, n_real, n_dec, sg=sg, fix=True, tm=None):
+    """corrupt_scalar as masked array passes over a u32 column array."""
+    if np is None: raise RuntimeError("--engine vec requires NumPy")
+    lap=_lap(tm); g=_vgeo(Hcp,rcs,l2c,n_real,n_dec,sg,TT); S=[g[0].copy(),set(),0.0]
+    for k in cstages(fix): _VC[k](S,g); lap(k)
+    return array('I',S[0].astype('<u4').tobytes()),S[1],S[2]
+
+# ══════════════════════════════════════════════════════════════
+# WALL CACHE — versioned, mmap-backed (warm start in ms)
+# ══════════════════════════════════════════════════════════════
+# Layout (little-endian): header, then one u32 body of
+#   Hp[NS] | Hcp[NS] | rcs bits | thc bits | c2l off[NS+1],idx | l2c off[NL+1],idx
+# The mapping is ACCESS_READ, so every worker on the host shares the pages.
+WALL_MAGIC=b"AZWALL"; WALL_VER=2
+_WH=struct.Struct('<6sH32sIIIIIIId')
+
+def wall_key(sr=5000, sd=5000, full=False, engine='scalar'):
+    """The build's last stage key: seeds, parameters and the code of every stage."""
+    return hashlib.sha256(b"AZWALL"+WALL_VER.to_bytes(2,'big')
+                          +stage_keys(sr,sd,full,engine)['ci']).digest()
+
+def wall_path(d, key): return os.path.join(d, f"gorgon_{key.hex()[:24]}.wall")
+
+def _bits(cols, ns):
+    if isinstance(cols, Bits): return array('I', cols.w)
+    w=array('I',bytes(4*((ns+31)//32)))
+    for j in cols: w[j>>5]|=1<<(j&31)
+    return w
+
+def wall_blob(W, key):
+    """Header + body, the cache-file layout."""
+    Hp,Hcp,rcs,thc,c2l,l2c,n_real,n_dec,gg=W; ns=len(Hp)
+    body=(array('I',Hp)+array('I',Hcp)+_bits(rcs,ns)+_bits(thc,ns)
+          +array('I',c2l.off)+array('I',c2l.idx)+array('I',l2c.off)+array('I',l2c.idx))
+    if sys.byteorder!='little': body.byteswap()
+    return _WH.pack(WALL_MAGIC,WALL_VER,key,ns,n_real,n_dec,len(rcs),len(thc),
+                    len(l2c),len(l2c.idx),gg)+body.tobytes()
+
+def wall_view(buf, key):
+    """Zero-copy W over a wall blob (mmap, shared memory). None if it doesn't match."""
+    if len(buf)<_WH.size: return None
+    mg,ver,kw,ns,n_real,n_dec,nr,nt,nl,ne,gg=_WH.unpack_from(buf)
+    nw=(ns+31)//32
+    if (mg!=WALL_MAGIC or ver!=WALL_VER or key!=kw or sys.byteorder!='little'
+            or len(buf)!=_WH.size+4*(3*ns+2*nw+nl+2+2*ne)):
+        return None
+    u=memoryview(buf)[_WH.size:].cast('I'); o=0
+    def take(n):
+        nonlocal o; v=u[o:o+n]; o+=n; return v
+    Hp=take(ns); Hcp=take(ns); rcs=Bits(take(nw),nr); thc=Bits(take(nw),nt)
+    c2l=Adj(take(ns+1),take(ne)); l2c=Adj(take(nl+1),take(ne))
+    return Hp,Hcp,rcs,thc,c2l,l2c,n_real,n_dec,gg
+
+def save_wall(d, W, key):
+    os.makedirs(d, exist_ok=True); p=wall_path(d,key); tp=f"{p}.{os.getpid()}.tmp"
+    with open(tp,'wb') as f: f.write(wall_blob(W,key))
+    os.replace(tp, p)   # atomic: concurrent readers never see a torn file
+    return p
+
+_wmaps=[]   # keep mappings alive for the life of the process
+def load_wall(d, key):
+    """mmap a cached wall. None on miss, version/key mismatch or truncation."""
+    try:
+        with open(wall_path(d,key),'rb') as f: mm=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+    except (OSError, ValueError): return None
+    W=wall_view(mm,key)
+    if W is None: mm.close(); return None
+    _wmaps.append(mm); return W
+
+def wall_shm(W, key):
+    """Copy W once into a shared_memory block (cache-file layout) → (shm, views).
+    Processes forked afterwards map the same pages; nothing is copied per worker."""
+    from multiprocessing import shared_memory
+    b=wall_blob(W,key); shm=shared_memory.SharedMemory(create=True,size=len(b))
+    shm.buf[:len(b)]=b
+    return shm, wall_view(shm.buf[:len(b)],key)
+
+# ══════════════════════════════════════════════════════════════
+# BUILD STAGES — content-addressed: each stage's output is cached under a
+# hash of its code, its parameters and its inputs' keys (DIR/stages/)
+# ══════════════════════════════════════════════════════════════
+# spread → decoys → adjacency → corrupt → traps → venom_* (vid order) → ci.
+# A key chains the keys upstream of it, so a change reruns exactly the stages
+# at and after it; the wall key is the ci key. Stage files are a header, a
+# small JSON meta and u32 arrays.
+STAGE_MAGIC=b"AZST"; STAGE_VER=1
+_SH=struct.Struct('<4sH32sI')
+
+def code_fp(*fns):
+    """Hash of functions' bytecode, names and constants (nested code objects
+    included, line numbers not) and of all they reach through module globals:
+    helpers (gc, pdist, pack12, ...) the same way, recursively, and data
+    (_G16M, _FSP, _SC_NR, JP, ...) by value. So an edit to a stage or to
+    anything it calls or reads changes it. Dispatch tables of functions
+    (_SC, _VC) are skipped, each stage hashes its own; classes and modules
+    are not followed: bump STAGE_VER when a change there alters output.
+    Memoized: code and tables don't change within a process."""
+    if fns in _FPC: return _FPC[fns]
+    h=hashlib.sha256(sys.implementation.cache_tag.encode()); G=globals(); seen=set()
+    def co(c):
+        h.update(c.co_code); h.update(repr(c.co_names).encode())
+        for x in c.co_consts:
+            if hasattr(x,'co_code'): co(x)
+            else: h.update(repr(sorted(map(repr,x)) if isinstance(x,frozenset) else x).encode())
+        for nm in c.co_names:
+            if nm in seen or nm not in G: continue
+            seen.add(nm); v=G[nm]
+            if isinstance(v,type(code_fp)) and v.__module__==__name__: h.update(nm.encode()); co(v.__code__)
+            elif isinstance(v,(int,float,bytes,str,tuple,list,dict,array)) and \
+                 not any(map(callable,v.values() if isinstance(v,dict) else v if isinstance(v,(tuple,list)) else ())):
+                h.update(nm.encode()+repr(v).encode())
+    for f in fns: co(f.__code__)
+    r=_FPC[fns]=h.digest(); return r
+_FPC={}
+
+def stage_keys(sr=5000, sd=5000, full=False, engine='scalar', tt=TT):
+    """Stage name → key, in run order."""
+    H=lambda *p: hashlib.sha256(b"\0".join(p)).digest()
+    K={'spread':H(b"spread",code_fp(full_spread,_fs_lines) if full else code_fp(sample_spread,_line_pts,_draws),
+                  b"FULL" if full else sr.to_bytes(4,'big')),
+       'decoys':H(b"decoys",code_fp(sample_decoys,_decoy_pts,_draws),sd.to_bytes(4,'big'))}
+    K['adjacency']=prev=H(b"adjacency",code_fp(full_columns,csr_transpose,prank) if full
+                          else code_fp(line_geometry,csr_transpose),K['spread'],K['decoys'])
+    T,X=(_VC,code_fp(_vgeo,*_VH)) if engine=='vec' else (_SC,code_fp(_sc_seeds,_sc_run))
+    for k in cstages():
+        K[k]=prev=H(k.encode(),engine.encode(),code_fp(T[k]),X,sg,
+                    tt.to_bytes(2,'big') if k=='ci' else b"",prev)
+    return K
+
+def stage_path(d, k, key): return os.path.join(d,'stages',f"{k}_{key.hex()[:24]}.stg")
+
+def save_stage(d, k, key, meta, arrs):
+    meta=dict(meta,n=[len(a) for a in arrs]); mb=json.dumps(meta).encode()
+    body=array('I')
+    for a in arrs: body.extend(a)
+    if sys.byteorder!='little': body.byteswap()
+    p=stage_path(d,k,key); os.makedirs(os.path.dirname(p),exist_ok=True); tp=f"{p}.{os.getpid()}.tmp"
+    with open(tp,'wb') as f: f.write(_SH.pack(STAGE_MAGIC,STAGE_VER,key,len(mb))+mb+body.tobytes())
+    os.replace(tp,p)
+
+def load_stage(d, k, key):
+    """→ (meta, [array('I')]) or None on miss or a torn/stale file."""
+    try:
+        with open(stage_path(d,k,key),'rb') as f: b=f.read()
+        mg,ver,kw,nm=_SH.unpack_from(b); meta=json.loads(b[_SH.size:_SH.size+nm])
+    except (OSError, ValueError, struct.error): return None
+    o=_SH.size+nm
+    if mg!=STAGE_MAGIC or ver!=STAGE_VER or kw!=key or len(b)!=o+4*sum(meta['n']): return None
+    u=array('I',b[o:])
+    if sys.byteorder!='little': u.byteswap()
+    out=[]
+    for n in meta['n']: out.append(u[:n]); u=u[n:]
+    return meta,out
+
+# Codecs: stage output ↔ (meta, arrays)
+def _lines_enc(L): return {}, [array('I',[pack12(list(p)) for l in L for p in l])]
+def _lines_dec(m, a):
+    P=[tuple(unpack12(x)) for x in a[0]]; return [P[i:i+5] for i in range(0,len(P),5)]
+def _fs_enc(sp): return {}, list(sp)
+def _fs_dec(m, a): return tuple(a)
+
+def _adj_enc(G):
+    Hcp,rcs,c2l,l2c,n_real,n_dec=G; ns=len(Hcp)
+    return ({'n_real':n_real,'n_dec':n_dec,'list':isinstance(Hcp,list),'bits':isinstance(rcs,Bits),'nr':len(rcs)},
+            [array('I',Hcp),_bits(rcs,ns),c2l.off,c2l.idx,l2c.off,l2c.idx])
+def _adj_dec(m, a):
+    rcs=Bits(a[1],m['nr'])
+    return (list(a[0]) if m['list'] else a[0],rcs if m['bits'] else set(rcs),
+            Adj(a[2],a[3]),Adj(a[4],a[5]),m['n_real'],m['n_dec'])
+
+def _st_enc(S):
+    H=S[0]
+    return ({'gg':float(S[2]),'list':isinstance(H,list)},
+            [array('I',H.astype('<u4').tobytes()) if np is not None and isinstance(H,np.ndarray) else array('I',H),
+             array('I',sorted(S[1]))])
+
+def build_staged(sr=5000, sd=5000, full=False, engine='scalar', jobs=1, cache=None, tt=TT, rep=None, geo=None):
+    """build_gorgon's stage graph → W. Without cache every stage runs. With one,
+    a stage whose key is on disk is loaded instead, and the stages upstream of
+    the last such corruption stage aren't even read. rep collects
+    (stage, seconds, 'hit'|'miss'|'-') in run order; geo(G) is called once the
+    adjacency is in hand."""
+    if engine=='vec' and np is None: raise RuntimeError("--engine vec requires NumPy")
+    K=stage_keys(sr,sd,full,engine,tt) if cache else {}; R={}
+    def get(k, run, enc, dec):
+        t=time.perf_counter(); m=load_stage(cache,k,K[k]) if cache else None
+        if m is not None: out=dec(*m); R[k]=(time.perf_counter()-t,'hit'); return out
+        out=run(); R[k]=(time.perf_counter()-t-sum(R[x][0] for x in ('spread','decoys')
+                                                   if k=='adjacency' and x in R),'miss')   # own time only
+        if cache: save_stage(cache,k,K[k],*enc(out))
+        return out
+    def lines():
+        sp=(get('spread',lambda: full_spread(jobs),_fs_enc,_fs_dec) if full
+            else get('spread',lambda: sample_spread(sr,jobs),_lines_enc,_lines_dec))
+        dl=get('decoys',lambda: sample_decoys(sd,jobs),_lines_enc,_lines_dec)
+        return full_columns(*sp,dl) if full else line_geometry(sp,dl)
+    G=get('adjacency',lines,_adj_enc,_adj_dec)
+    if geo: geo(G)
+    Hcp,rcs,c2l,l2c,n_real,n_dec=G
+    vec=engine=='vec'
+    g=_vgeo(Hcp,rcs,l2c,n_real,n_dec,sg,tt) if vec else (Hcp,rcs,l2c,n_real,n_dec,sg,tt)
+    ks=cstages(); i=len(ks) if cache else 0; S=None
+    while i:   # resume after the last corruption stage already on disk
+        t=time.perf_counter(); m=load_stage(cache,ks[i-1],K[ks[i-1]])
+        if m is not None:
+            meta,(h,tc)=m
+            S=[np.frombuffer(h.tobytes(),'<u4').astype(np.uint32) if vec else list(h) if meta['list'] else h,
+               set(tc),meta['gg']]
+            R[ks[i-1]]=(time.perf_counter()-t,'hit'); break
+        i-=1
+    if S is None: S=[g[0].copy() if vec else Hcp[:],set(),0.0]
+    seeds=None if vec else _sc_seeds(sg,ks)
+    for k in ks[i:]:
+        t=time.perf_counter()
+        if vec: _VC[k](S,g)
+        else: _sc_run(k,S,g,seeds[k])
+        R[k]=(time.perf_counter()-t,'miss')
+        if cache: save_stage(cache,k,K[k],*_st_enc(S))
+    if rep is not None:
+        rep+=[(k,*R.get(k,(0.0,'-'))) for k in ('spread','decoys','adjacency',*ks)]
+    Hp=array('I',S[0].astype('<u4').tobytes()) if vec else S[0]
+    return Hp,Hcp,rcs,S[1],c2l,l2c,n_real,n_dec,S[2]
 
 # ══════════════════════════════════════════════════════════════
 # 2. PRECOMPUTED JUDAS BANK (256 chains)
 # ══════════════════════════════════════════════════════════════
 sa=hashlib.sha256(sg+b"AZAZEL_V5_SONIC").digest()
 JP=[3,5,7,11]
-jbank=[]
-jrng=random.Random(int.from_bytes(sa[:8],'big'))
-for _ in range(256):
-    cl=jrng.choice(JP)
-    incs=[jrng.randint(1,3) for _ in range(cl-1)]
-    ps=0
-    for vv in incs: ps=_AF[ps*4+vv]
-    nc=[vv for vv in range(1,4) if _AF[ps*4+vv]!=0]
-    if not nc: nc=[1]
-    incs.append(jrng.choice(nc))
-    jbank.append(incs)
-
-# Wind base
-bv=int.from_bytes(sa[:16],'big')
-wb=[bv%97+7,bv%89+11,bv%83+13,bv%79+17,bv%73+19,bv%71+23]
-
-print(f"\n  ═══ SONIC BOOM ORACLE ═══")
-print(f"  {NS:,} cols | WRank | LazyT | XS128+ | JBank[256]")
+def judas_bank(sa):
+    jbank=[]
+    jrng=random.Random(int.from_bytes(sa[:8],'big'))
+    for _ in range(256):
+        cl=jrng.choice(JP)
+        incs=[jrng.randint(1,3) for _ in range(cl-1)]
+        ps=0
+        for vv in incs: ps=_AF[ps*4+vv]
+        nc=[vv for vv in range(1,4) if _AF[ps*4+vv]!=0]
+        if not nc: nc=[1]
+        incs.append(jrng.choice(nc))
+        jbank.append(incs)
+    return jbank
+
+class JPlan:
+    """Per-column _judas plan over the fixed adjacency, built once per wall.
+    Column j's groups are off[j]:off[j+1], one per line of j with 2+ columns,
+    in c2l order; group g's entries are tg[go[g]:go[g+1]]: the line's first
+    max(JP) columns other than j, each as aj<<4|step. Only the poison length
+    (drawn per call) cuts a group short. The echo columns aj+1, aj+3 are left
+    to the loop: a mod is cheaper than two more slices."""
+    __slots__=('off','go','tg')
+    def __init__(self, c2l, l2c, ns):
+        co,ci,lo,lx=c2l.off,c2l.idx,l2c.off,l2c.idx; K=max(JP)
+        off=array('I',[0]); go=array('I',[0]); tg=array('I')
+        for j in range(ns):
+            for li in ci[co[j]:co[j+1]]:
+                p0,p1=lo[li],lo[li+1]
+                if p1-p0<2: continue
+                tg.extend([aj<<4|s for s,aj in enumerate(lx[p0:min(p1,p0+K)]) if aj!=j]); go.append(len(tg))
+            off.append(len(go)-1)
+        self.off=off; self.go=go; self.tg=tg
+
+def wind_base(sa):
+    bv=int.from_bytes(sa[:16],'big')
+    return [bv%97+7,bv%89+11,bv%83+13,bv%79+17,bv%73+19,bv%71+23]
+
+fsk=hashlib.sha256(sa+asig+b"FRIEND_V5").digest()   # the friend key
+
+# ══════════════════════════════════════════════════════════════
+# WALL — what every Av5 session reads; built or mapped on first use
+# ══════════════════════════════════════════════════════════════
+class Wall:
+    """GORGON wall for one build configuration, plus the Judas bank and wind
+    base. Constructing it costs nothing: the first read of a wall attribute
+    (Hp, c2l, ns, jbank, ...) mmaps it from cache, or builds it and stores it
+    there. After that they are plain instance attributes."""
+    F=('Hp','Hcp','rcs','thc','c2l','l2c','n_real','n_dec','gg')
+    def __init__(self, sr=5000, sd=5000, full=False, engine='scalar', jobs=1, cache=None, log=False):
+        self.sr=sr; self.sd=sd; self.full=full; self.engine=engine; self.jobs=jobs
+        self.cache=cache; self.log=log
+
+    @classmethod
+    def from_args(cls, a, log=True):
+        return cls(a.sr,a.sd,a.full_spread,a.engine,a.jobs,a.cache,log)
+
+    @property
+    def key(self):   # snapshots carry it, so computed once
+        k=self.__dict__.get('_key')
+        if k is None: k=self._key=wall_key(self.sr,self.sd,self.full,self.engine)
+        return k
+
+    @property
+    def loaded(self): return 'Hp' in self.__dict__
+
+    def __getattr__(self, k):   # only reached while unloaded
+        if k in Wall.F or k in ('ns','jbank','wb'): self.load(); return self.__dict__[k]
+        if k=='jp': self.jp=JPlan(self.c2l,self.l2c,self.ns); return self.jp
+        raise AttributeError(k)
+
+    def load(self):
+        if self.loaded: return self
+        if self.log: print("\n  ═══ GORGON ═══", flush=True)
+        t=time.time(); W=load_wall(self.cache,self.key) if self.cache else None
+        if W is None:
+            W=build_gorgon(self.sr,self.sd,self.full,self.engine,self.jobs,self.log,self.cache)
+            if self.cache: save_wall(self.cache,W,self.key)
+        elif self.log:
+            print(f"  {W[6]:,}r+{W[7]:,}d={len(W[0]):,} mmap ({(time.time()-t)*1e3:.1f}ms)"
+                  f" gap={W[8]:.4f}", flush=True)
+        self._set(W); return self
+
+    def _set(self, W):
+        d=self.__dict__; d.update(zip(Wall.F,W)); d['ns']=len(W[0])
+        if 'jbank' not in d: d['jbank']=judas_bank(sa); d['wb']=wind_base(sa)
+
+    def astuple(self): return tuple(getattr(self,k) for k in Wall.F)
+
+    def to_shm(self):
+        """Move the wall into one shared_memory block and rebind to views of it;
+        sessions made afterwards (e.g. in forked workers) read the shared pages."""
+        shm,W=wall_shm(self.astuple(),self.key); self._set(W); return shm
+
+    def oracle(self, isalt=None, sk=None, fast=False, pf=None, tr=None, dl=0):
+        """New Av5 session on this wall: an Av5P timing into pf, an Av5T
+        appending its queries to the Recorder tr, or an Av5D held to a dl ns
+        budget per query (query latencies into pf), if given."""
+        sk=fsk if sk is None else sk
+        if tr is not None:
+            if pf is not None or dl: raise ValueError("tr excludes pf and dl")
+            return Av5T(self,sa,sk,isalt,fast,tr)
+        if dl: return Av5D(self,sa,sk,isalt,fast,dl,pf)
+        return Av5(self,sa,sk,isalt,fast) if pf is None else Av5P(self,sa,sk,isalt,fast,pf)
+
+    def lockstep(self, isalts, sk=None, fast=False):
+        """len(isalts) sessions as one Av5L: lane k is oracle(isalts[k], sk, fast)."""
+        return Av5L(self,sa,fsk if sk is None else sk,isalts,fast)
 
 # ══════════════════════════════════════════════════════════════
 # 3. THE ORACLE v5 — SONIC BOOM
 # ══════════════════════════════════════════════════════════════
+QNONE=0xFFFFFFFF   # query_many slot for an out-of-range index
+
+_CTP=0x1000000   # CMap dense: present bit
+
+class CMap:
+    """Per-session contamination map, column → packed 24-bit mask. A dict while
+    sparse; past n/16 entries it moves to a dense u32 array (bit 24 = present)
+    plus an insertion-order key list, so `in`, get and keys() never change.
+    Hot loops write through m() (the raw dict while sparse) and call fit() after."""
+    __slots__=('d','a','ks','n')
+    def __init__(self, n): self.d={}; self.a=None; self.ks=None; self.n=n
+    def get(self, j, dv=0):
+        a=self.a
+        if a is None: return self.d.get(j,dv)
+        x=a[j]; return x&M24 if x else dv
+    def __getitem__(self, j):
+        if self.a is None: return self.d[j]
+        x=self.a[j]
+        if not x: raise KeyError(j)
+        return x&M24
+    def __setitem__(self, j, v):
+        a=self.a
+        if a is None: self.d[j]=v; self.fit()
+        else:
+            if not a[j]: self.ks.append(j)
+            a[j]=v|_CTP
+    def __contains__(self, j):
+        return j in self.d if self.a is None else 0<=j<self.n and self.a[j]!=0
+    def __len__(self): return len(self.d) if self.a is None else len(self.ks)
+    def keys(self): return self.d.keys() if self.a is None else iter(self.ks)
+    __iter__=keys
+    def m(self): return self if self.d is None else self.d
+    def fit(self):
+        if self.d is not None and len(self.d)>self.n>>4: self._dense()
+    def _dense(self):
+        a=array('I',bytes(4*self.n))
+        for j,v in self.d.items(): a[j]=v|_CTP
+        self.a=a; self.ks=array('I',self.d); self.d=None
+
+_TS=(0,0,1,1,2,3,4,5,6,8)   # sparse-tilt row ops for the n-th query of a mirror countdown
+
+def _tilt(xs, n):
+    """The draws of one n-op sparse tilt: (i, jr, a) for each op that lands."""
+    ops=[]
+    for _ in range(n):
+        i=xs.ri(0,11); jr=xs.ri(0,11)
+        if i!=jr: ops.append((i,jr,xs.ri(1,3)))
+    return ops
+
+def mass_judas(w, qs, xs, D):
+    """Mass Judas over the lines of columns qs (the last 15 pre-mirror ones),
+    drawing from xs: XORs each column's poison into D (first-touch order, as
+    ct takes it). Yields the running column count after each column."""
+    c2l=w.c2l; l2c=w.l2c; jbank=w.jbank; co=c2l.off; lo=l2c.off; n=0
+    for qj in qs:
+        for li in c2l.idx[co[qj]:co[qj+1]]:
+            for aj in l2c.idx[lo[li]:lo[li+1]]:
+                s0,s1=xs.s0,xs.s1   # XS.next() inlined: 1 + len(poison) draws a column
+                r=(s0+s1)&M64; s1^=s0; s0=((s0<<24)&M64|s0>>40)^s1^((s1<<16)&M64); s1=(s1<<37)&M64|s1>>27
+                d=0
+                for p in jbank[r&255][:DIM]:
+                    r=(s0+s1)&M64; s1^=s0; s0=((s0<<24)&M64|s0>>40)^s1^((s1<<16)&M64); s1=(s1<<37)&M64|s1>>27
+                    d^=p<<2*(r%12)
+                xs.s0=s0; xs.s1=s1; D[aj]=D.get(aj,0)^d; n+=1; yield n
+
 class Av5:
-    __slots__=('sk','st','T','qc','wr','ct','xs','wi','nw','tn',
-               'dc2','dw','ma','mc','mT','ts','jr','s','isalt')
-    def __init__(self, seed, sk, isalt=None):
+    __slots__=('w','sk','st','T','qc','wr','ct','xs','wi','nw','tn',
+               'dc2','dw','ma','mc','mT','ts','jr','s','isalt','hb','k0')
+    def __init__(self, wl, seed, sk, isalt=None, fast=False):
         if isalt is None: isalt=random.Random().getrandbits(128).to_bytes(16,'big')
-        self.isalt=isalt; self.sk=sk
+        self.w=wl; self.isalt=isalt; self.sk=sk
         self.st=hashlib.sha256(seed+b"V5"+isalt).digest()
-        self.T=mat_id_flat(); self.qc=0; self.wr=WRank(64)
-        self.ct={}; self.xs=XS(self.st)
-        self.wi=0; self.nw=wb[0]; self.tn=0
+        # fast: keyed BLAKE2b prefix (key = initial state, binds seed+salt) and
+        # rotation ops read straight off the digest. A different, equally
+        # deterministic stream; the default stays the SHA-256/MT path.
+        self.k0=self.st if fast else None
+        self.hb=hashlib.blake2b(key=self.k0,digest_size=32,person=b"AZAZEL-v5") if fast else None
+        self.T=mat_id(); self.qc=0; self.wr=WRank(64)
+        self.ct=CMap(wl.ns); self.xs=XS(self.st)
+        self.wi=0; self.nw=wl.wb[0]; self.tn=0
         self.dc2=0; self.dw=deque(maxlen=20)
         self.ma=False; self.mc=0; self.mT=None; self.ts=0; self.jr=0.35
         self.s={'mn':0,'mj':0,'w':0,'ds':0,'ju':0,'jc':0,'pd':0,
                 'mi':0,'fr':0,'rn':0,'ti':0,'sk':0}
 
+    def _h(self,data):
+        if self.hb is None: return hashlib.sha256(data).digest()
+        h=self.hb.copy(); h.update(data); return h.digest()
+
+    def _ops(self,h,intensity):
+        return gen_ops(h,intensity) if self.hb is None else gen_ops_fast(h,intensity)
+
     def _us(self,j):
-        self.st=hashlib.sha256(self.st+j.to_bytes(4,'big')+self.isalt).digest()
+        if self.hb is None: self.st=hashlib.sha256(self.st+j.to_bytes(4,'big')+self.isalt).digest()
+        else: h=self.hb.copy(); h.update(self.st+j.to_bytes(4,'big')); self.st=h.digest()
 
     def _judas(self,j):
-        lines=c2l.get(j,[])
-        if not lines or self.xs.rf()>self.jr: return
-        ci_base=self.xs.next()
-        for li in lines:
-            ac=l2c.get(li,[])
-            if len(ac)<2: continue
-            poison=jbank[ci_base&255]; ci_base=self.xs.next()
-            for step,aj in enumerate(ac):
-                if aj==j or step>=len(poison): continue
-                if aj not in self.ct: self.ct[aj]=0
-                jc=_MF[(ci_base>>(step*2)&3)*4+((self.qc+step)%3+1)]%DIM
-                ac2=(jc+poison[step])%DIM
-                old=self.ct[aj]
-                old=sc(old,jc,_AF[gc(old,jc)*4+poison[step]])
-                old=sc(old,ac2,_FROB[gc(old,ac2)])
-                self.ct[aj]=old; self.s['ju']+=1
-                # Cascade Echo: propagate to j±1, j±3
-                for delta in (1,3):
-                    neighbor=(aj+delta)%NS
-                    if neighbor not in self.ct: self.ct[neighbor]=0
-                    nc=_MF[(ci_base>>(delta*2)&3)*4+poison[step%len(poison)]]%DIM
-                    self.ct[neighbor]=sc(self.ct[neighbor],nc,
-                        _AF[gc(self.ct[neighbor],nc)*4+poison[(step+delta)%len(poison)]])
-            self.s['pd']+=1
+        w=self.w; co=w.c2l.off
+        if co[j]==co[j+1] or self.xs.rf()>self.jr: return
+        P=w.jp; go=P.go; tg=P.tg; jbank=w.jbank; NS=w.ns
+        xs=self.xs; qc=self.qc; g0,g1=P.off[j],P.off[j+1]; n=0
+        ct=self.ct; d=ct.d; a=ct.a; ks=ct.ks
+        cb=xs.next()
+        for g in range(g0,g1):
+            poison=jbank[cb&255]; cb=xs.next(); pl=len(poison); e0,e1=go[g],go[g+1]
+            m1=(cb>>2&3)*4; m3=(cb>>6&3)*4
+            for v in tg[e0:e1]:
+                s=v&15
+                if s>=pl: break
+                aj=v>>4; p=poison[s]; jc=_MF[(cb>>2*s&3)*4+(qc+s)%3+1]; ac=(jc+p)%DIM
+                # Cascade Echo: propagate to j+1, j+3
+                n1=(aj+1)%NS; n3=(aj+3)%NS
+                if a is None:
+                    o=d.get(aj,0)^p<<2*jc; d[aj]=o^(o>>2*ac+1&1)<<2*ac
+                    d[n1]=d.get(n1,0)^poison[(s+1)%pl]<<2*_MF[m1+p]
+                    d[n3]=d.get(n3,0)^poison[(s+3)%pl]<<2*_MF[m3+p]
+                else:   # dense: bit 24 marks present and no XOR here reaches it
+                    x=a[aj]
+                    if not x: ks.append(aj); x=_CTP
+                    o=x^p<<2*jc; a[aj]=o^(o>>2*ac+1&1)<<2*ac
+                    x=a[n1]
+                    if not x: ks.append(n1); x=_CTP
+                    a[n1]=x^poison[(s+1)%pl]<<2*_MF[m1+p]
+                    x=a[n3]
+                    if not x: ks.append(n3); x=_CTP
+                    a[n3]=x^poison[(s+3)%pl]<<2*_MF[m3+p]
+                n+=1
+        st=self.s; st['ju']+=n; st['pd']+=g1-g0
+        ct.fit()
 
     def _wind(self):
         if self.qc<self.nw: return
-        h=hashlib.sha256(self.st+b"W5"+self.isalt).digest()
+        h=self._h(self.st+b"W5"+self.isalt)
         te=self.xs.next()%8
-        ops=gen_ops(h, 'major' if te>=5 else 'minor')
+        ops=self._ops(h, 'major' if te>=5 else 'minor')
         if self.qc%2==0: apply_row_ops(self.T, ops)
         else: apply_row_ops(self.T, [(op[1],op[0],op[2],op[3] if len(op)>3 else False) for op in ops])
         self.s['w']+=1; self.s['ds']+=1
         self.tn+=1
         if self.tn%3==0:
-            nh=hashlib.sha256(h+b"TN").digest()
-            apply_row_ops(self.T, gen_ops(nh,'minor'))
-        self.wi=(self.wi+1)%len(wb)
+            nh=self._h(h+b"TN")
+            apply_row_ops(self.T, self._ops(nh,'minor'))
+        wb=self.w.wb; self.wi=(self.wi+1)%len(wb)
         mod=max(1,(self.xs.next()%5)+1)
         self.nw=self.qc+max(5,wb[self.wi]//mod)
 
@@ -511,37 +1310,25 @@ class Av5:
         if self.ma:
             self.mc-=1
             if self.mc<=0:
-                h=hashlib.sha256(self.st+b"MS5").digest()
-                apply_row_ops(self.T, gen_ops(h,'frobenius'))
+                h=self._h(self.st+b"MS5")
+                apply_row_ops(self.T, self._ops(h,'frobenius'))
                 self.s['fr']+=1
-                # Mass Judas injection
-                for qj in list(self.dw)[-15:]:
-                    for li in c2l.get(qj,[]):
-                        for aj in l2c.get(li,[]):
-                            poison=jbank[self.xs.next()&255]
-                            if aj not in self.ct: self.ct[aj]=0
-                            for step in range(min(len(poison),DIM)):
-                                ci=self.xs.ri(0,11)
-                                self.ct[aj]=sc(self.ct[aj],ci,_AF[gc(self.ct[aj],ci)*4+poison[step%len(poison)]])
-                            self.s['ju']+=1
+                self._massj()
                 self.s['sk']+=1; self.ma=False; self.dc2=0; self.ts=0
                 # Synthetic key
-                col=Hp[j]
+                col=self.w.Hp[j]; cc=self.w.Hcp[j]
                 for i in range(12):
-                    if self.xs.rf()<0.85: col=sc(col,i,gc(Hcp[j],i))
+                    if self.xs.rf()<0.85: col=sc(col,i,gc(cc,i))
                 return('S',col)
             self.ts+=1
-            sched=[0,0,1,1,2,3,4,5,6,8]
-            si=min(self.ts-1,len(sched)-1); np2=sched[si]
-            col=Hp[j]
+            np2=_TS[min(self.ts,len(_TS))-1]
+            col=self.w.Hp[j]
             if np2>0:
                 # Sparse tilt: apply np2 random row ops directly
-                for _ in range(np2):
-                    i=self.xs.ri(0,11); jr=self.xs.ri(0,11)
-                    if i!=jr:
-                        v=unpack12(col)
-                        v[i]=_AF[v[i]*4+_MF[self.xs.ri(1,3)*4+v[jr]]]
-                        col=pack12(v)
+                for i,jr,a in _tilt(self.xs,np2):
+                    v=unpack12(col)
+                    v[i]=_AF[v[i]*4+_MF[a*4+v[jr]]]
+                    col=pack12(v)
                 self.s['ti']+=1
             if self.mT: col=apply_T_to_packed(self.mT,col)
             return('T',col)
@@ -549,42 +1336,85 @@ class Av5:
         if len(self.dw)>=10:
             m=sum(self.dw)/len(self.dw)
             v2=sum((q-m)**2 for q in self.dw)/len(self.dw)
-            if v2/max((NS/2)**2,1)>0.15:
+            if v2/max((self.w.ns/2)**2,1)>0.15:
                 self.dc2+=1
                 if self.dc2>=5:
                     self.ma=True; self.mc=10
-                    self.mT=list(self.T); self.s['mi']+=1; self.ts=0
+                    self.mT=self.T.copy(); self.s['mi']+=1; self.ts=0
                     return('A',None)
             else: self.dc2=max(0,self.dc2-1)
         return(None,None)
 
+    def _mass(self,xs,D): return mass_judas(self.w,list(self.dw)[-15:],xs,D)
+
+    def _inject(self,D,n):
+        ct=self.ct.m()
+        for aj,d in D.items(): ct[aj]=ct.get(aj,0)^d
+        self.ct.fit(); self.s['ju']+=n
+
+    def _massj(self):
+        D={}; n=0
+        for n in self._mass(self.xs,D): pass
+        self._inject(D,n)
+
     def query(self,j,key=None):
-        if j<0 or j>=NS: return None
+        if j<0 or j>=self.w.ns: return None
         self.qc+=1
-        if key==self.sk: return unpack12(Hp[j])
+        if key==self.sk: return unpack12(self.w.Hp[j])
+        return unpack12(self._qp(j))
+
+    def query_many(self,idx,key=None,out=None):
+        """query() over a sequence, packed. out[k] is the 24-bit column (QNONE if
+        idx[k] is out of range); state advances exactly as len(idx) query() calls.
+        out may be any writable u32 buffer (array('I'), memoryview, ndarray);
+        idx may be an ndarray too."""
+        if hasattr(idx,'dtype'): idx=idx.tolist()
+        n=len(idx); Hp=self.w.Hp; NS=len(Hp)
+        if out is None: out=array('I',bytes(4*n))
+        elif len(out)<n: raise ValueError(f"out holds {len(out)} < {n} results")
+        if key==self.sk:
+            if n and min(idx)>=0 and max(idx)<NS:
+                out[:n]=array('I',map(Hp.__getitem__,idx)); self.qc+=n
+            else:
+                for k,j in enumerate(idx):
+                    if 0<=j<NS: out[k]=Hp[j]; self.qc+=1
+                    else: out[k]=QNONE
+            return out
+        qp=self._qp
+        for k,j in enumerate(idx):
+            if 0<=j<NS: self.qc+=1; out[k]=qp(j)
+            else: out[k]=QNONE
+        return out
+
+    def _qp(self,j):
+        """Enemy path of query() on a packed column (qc already advanced)."""
         self._us(j)
         ms,mc=self._mirror(j)
-        if ms=='T': return unpack12(mc)
+        if ms=='T' or ms=='S': return mc
+        Hp=self.w.Hp
         if ms=='A':
             c=Hp[j]
             if self.mT: c=apply_T_to_packed(self.mT,c)
-            return unpack12(c)
-        if ms=='S': return unpack12(mc)
+            return c
         self._wind()
-        ds=self.wr.add(unpack12(Hp[j]))
+        ds=self.wr.add(Hp[j])
+        self._rot(ds)
+        self._judas(j)
+        return self._rain(apply_T_to_packed(self.T,padd(Hp[j],self.ct.get(j))),ds)
+
+    def _rot(self,ds):
+        """Rank-pressure rotations of T and the matching jr escalation."""
         if ds>=3:
-            h=hashlib.sha256(self.st+b"D"+self.qc.to_bytes(4,'big')).digest()
-            apply_row_ops(self.T, gen_ops(h,'minor')); self.s['mn']+=1
+            h=self._h(self.st+b"D"+self.qc.to_bytes(4,'big'))
+            apply_row_ops(self.T, self._ops(h,'minor')); self.s['mn']+=1
         if ds>=6:
-            h=hashlib.sha256(self.st+b"W"+self.qc.to_bytes(4,'big')).digest()
-            apply_row_ops(self.T, gen_ops(h,'major')); self.s['mj']+=1
+            h=self._h(self.st+b"W"+self.qc.to_bytes(4,'big'))
+            apply_row_ops(self.T, self._ops(h,'major')); self.s['mj']+=1
         if ds>=6: self.jr=min(0.75,self.jr+0.05)
         elif ds>=3: self.jr=min(0.55,self.jr+0.02)
-        self._judas(j)
-        col=Hp[j]
-        if j in self.ct: col=padd(col,self.ct[j])
-        col=apply_T_to_packed(self.T,col)
-        # Rain (XorShift, no SHA)
+
+    def _rain(self,col,ds):
+        """Rain (XorShift, no SHA)"""
         ri=self.xs.next()%8
         if ds>=4:
             if ri<4: ci=self.xs.ri(0,11); col=sc(col,ci,_AF[gc(col,ci)*4+self.xs.ri(1,3)]); self.s['rn']+=1
@@ -592,109 +1422,1896 @@ class Av5:
             if ri<2: ci=self.xs.ri(0,11); col=sc(col,ci,_AF[gc(col,ci)*4+self.xs.ri(1,3)]); self.s['rn']+=1
             elif ri==7:
                 for _ in range(3): ci=self.xs.ri(0,11); col=sc(col,ci,_AF[gc(col,ci)*4+self.xs.ri(1,3)]); self.s['rn']+=1
-        return unpack12(col)
+        return col
+
+    def snapshot(self):
+        """Session state as bytes (SNAP_VER layout below). The friend key is not
+        included; restore() takes it like the constructor does."""
+        ct=self.ct; wr=self.wr; mT=self.mT
+        if len(self.isalt)>0xFFFF: raise ValueError(f"salt of {len(self.isalt)} B: snapshots hold up to 65535")
+        if ct.a is None: ks=array('I',ct.d); vs=array('I',ct.d.values())
+        else: ks=ct.ks; a=ct.a; vs=array('I',[a[k]&M24 for k in ks])
+        fl=(self.hb is not None)|self.ma<<1|(mT is not None)<<2
+        body=(array('I',self.T)+(array('I',mT) if mT is not None else array('I'))+array('I',wr.basis)
+              +array('I',self.dw)+ks+vs)
+        b8=array('Q',wr.bt)+array('Q',[self.s[k] for k in _SSK])
+        if sys.byteorder!='little': body.byteswap(); b8.byteswap()
+        return (_SSH.pack(SNAP_MAGIC,SNAP_VER,self.w.key,fl,self.st,self.k0 or bytes(32),self.qc,self.xs.s0,self.xs.s1,
+                          self.wi,self.nw,self.tn,self.dc2,self.mc,self.ts,self.jr,self.T.nd,
+                          mT.nd if mT is not None else 0,wr.win,wr.t,wr.rank,len(self.dw),
+                          len(self.isalt),len(ks))
+                +self.isalt+b8.tobytes()+body.tobytes())
+
+    @classmethod
+    def restore(cls, wl, b, sk, **kw):
+        """Inverse of snapshot(): the restored session continues the same stream.
+        It goes through cls's constructor, so subclasses get their own state
+        (kw: pf=, tr=, dl=, as for the constructor) before the blob's is laid over."""
+        if len(b)<_SSH.size: raise ValueError("snapshot truncated")
+        (mg,ver,wk,fl,st,k0,qc,x0,x1,wi,nw,tn,dc2,mc,ts,jr,nd,mnd,win,wt,wrk,ndw,nsl,nct)=_SSH.unpack_from(b)
+        if mg!=SNAP_MAGIC or ver!=SNAP_VER: raise ValueError(f"not a v{SNAP_VER} Av5 snapshot")
+        if wk!=wl.key: raise ValueError("snapshot was taken on a different wall")
+        nm=12 if fl&4 else 0; p=_SSH.size+nsl
+        if len(b)!=p+8*(12+len(_SSK))+4*(24+nm+ndw+2*nct): raise ValueError("snapshot size mismatch")
+        b8=array('Q',b[p:p+8*(12+len(_SSK))]); p+=len(b8)*8; u=array('I',b[p:])
+        if sys.byteorder!='little': b8.byteswap(); u.byteswap()
+        o=cls(wl,b"",sk,bytes(b[_SSH.size:_SSH.size+nsl]),bool(fl&1),**kw); o.st=st; o.qc=qc
+        o.k0=k0 if fl&1 else None
+        o.hb=hashlib.blake2b(key=k0,digest_size=32,person=b"AZAZEL-v5") if fl&1 else None
+        o.T=TMat(u[:12]); o.T.nd=nd
+        o.mT=None
+        if nm: o.mT=TMat(u[12:24]); o.mT.nd=mnd
+        q=12+nm; wr=o.wr=WRank(win); wr.basis=list(u[q:q+12]); wr.bt=list(b8[:12]); wr.t=wt; wr.rank=wrk
+        q+=12; o.dw=deque(u[q:q+ndw],maxlen=20); q+=ndw
+        ct=o.ct=CMap(wl.ns); d=ct.d
+        for k,v in zip(u[q:q+nct],u[q+nct:q+2*nct]): d[k]=v
+        ct.fit()
+        o.xs=XS(bytes(16)); o.xs.s0=x0; o.xs.s1=x1
+        o.wi=wi; o.nw=nw; o.tn=tn; o.dc2=dc2; o.ma=bool(fl&2); o.mc=mc; o.ts=ts; o.jr=jr
+        o.s=dict(zip(_SSK,b8[12:])); return o
+
+# Snapshot layout (little-endian): _SSH header (with the wall key), isalt, u64 WRank stamps[12] and
+# stats[12] (_SSK order), then u32 T[12] | mT[12] if present | WRank basis[12] |
+# dw | ct keys (insertion order) | ct values.
+SNAP_MAGIC=b"AZSS"; SNAP_VER=3   # 2: salt length u16 (was u8); 3: wall key
+_SSH=struct.Struct('<4sH32sB32s32sQQQHQQIiIdHHHQBBHI')
+_SSK=('mn','mj','w','ds','ju','jc','pd','mi','fr','rn','ti','sk')
+
+# ── Opt-in instrumentation: Av5P times every stage of the enemy path into a
+# Prof; plain Av5 carries no hooks, so the default path costs nothing.
+class Prof:
+    """Per-stage latency histograms (log2 ns buckets) and net allocated blocks
+    per query, shared by any number of Av5P sessions."""
+    LO=6; NB=24   # bucket k counts dt < 2**(k+LO) ns (64 ns … 0.5 s); NB is +Inf
+    NA=16         # alloc bucket k counts net blocks ≤ 2**k-1; NA is +Inf
+    STAGES=('us','mirror','wind','wrank','rot','judas','tapply','rain','defer','query')
+    def __init__(self):
+        self.h={k:[0]*(self.NB+1) for k in self.STAGES}; self.t=dict.fromkeys(self.STAGES,0)
+        self.al=[0]*(self.NA+1); self.at=0
+
+    def rec(self, k, dt):
+        self.h[k][min(max(dt.bit_length()-self.LO,0),self.NB)]+=1; self.t[k]+=dt
+
+    def alloc(self, d):
+        self.al[min(max(d,0).bit_length(),self.NA)]+=1; self.at+=d
+
+    def quantile(self, k, q):
+        """Upper bucket bound (ns) holding the q-quantile of stage k; 0 if empty."""
+        h=self.h[k]; n=sum(h); c=0
+        for i,x in enumerate(h):
+            c+=x
+            if n and c>=q*n: return 1<<(i+self.LO) if i<self.NB else float('inf')
+        return 0
+
+    def snapshot(self):
+        return {'stages':{k:{'count':sum(self.h[k]),'sum_ns':self.t[k],'buckets':list(self.h[k]),
+                             'p50_ns':self.quantile(k,0.5),'p99_ns':self.quantile(k,0.99)}
+                          for k in self.STAGES},
+                'alloc':{'buckets':list(self.al),'sum_blocks':self.at}}
+
+    def merge(self, snap):
+        for k,v in snap['stages'].items():
+            self.h[k]=[a+b for a,b in zip(self.h[k],v['buckets'])]; self.t[k]+=v['sum_ns']
+        self.al=[a+b for a,b in zip(self.al,snap['alloc']['buckets'])]; self.at+=snap['alloc']['sum_blocks']
+        return self
+
+    def prometheus(self, ns='azazel'):
+        """Prometheus text exposition (cumulative le buckets, seconds)."""
+        o=[f"# HELP {ns}_stage_seconds Av5 enemy-path latency per stage",
+           f"# TYPE {ns}_stage_seconds histogram"]
+        for k in self.STAGES:
+            c=0
+            for i,x in enumerate(self.h[k]):
+                c+=x; le='+Inf' if i==self.NB else f"{(1<<(i+self.LO))/1e9:.9g}"
+                o.append(f'{ns}_stage_seconds_bucket{{stage="{k}",le="{le}"}} {c}')
+            o.append(f'{ns}_stage_seconds_sum{{stage="{k}"}} {self.t[k]/1e9:.9g}')
+            o.append(f'{ns}_stage_seconds_count{{stage="{k}"}} {c}')
+        o+=[f"# HELP {ns}_query_alloc_blocks Net allocated blocks per query",
+            f"# TYPE {ns}_query_alloc_blocks histogram"]; c=0
+        for i,x in enumerate(self.al):
+            c+=x; le='+Inf' if i==self.NA else str((1<<i)-1)
+            o.append(f'{ns}_query_alloc_blocks_bucket{{le="{le}"}} {c}')
+        o+=[f"{ns}_query_alloc_blocks_sum {self.at}", f"{ns}_query_alloc_blocks_count {c}"]
+        return "\n".join(o)+"\n"
+
+class Av5P(Av5):
+    """Av5 whose enemy path records stage latencies into pf (same output stream)."""
+    __slots__=('pf',)
+    def __init__(self, wl, seed, sk, isalt=None, fast=False, pf=None):
+        super().__init__(wl,seed,sk,isalt,fast); self.pf=pf if pf is not None else Prof()
+
+    def _qp(self,j):
+        pf=self.pf; rec=pf.rec; now=time.perf_counter_ns; Hp=self.w.Hp
+        b0=sys.getallocatedblocks(); t0=t=now()
+        self._us(j); u=now(); rec('us',u-t); t=u
+        ms,mc=self._mirror(j); u=now(); rec('mirror',u-t); t=u
+        if ms=='A':
+            mc=Hp[j]
+            if self.mT: mc=apply_T_to_packed(self.mT,mc)
+            u=now(); rec('tapply',u-t); t=u
+        if ms is None:
+            self._wind(); u=now(); rec('wind',u-t); t=u
+            ds=self.wr.add(Hp[j]); u=now(); rec('wrank',u-t); t=u
+            self._rot(ds); u=now(); rec('rot',u-t); t=u
+            self._judas(j); u=now(); rec('judas',u-t); t=u
+            mc=apply_T_to_packed(self.T,padd(Hp[j],self.ct.get(j))); u=now(); rec('tapply',u-t); t=u
+            mc=self._rain(mc,ds); u=now(); rec('rain',u-t)
+        rec('query',now()-t0); pf.alloc(sys.getallocatedblocks()-b0)
+        return mc
+
+# ── Deadline mode: the same stream under a per-query latency budget. A mirror
+# countdown (10 queries) only tilts, and tilts only draw from xs, so at
+# activation the mass Judas that ends it is already determined: Av5D runs it
+# ahead on a copy of xs, in each query's slack, and the firing query just
+# applies the deltas. Work the slack didn't cover is finished at the fire.
+class Av5D(Av5):
+    """Av5 under a per-query budget of dl ns; query latencies (and the deferred
+    work they carried) go to pf, if given. The job's jn columns are spread
+    evenly over the countdown, each share capped at half the query's slack
+    by cc, the measured ns per column."""
+    __slots__=('dl','pf','job','jn','pre','cc')
+    def __init__(self, wl, seed, sk, isalt=None, fast=False, dl=250_000, pf=None):
+        super().__init__(wl,seed,sk,isalt,fast)
+        self.dl=dl; self.pf=pf; self.job=None; self.jn=0; self.pre=None; self.cc=8000
+
+    def _ahead(self, xs):
+        """The mass Judas from xs (the stream as of the fire); done → self.pre."""
+        x0=(xs.s0,xs.s1); D={}; n=0
+        for n in self._mass(xs,D): yield
+        self.pre=(x0,xs.s0,xs.s1,D,n)
+
+    def _mirror(self, j):
+        r=Av5._mirror(self,j)
+        if r[0]=='A':
+            w=self.w; co=w.c2l.off; ci=w.c2l.idx; lo=w.l2c.off
+            self.jn=sum(lo[li+1]-lo[li] for qj in list(self.dw)[-15:] for li in ci[co[qj]:co[qj+1]])
+            xs=XS(bytes(16)); xs.s0=self.xs.s0; xs.s1=self.xs.s1
+            for ts in range(1,self.mc): _tilt(xs,_TS[min(ts,len(_TS))-1])   # the countdown's draws
+            self.pre=None; self.job=self._ahead(xs)
+        return r
+
+    def _massj(self):
+        if self.job is not None:
+            for _ in self.job: pass   # what the countdown's slack didn't cover
+            self.job=None
+        p=self.pre; self.pre=None
+        if p is not None and p[0]==(self.xs.s0,self.xs.s1):
+            self.xs.s0=p[1]; self.xs.s1=p[2]; self._inject(p[3],p[4])
+        else: Av5._massj(self)
+
+    def step(self, ns):
+        """Run deferred work for about ns (e.g. while the server is idle); True
+        once nothing is left."""
+        job=self.job
+        if job is None: return True
+        k=int(ns/self.cc)
+        if k<=0: return False
+        t=time.perf_counter_ns(); i=0
+        for i in range(1,k+1):
+            if next(job,1): self.job=None; break
+        self.cc=(3*self.cc+(time.perf_counter_ns()-t)/i)/4; self.jn-=i
+        return self.job is None
+
+    def _qp(self, j):
+        now=time.perf_counter_ns; t0=now(); c=Av5._qp(self,j)
+        if self.job is not None:
+            t=now(); self.step(min((self.dl-(t-t0))/2,-(-self.jn//max(self.mc,1))*self.cc+1))
+            if self.pf is not None: self.pf.rec('defer',now()-t)
+        if self.pf is not None: self.pf.rec('query',now()-t0)
+        return c
 
 # ══════════════════════════════════════════════════════════════
-# 4. FUSED ATTACK BATTERY
+# LOCKSTEP — N Av5 sessions as arrays, one query each per step (NumPy)
+# ══════════════════════════════════════════════════════════════
+# Struct-of-arrays: T/mT as (N,12) packed rows, XS s0/s1 as u64 vectors, the
+# WRank basis and stamps as (N,12), dw as a right-aligned (N,20) window, ct as
+# one _VCT hash table over (lane, col) that grows with the columns touched.
+# Each stage runs once per step over the
+# lanes its branch mask selects; per lane it keeps the scalar path's XS draw
+# order. Only the SHA-256/BLAKE2b chain, Mersenne Twister gen_ops (the default
+# stream) and a firing mirror's mass Judas loop over their lanes.
+
+def _vpmul(p, a):
+    """pmul lane-wise: a·p for a vector of scalars a ∈ GF(4)."""
+    l=p&M5; h=(p>>1)&M5
+    return np.where(a==1,p,np.where(a==2,h|(l^h)<<1,np.where(a==3,(l^h)|l<<1,0))).astype(np.uint32)
+
+def _vT(T, v):
+    """apply_T_to_packed row-wise: T (n,12) packed rows, v (n,) columns."""
+    v0=v&M5; v1=(v>>1)&M5; vx=v0^v1; r=np.zeros(len(v),np.uint32); bc=np.bitwise_count
+    for i in range(12):
+        t=T[:,i]; t0=t&M5; t1=(t>>1)&M5
+        r|=((bc((t0&v0)^(t1&v1))&1)|(bc((t0&v1)^(t1&vx))&1)<<1).astype(np.uint32)<<(2*i)
+    return r
+
+def _xs_run(s0, s1, K):
+    """K XS.next() draws on every lane of (s0, s1) → (R (K,n), states (K+1,n) ×2)."""
+    u=np.uint64; n=len(s0); R=np.empty((K,n),u); H0=np.empty((K+1,n),u); H1=np.empty((K+1,n),u)
+    H0[0]=s0; H1[0]=s1; a=np.empty(n,u); b=np.empty(n,u)
+    for t in range(K):
+        s0=H0[t]; s1=H1[t]; np.add(s0,s1,out=R[t]); np.bitwise_xor(s1,s0,out=b)
+        np.left_shift(s0,u(24),out=a); a|=s0>>u(40); a^=b; a^=b<<u(16); H0[t+1]=a
+        np.left_shift(b,u(37),out=H1[t+1]); H1[t+1]|=b>>u(27)
+    return R,H0,H1
+
+class _VCT:
+    """Every lane's contamination map in one open-addressing table keyed
+    lane·NS+col (linear probing, u32 masks): memory follows the columns the
+    lanes actually touched, not N×NS. get/put/xor take aligned key arrays."""
+    def __init__(self, ns, cap=1<<12):
+        self.ns=ns; self.n=0; self._alloc(cap)
+    def _alloc(self, cap):
+        self.K=np.full(cap,-1,np.int64); self.V=np.zeros(cap,np.uint32); self.sh=np.uint64(64-cap.bit_length()+1)
+    def _h(self, k): return ((k.astype(np.uint64)*np.uint64(0x9E3779B97F4A7C15))>>self.sh).astype(np.int64)
+    def _find(self, k):
+        K=self.K; mk=len(K)-1; h=self._h(k); s=np.full(len(k),-1,np.int64); a=np.arange(len(k))
+        while a.size:
+            x=K[h[a]]; hit=x==k[a]; s[a[hit]]=h[a[hit]]; a=a[~hit&(x!=-1)]; h[a]=(h[a]+1)&mk
+        return s
+    def _fit(self, m):   # room for m more keys at ≤ 1/2 load
+        if 2*(self.n+m)>len(self.K):
+            ok=self.K[self.K>=0]; ov=self.V[self.K>=0]; c=len(self.K)
+            while 2*(self.n+m)>c: c*=2
+            self._alloc(c); self.n=0; self.V[self._ins(ok)]=ov
+    def _ins(self, k):   # k distinct and absent, room made
+        K=self.K; mk=len(K)-1; h=self._h(k); s=np.empty(len(k),np.int64); a=np.arange(len(k))
+        while a.size:
+            f=K[h[a]]==-1; u,i=np.unique(h[a[f]],return_index=True); w=a[f][i]
+            K[u]=k[w]; s[w]=u; d=np.zeros(len(k),bool); d[w]=True; a=a[~d[a]]; h[a]=(h[a]+1)&mk
+        self.n+=len(k); return s
+    def key(self, L, J): return L.astype(np.int64)*self.ns+J
+    def get(self, k):
+        s=self._find(k); return np.where(s>=0,self.V[np.maximum(s,0)],0).astype(np.uint32)
+    def slot(self, k):
+        """Slots of distinct keys k, inserting the missing ones as 0; valid
+        until the next insert."""
+        self._fit(len(k)); s=self._find(k); m=s<0
+        if m.any(): s[m]=self._ins(k[m])
+        return s
+    def put(self, k, v): self.V[self.slot(k)]=v
+    def xor(self, k, d):   # k may repeat
+        if not len(k): return
+        o=np.argsort(k,kind='stable'); k=k[o]; u,i=np.unique(k,return_index=True)
+        d=np.bitwise_xor.reduceat(d[o],i); self.put(u,self.get(u)^d)
+    def row(self, k):
+        """Lane k's (cols, masks) in column order."""
+        m=(self.K>=k*self.ns)&(self.K<(k+1)*self.ns); c=self.K[m]-k*self.ns; o=np.argsort(c)
+        return c[o],self.V[m][o]
+    def nbytes(self): return self.K.nbytes+self.V.nbytes
+
+class Av5L:
+    """N Av5 sessions on one wall stepped in lockstep: lane k answers, counts
+    and ends up exactly as Av5(wl, seed, sk, isalts[k], fast) would."""
+    def __init__(self, wl, seed, sk, isalts, fast=False):
+        if np is None: raise RuntimeError("Av5L requires NumPy")
+        u=np.uint32; n=self.n=len(isalts); ns=self.ns=wl.ns
+        self.w=wl; self.sk=sk; self.fast=fast; self.isalt=list(isalts)
+        self.st=[hashlib.sha256(seed+b"V5"+s).digest() for s in self.isalt]
+        self.hb=[hashlib.blake2b(key=k,digest_size=32,person=b"AZAZEL-v5") for k in self.st] if fast else None
+        self.k0=list(self.st) if fast else None
+        x=np.frombuffer(b"".join(s[:16] for s in self.st),'>u8').reshape(n,2)|np.uint64(1)
+        self.x0=x[:,0].astype(np.uint64); self.x1=x[:,1].astype(np.uint64)
+        self.T=np.tile(np.uint32(1)<<(2*np.arange(12,dtype=u)),(n,1)); self.mT=np.zeros((n,12),u)
+        self.hm=np.zeros(n,bool)
+        self.wb=np.zeros((n,12),u); self.wt=np.zeros((n,12),np.int64)
+        self.wtc=np.zeros(n,np.int64); self.wrk=np.zeros(n,np.int64)
+        self.ct=_VCT(ns); self.dw=np.zeros((n,20),np.int64); self.dn=np.zeros(n,np.int64)
+        z=lambda: np.zeros(n,np.int64)
+        self.qc=z(); self.wi=z(); self.tn=z(); self.dc2=z(); self.mc=z(); self.ts=z()
+        self.nw=np.full(n,wl.wb[0],np.int64); self.ma=np.zeros(n,bool); self.jr=np.full(n,0.35)
+        self.s=np.zeros((n,len(_SSK)),np.int64)
+        # wall, read-only
+        self.Hp=np.asarray(wl.Hp,dtype=u); self.Hcp=np.asarray(wl.Hcp,dtype=u)
+        self.co=np.asarray(wl.c2l.off,dtype=u); self.ci=np.asarray(wl.c2l.idx,dtype=u)
+        self.lo=np.asarray(wl.l2c.off,dtype=u); self.lx=np.asarray(wl.l2c.idx,dtype=u)
+        P=wl.jp; self.po=np.asarray(P.off,dtype=np.int64); self.go=np.asarray(P.go,dtype=np.int64)
+        self.tg=np.asarray(P.tg,dtype=np.int64)
+        self.jl=np.array([len(p) for p in wl.jbank]); self.jb=np.zeros((256,max(JP)),np.int64)
+        for i,p in enumerate(wl.jbank): self.jb[i,:len(p)]=p
+        self.wbv=np.array(wl.wb); self.mf=np.array(_MF); self.den=max((ns/2)**2,1)
+
+    # ── XS, per lane ──
+    def _nx(self, L):
+        """XS.next() for lanes L (distinct)."""
+        s0=self.x0[L]; s1=self.x1[L]; r=s0+s1; s1^=s0
+        self.x0[L]=((s0<<np.uint64(24))|(s0>>np.uint64(40)))^s1^(s1<<np.uint64(16))
+        self.x1[L]=(s1<<np.uint64(37))|(s1>>np.uint64(27)); return r
+    def _ri(self, L, lo, hi): return (lo+self._nx(L)%np.uint64(hi-lo+1)).astype(np.int64)
+    def _rf(self, L): return (self._nx(L)&np.uint64(0xFFFFF)).astype(np.float64)/0xFFFFF
+
+    # ── hashing and row ops ──
+    def _h(self, k, data):
+        if not self.fast: return hashlib.sha256(data).digest()
+        h=self.hb[k].copy(); h.update(data); return h.digest()
+
+    def _opa(self, hs, its):
+        """gen_ops for each digest in hs (intensity names its) as padded arrays
+        (n,k,4) (i, j, alpha, frob) plus the (n,k) mask of real ops."""
+        n=len(hs)
+        if not self.fast:
+            opl=[gen_ops(h,i) for h,i in zip(hs,its)]; k=max(map(len,opl))
+            A=np.zeros((n,k,4),np.int64); ok=np.zeros((n,k),bool)
+            for r,o in enumerate(opl): A[r,:len(o)]=o; ok[r,:len(o)]=True
+            return A,ok
+        H=np.frombuffer(b"".join(hs),np.uint8).reshape(n,32).astype(np.int64)   # gen_ops_fast
+        lo,sp=np.array([_FOPS[i] for i in its]).T; cnt=lo+H[:,0]%sp; k=int(cnt.max())
+        A=np.zeros((n,k,4),np.int64); ok=np.arange(k)<cnt[:,None]
+        for q in range(k):
+            i=H[:,1+3*q]%12; A[:,q,0]=i; A[:,q,1]=(i+1+H[:,2+3*q]%11)%12; A[:,q,2]=1+H[:,3+3*q]%3
+        A[:,:,3]=np.array([i=='frobenius' for i in its])[:,None]
+        return A,ok
+
+    def _rows(self, L, hs, its, tr=None):
+        """apply_row_ops(T, ops) on lanes L, ops from digests hs; rows where tr
+        is set get the transposed (j, i) ops."""
+        if not len(L): return
+        A,ok=self._opa(hs,its)
+        if tr is not None: A[tr,:,:2]=A[tr][:,:,1::-1]
+        T=self.T
+        for q in range(A.shape[1]):
+            m=ok[:,q]; R=L[m]; i,j,a,f=A[m,q].T; v=T[R,j]
+            v=np.where(f!=0,v^((v>>1)&M5),v); T[R,i]^=_vpmul(v,a)
+
+    # ── the query ──
+    def step(self, idx, fr=None, out=None):
+        """One query per lane: lane k asks column idx[k], with the friend key
+        where fr[k]. → u32 packed responses, QNONE where idx[k] is out of range
+        (that lane's state doesn't move, as query() returns None)."""
+        idx=np.asarray(idx,np.int64); ok=(idx>=0)&(idx<self.ns)
+        if out is None: out=np.empty(self.n,np.uint32)
+        out[:]=QNONE; self.qc[ok]+=1
+        if fr is not None:
+            F=np.flatnonzero(ok&fr); out[F]=self.Hp[idx[F]]; ok&=~np.asarray(fr,bool)
+        L=np.flatnonzero(ok)
+        if len(L): out[L]=self._qp(L,idx[L])
+        return out
+
+    def run(self, Q, F=None):
+        """step() over the rows of Q (steps × lanes) → responses, same shape."""
+        R=np.empty(np.shape(Q),np.uint32)
+        for t in range(len(R)): self.step(Q[t],None if F is None else F[t],R[t])
+        return R
+
+    def _qp(self, L, J):
+        st=self.st; jl=J.tolist(); ll=L.tolist()
+        if self.fast:   # _us
+            for k,j in zip(ll,jl): h=self.hb[k].copy(); h.update(st[k]+j.to_bytes(4,'big')); st[k]=h.digest()
+        else:
+            for k,j in zip(ll,jl): st[k]=hashlib.sha256(st[k]+j.to_bytes(4,'big')+self.isalt[k]).digest()
+        res=np.empty(len(L),np.uint32); S=self.s; Hp=self.Hp
+        cm=self.ma[L]; self.mc[L[cm]]-=1
+        fire=cm&(self.mc[L]<=0); tilt=cm&~fire
+        if fire.any(): res[fire]=self._fire(L[fire],J[fire])
+        if tilt.any():   # countdown: sparse tilt, then mT
+            Lt=L[tilt]; self.ts[Lt]+=1; n2=np.array(_TS)[np.minimum(self.ts[Lt],len(_TS))-1]
+            col=Hp[J[tilt]].astype(np.int64)
+            for q in range(int(n2.max())):
+                m=n2>q; R=Lt[m]; i=self._ri(R,0,11); jr=self._ri(R,0,11); d=i!=jr
+                c=col[m]; a=self._ri(R[d],1,3); c2=c[d]
+                c2^=self.mf[a*4+((c2>>(2*jr[d]))&3)]<<(2*i[d]); c[d]=c2; col[m]=c
+            S[Lt[n2>0],_SSK.index('ti')]+=1
+            res[tilt]=_vT(self.mT[Lt],col.astype(np.uint32))
+        pl=~cm
+        if pl.any():   # mirror watch: dw window variance
+            P=L[pl]; dw=self.dw; dw[P,:-1]=dw[P,1:]; dw[P,-1]=J[pl]
+            dn=self.dn[P]=np.minimum(self.dn[P]+1,20); w=dn>=10; Q=P[w]
+            if len(Q):
+                D=dw[Q]; nq=dn[w]; v=np.arange(20)>=20-nq[:,None]
+                m=(D*v).sum(1)/nq; r=(((D-m[:,None])**2)*v).sum(1)/nq/self.den; hi=r>0.15
+                for x in np.flatnonzero(np.abs(r-0.15)<=1e-9):   # too close to call in float: Av5's own arithmetic
+                    d=D[x,20-nq[x]:].tolist(); mm=sum(d)/len(d)
+                    hi[x]=sum((q-mm)**2 for q in d)/len(d)/self.den>0.15
+                up=Q[hi]; dn2=Q[~hi]; self.dc2[up]+=1; self.dc2[dn2]=np.maximum(0,self.dc2[dn2]-1)
+                act=np.zeros(len(L),bool); act[np.flatnonzero(pl)[w][hi]]=self.dc2[up]>=5
+                if act.any():
+                    A=L[act]; self.ma[A]=True; self.mc[A]=10; self.mT[A]=self.T[A]; self.hm[A]=True
+                    self.ts[A]=0; S[A,_SSK.index('mi')]+=1
+                    res[act]=_vT(self.mT[A],Hp[J[act]]); pl&=~act
+            if pl.any(): res[pl]=self._plain(L[pl],J[pl])
+        return res
+
+    def _fire(self, L, J):
+        """Mirror fire: frobenius tilt of T, mass Judas, synthetic key."""
+        st=self.st; ll=L.tolist(); S=self.s
+        self._rows(L,[self._h(k,st[k]+b"MS5") for k in ll],['frobenius']*len(L))
+        S[L,_SSK.index('fr')]+=1
+        if len(L)>=32: self._massv(L)   # below that the per-lane walk is cheaper
+        else:
+            for k in ll:
+                xs=XS(bytes(16)); xs.s0=int(self.x0[k]); xs.s1=int(self.x1[k]); D={}; n=0
+                for n in mass_judas(self.w,self.dw[k,20-self.dn[k]:].tolist()[-15:],xs,D): pass
+                self.x0[k]=xs.s0; self.x1[k]=xs.s1
+                if D:
+                    c=np.fromiter(D,np.int64,len(D)); d=np.fromiter(D.values(),np.uint32,len(D))
+                    self.ct.xor(self.ct.key(np.full(len(c),k),c),d)
+                S[k,_SSK.index('ju')]+=n
+        S[L,_SSK.index('sk')]+=1; self.ma[L]=False; self.dc2[L]=0; self.ts[L]=0
+        col=self.Hp[J]; cc=self.Hcp[J]
+        for i in range(12):
+            m=self._rf(L)<0.85; lm=np.uint32(3<<(2*i)); col[m]=(col[m]&~lm)|(cc[m]&lm)
+        return col
+
+    def _massv(self, L):
+        """mass_judas for many lanes at once: every lane's XS draws in one
+        vectorized pass (an upper bound of 12 per column, states kept), a short
+        per-lane walk over the column headers, then all poison deltas together."""
+        co=self.co; ci=self.ci; lo=self.lo; lx=self.lx; cols=[]
+        for k in L.tolist():
+            c=[]
+            for qj in self.dw[k,20-self.dn[k]:].tolist()[-15:]:
+                for li in ci[co[qj]:co[qj+1]].tolist(): c+=lx[lo[li]:lo[li+1]].tolist()
+            cols.append(c)
+        m=len(L); nc=[len(c) for c in cols]; jl=self.jl.tolist()
+        for K in (9*max(nc)+12,12*max(nc)):   # 1 + len(poison) ≤ 12 draws a column, 7.5 on average
+            R,H0,H1=_xs_run(self.x0[L],self.x1[L],K)
+            B=(R&np.uint64(255)).astype(np.int64); hp=[]; used=[]
+            for x in range(m):   # header positions
+                b=B[:,x].tolist()+[0]*12; p=0
+                for _ in range(nc[x]): hp.append(p); p+=1+jl[b[p]]
+                used.append(p)
+            if max(used)<=K: break
+        M=(R%np.uint64(12)).astype(np.int64); nc=np.array(nc)
+        X=np.repeat(np.arange(m),nc); hp=np.array(hp,np.int64); pi=B[hp,X]; pl=self.jl[pi]; d=np.zeros(len(X),np.uint32)
+        for q in range(int(pl.max())):
+            k=q<pl; r=M[np.minimum(hp+1+q,K-1),X]
+            d^=np.where(k,self.jb[pi,q]<<(2*r),0).astype(np.uint32)
+        Lx=L[X]; aj=np.fromiter((a for c in cols for a in c),np.int64,len(X))
+        self.ct.xor(self.ct.key(Lx,aj),d)
+        ux=np.array(used); self.x0[L]=H0[ux,np.arange(m)]; self.x1[L]=H1[ux,np.arange(m)]
+        self.s[L,_SSK.index('ju')]+=nc
+
+    def _plain(self, L, J):
+        """The enemy path past the mirror: wind, WRank, rotations, Judas, T, rain."""
+        st=self.st; S=self.s; Hp=self.Hp; qc=self.qc; ix=_SSK.index
+        W=L[qc[L]>=self.nw[L]]
+        if len(W):   # wind
+            wl=W.tolist(); hs=[self._h(k,st[k]+b"W5"+self.isalt[k]) for k in wl]
+            te=self._nx(W)%np.uint64(8)
+            self._rows(W,hs,['major' if t>=5 else 'minor' for t in te.tolist()],qc[W]%2==1)
+            S[W,ix('w')]+=1; S[W,ix('ds')]+=1; self.tn[W]+=1
+            m=self.tn[W]%3==0
+            if m.any(): self._rows(W[m],[self._h(k,h+b"TN") for k,h in zip(wl,hs) if self.tn[k]%3==0],['minor']*int(m.sum()))
+            self.wi[W]=(self.wi[W]+1)%len(self.wbv)
+            mod=np.maximum(1,(self._nx(W)%np.uint64(5)).astype(np.int64)+1)
+            self.nw[W]=qc[W]+np.maximum(5,self.wbv[self.wi[W]]//mod)
+        ds=self._wadd(L,Hp[J])
+        for lim,tag,it,c in ((3,b"D",'minor','mn'),(6,b"W",'major','mj')):   # _rot
+            R=L[ds>=lim]
+            if len(R):
+                self._rows(R,[self._h(k,st[k]+tag+q.to_bytes(4,'big')) for k,q in zip(R.tolist(),qc[R].tolist())],[it]*len(R))
+                S[R,ix(c)]+=1
+        jr=self.jr; R=L[ds>=6]; jr[R]=np.minimum(0.75,jr[R]+0.05)
+        R=L[(ds>=3)&(ds<6)]; jr[R]=np.minimum(0.55,jr[R]+0.02)
+        self._judas(L,J)
+        col=_vT(self.T[L],Hp[J]^self.ct.get(self.ct.key(L,J)))
+        ri=self._nx(L)%np.uint64(8); hi=ds>=4                                # rain
+        one=(hi&(ri<4))|(~hi&(ri<2)); three=~hi&(ri==7)
+        for q in range(3):
+            m=three|one if q==0 else three
+            if not m.any(): break
+            R=L[m]; i=self._ri(R,0,11); a=self._ri(R,1,3)
+            col[m]^=a.astype(np.uint32)<<(2*i).astype(np.uint32); S[R,ix('rn')]+=1
+        return col
+
+    def _wadd(self, L, v):
+        """WRank.add(v) per lane → window ranks."""
+        B=self.wb[L]; BT=self.wt[L]; t=self.wtc[L]+1; self.wtc[L]=t; ct=t.copy(); live=np.ones(len(L),bool)
+        inv=np.array(_INV)
+        for p in range(12):
+            c=((v>>(2*p))&3).astype(np.int64); m=live&(c!=0)
+            if not m.any(): continue
+            nv=_vpmul(v,inv[c]); e=m&(BT[:,p]==0)
+            B[e,p]=nv[e]; BT[e,p]=ct[e]; live&=~e; m&=~e
+            sw=m&(BT[:,p]<ct); ob=B[:,p].copy(); ot=BT[:,p].copy()
+            B[sw,p]=nv[sw]; BT[sw,p]=ct[sw]; v=np.where(sw,ob,v); ct=np.where(sw,ot,ct); c[sw]=1
+            v=np.where(m,v^_vpmul(B[:,p],c),v)
+        self.wb[L]=B; self.wt[L]=BT
+        r=self.wrk[L]=(BT>np.maximum(t-64,0)[:,None]).sum(1); return r
+
+    def _judas(self, L, J):
+        """_judas per lane, as masked passes over the wall's JPlan (group, entry)."""
+        co=self.co; m=co[J+1]>co[J]; S=self.s
+        if not m.any(): return
+        L=L[m]; J=J[m]
+        m=self._rf(L)<=self.jr[L]
+        if not m.any(): return
+        L=L[m]; J=J[m]; cb=self._nx(L); g0=self.po[J]; ng=self.po[J+1]-g0
+        ct=self.ct; tg=self.tg; go=self.go; mf=self.mf; jb=self.jb; NS=self.ns; qc=self.qc[L]
+        for r in range(int(ng.max())):
+            m=ng>r
+            if not m.any(): continue
+            R=L[m]; g=g0[m]+r; pi=(cb[m]&np.uint64(255)).astype(np.int64); c=self._nx(R); cb[m]=c
+            pl=self.jl[pi]; e0=go[g]; ne=go[g+1]-e0; q=qc[m]
+            for e in range(int(ne.max())):
+                k=ne>e; v=tg[e0+np.minimum(e,ne-1)]; st=v&15; k&=st<pl
+                if not k.any(): continue
+                Rk=R[k]; aj=v[k]>>4; st=st[k]; ck=c[k]; pk=pi[k]; p=jb[pk,st]; plk=pl[k]
+                jc=mf[((ck>>(2*st).astype(np.uint64))&np.uint64(3)).astype(np.int64)*4+(q[k]+st)%3+1]
+                ac=(jc+p)%DIM
+                ia=ct.slot(ct.key(Rk,aj)); V=ct.V; o=V[ia]^(p<<(2*jc)).astype(np.uint32)
+                o^=(((o>>(2*ac).astype(np.uint32))>>1)&1)<<(2*ac).astype(np.uint32)
+                V[ia]=o; S[Rk,_SSK.index('ju')]+=1
+                for d in (1,3):   # Cascade Echo
+                    nb=(aj+d)%NS; nc=mf[((ck>>np.uint64(2*d))&np.uint64(3)).astype(np.int64)*4+p]
+                    ib=ct.slot(ct.key(Rk,nb)); ct.V[ib]^=(jb[pk,(st+d)%plk]<<(2*nc)).astype(np.uint32)
+            S[R,_SSK.index('pd')]+=1
+
+    def session(self, k):
+        """Lane k as a standalone Av5 with the same state (ct keys in column
+        order), e.g. to hand it off or check it against the scalar path."""
+        o=Av5.__new__(Av5); w=self.w; o.w=w; o.sk=self.sk; o.isalt=self.isalt[k]; o.st=self.st[k]
+        o.k0=self.k0[k] if self.fast else None
+        o.hb=hashlib.blake2b(key=o.k0,digest_size=32,person=b"AZAZEL-v5") if self.fast else None
+        o.T=TMat(self.T[k].tolist()); o.mT=TMat(self.mT[k].tolist()) if self.hm[k] else None
+        o.qc=int(self.qc[k]); wr=o.wr=WRank(64); wr.basis=self.wb[k].tolist(); wr.bt=self.wt[k].tolist()
+        wr.t=int(self.wtc[k]); wr.rank=int(self.wrk[k])
+        ct=o.ct=CMap(w.ns); c,v=self.ct.row(k); ct.d=dict(zip(c.tolist(),v.tolist())); ct.fit()
+        o.xs=XS(bytes(16)); o.xs.s0=int(self.x0[k]); o.xs.s1=int(self.x1[k])
+        o.wi=int(self.wi[k]); o.nw=int(self.nw[k]); o.tn=int(self.tn[k]); o.dc2=int(self.dc2[k])
+        o.dw=deque(self.dw[k,20-self.dn[k]:].tolist(),maxlen=20)
+        o.ma=bool(self.ma[k]); o.mc=int(self.mc[k]); o.ts=int(self.ts[k]); o.jr=float(self.jr[k])
+        o.s=dict(zip(_SSK,self.s[k].tolist())); return o
+
+# ══════════════════════════════════════════════════════════════
+# TRACE — record the query stream, replay it offline (--record / --replay)
+# ══════════════════════════════════════════════════════════════
+# File: _TRH header (magic, version, wall key), then u32 LE words. A record is
+# one word: column index in bits 0-29 (TR_BAD if out of range), bit 31 set if
+# the query carried the friend key. A word with bit 30 set switches session:
+# bits 0-15 salt length, bit 16 fast mode, bit 17 a new session (an evicted salt
+# starts over), then the salt zero-padded to whole words.
+TRACE_MAGIC=b"AZTR"; TRACE_VER=2   # 2: u16 salt length (was 8 bits)
+_TRH=struct.Struct('<4sHH32s')
+TR_KEY=1<<31; TR_SW=1<<30; TR_BAD=TR_SW-1
+
+class Recorder:
+    """Buffered trace writer for any number of Av5T sessions in one process.
+    The file is created on the first flush, so one can be handed to a worker
+    before it forks."""
+    def __init__(self, path, key, cap=1<<14):
+        self.path=path; self.key=key; self.cap=cap; self.f=None; self.w=array('I'); self.cur=None
+
+    def _sw(self, o):
+        s=o.isalt
+        if len(s)>0xFFFF: raise ValueError(f"salt of {len(s)} B: traces hold up to 65535")
+        self.w.append(TR_SW|o.trn<<17|(o.hb is not None)<<16|len(s))
+        self.w.frombytes(s+bytes(-len(s)%4)); self.cur=o; o.trn=False
+
+    def rec(self, o, j, friend):
+        if o is not self.cur: self._sw(o)
+        self.w.append((j if 0<=j<TR_BAD else TR_BAD)|(TR_KEY if friend else 0))
+        if len(self.w)>=self.cap: self.flush()
+
+    def rec_many(self, o, idx, friend):
+        if o is not self.cur: self._sw(o)
+        f=TR_KEY if friend else 0
+        self.w.extend((j if 0<=j<TR_BAD else TR_BAD)|f for j in idx)
+        if len(self.w)>=self.cap: self.flush()
+
+    def flush(self):
+        if self.f is None:
+            self.f=open(self.path,'wb'); self.f.write(_TRH.pack(TRACE_MAGIC,TRACE_VER,0,self.key))
+        if sys.byteorder!='little': self.w.byteswap()
+        self.f.write(self.w.tobytes()); self.f.flush(); self.w=array('I')
+
+    def close(self):
+        self.flush(); self.f.close()
+
+class Av5T(Av5):
+    """Av5 that appends each query to a Recorder (same output stream)."""
+    __slots__=('tr','trn')
+    def __init__(self, wl, seed, sk, isalt=None, fast=False, tr=None):
+        super().__init__(wl,seed,sk,isalt,fast); self.tr=tr; self.trn=True
+
+    def query(self,j,key=None):
+        self.tr.rec(self,j,key==self.sk); return Av5.query(self,j,key)
+
+    @classmethod
+    def restore(cls, wl, b, sk, **kw):
+        o=super().restore(wl,b,sk,**kw); o.trn=False; return o   # continues, not a new session
+
+    def query_many(self,idx,key=None,out=None):
+        if hasattr(idx,'dtype'): idx=idx.tolist()
+        self.tr.rec_many(self,idx,key==self.sk); return Av5.query_many(self,idx,key,out)
+
+def _trace_chunks(f, n):
+    """u32 word chunks (≤ n words) of an open trace after its header: slices
+    of one mmap when the file can be mapped, chunked reads otherwise (pipes)."""
+    try: mm=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+    except (OSError, ValueError): mm=None
+    if mm is not None:
+        try:
+            for p in range(_TRH.size,len(mm),4*n): yield array('I',mm[p:p+4*n])
+        finally: mm.close()
+        return
+    rest=b""
+    while True:
+        b=f.read(4*n)
+        if not b: break
+        b=rest+b; k=len(b)&~3; rest=b[k:]; yield array('I',b[:k])
+
+def trace_runs(path, batch=4096):
+    """Stream a trace: ('H', wall key), then ('S', salt, fast, new) at every
+    session switch and ('Q', friend, idx) runs of ≤ batch records."""
+    with open(path,'rb') as f:
+        h=f.read(_TRH.size)
+        if len(h)<_TRH.size: raise ValueError("trace truncated")
+        mg,ver,_,key=_TRH.unpack(h)
+        if mg!=TRACE_MAGIC or ver!=TRACE_VER: raise ValueError(f"not a v{TRACE_VER} Av5 trace")
+        yield ('H',key)
+        need=sl=rf=0; fast=new=False; sb=bytearray(); run=array('I')
+        for ch in _trace_chunks(f,1<<16):
+            if sys.byteorder!='little': ch.byteswap()
+            for w in ch:
+                if need:
+                    sb+=w.to_bytes(4,'little'); need-=1
+                    if not need: yield ('S',bytes(sb[:sl]),fast,new)
+                elif w&TR_SW:
+                    if run: yield ('Q',rf,run); run=array('I')
+                    sl=w&0xFFFF; fast=bool(w>>16&1); new=bool(w>>17&1); need=(sl+3)//4; sb=bytearray()
+                    if not need: yield ('S',b"",fast,new)
+                else:
+                    if w>>31!=rf or len(run)>=batch:
+                        if run: yield ('Q',rf,run); run=array('I')
+                        rf=w>>31
+                    run.append(w&TR_BAD)
+        if need: raise ValueError("trace truncated")
+        if run: yield ('Q',rf,run)
+
+def replay(wl, path, sk=None, batch=4096):
+    """Drive sessions on wl from a trace → {'queries', 'sessions', 'seconds',
+    'digest', 's'}. digest: SHA-256 of every response (u32 LE, QNONE when out of
+    range) in trace order; s: Av5.s summed over all sessions."""
+    sk=fsk if sk is None else sk; ss={}; made=[]; o=None; hd=hashlib.sha256(); n=0
+    buf=array('I',bytes(4*batch)); t=time.perf_counter()
+    for it in trace_runs(path,batch):
+        if it[0]=='Q':
+            if o is None: raise ValueError("trace record before any session")
+            idx=it[2]; out=o.query_many(idx,sk if it[1] else None,buf); n+=len(idx)
+            if sys.byteorder!='little': out=out[:len(idx)]; out.byteswap(); hd.update(out)
+            else: hd.update(memoryview(out)[:len(idx)])
+        elif it[0]=='S':
+            o=ss.get(it[1])
+            if o is None or it[3]: o=ss[it[1]]=wl.oracle(it[1],sk,it[2]); made.append(o)
+        elif it[1]!=wl.key: raise ValueError("trace was recorded on a different wall")
+    dt=time.perf_counter()-t; st=dict.fromkeys(_SSK,0)
+    for o in made:
+        for k,v in o.s.items(): st[k]+=v
+    return {'queries':n,'sessions':len(made),'seconds':dt,'digest':hd.hexdigest(),'s':st}
+
+def run_replay(wl, path):
+    print(f"\n  ═══ REPLAY ═══  {path}", flush=True)
+    try: r=replay(wl,path)
+    except (OSError, ValueError) as e: print(f"  ✗ {e}"); return False
+    print(f"  {r['queries']:,} queries, {r['sessions']:,} sessions in {r['seconds']:.2f}s"
+          f" ({r['queries']/max(r['seconds'],1e-9):,.0f} q/s)")
+    print("  "+" ".join(f"{k}={v}" for k,v in r['s'].items()))
+    print(f"  digest {r['digest']}")
+    return True
+
+# ══════════════════════════════════════════════════════════════
+# SERVE — multi-tenant oracle over TCP / Unix sockets (asyncio)
 # ══════════════════════════════════════════════════════════════
-sk=hashlib.sha256(sa+asig+b"FRIEND_V5").digest()
-def mk(salt=None): return Av5(sa,sk,salt)
-
-print(f"\n  ═══ ATTACKS (fused) ═══")
-
-# [A] Friend
-print("  [A] Friend...", end=" ", flush=True)
-o=mk(b"F"); tr=random.Random(42); fok=0
-for _ in range(500):
-    j=tr.randint(0,NS-1)
-    if o.query(j,key=sk)==unpack12(Hp[j]): fok+=1
-print(f"{fok}/500 {'✓' if fok==500 else '✗'}")
-
-# [B+C+E+G] FUSED: Convergence + Syndromes + Gap + Judas on SHARED oracle
-print("  [B+C+E+G] Fused...", end=" ", flush=True)
-of=mk(b"FUSED"); er=random.Random(666)
-ec=[]
-for li in range(min(100,n_real)):
-    for p in real_lines[li]:
-        j=spti.get(p)
-        if j is not None: ec.append(j)
-
-# Phase 1: 500 convergence queries
-for j in ec[:500]: of.query(j)
-sb=dict(of.s)
-
-# Phase 2: 10 syndrome epochs (reuse same oracle)
-j_a,j_b=ec[0],ec[5]; syns=[]
-for _ in range(10):
-    for _ in range(30): of.query(er.randint(0,NS-1))
-    ca=of.query(j_a); cb=of.query(j_b)
-    syns.append(tuple(_AF[ca[i]*4+cb[i]] for i in range(12)))
-us=len(set(syns))
-
-# Phase 3: Gap measurement (reuse same oracle)
-gr=random.Random(7777)
-rd=[sum(1 for i in range(12) if of.query(j)[i]!=gc(Hcp[j],i))
-    for j in gr.sample(sorted(rcs),min(200,len(rcs)))]
-dd=[sum(1 for i in range(12) if of.query(j)[i]!=gc(Hcp[j],i))
-    for j in gr.sample(sorted(set(range(NS))-rcs),min(200,NS-len(rcs)))]
-rm=sum(rd)/len(rd); dm=sum(dd)/len(dd); og=abs(rm-dm)
-
-# Phase 4: Judas measurement
-mc2=0; mt2=0
-for jc in list(of.ct.keys())[:300]:
-    for li in c2l.get(jc,[]):
-        nbs=[jj for jj in l2c.get(li,[])[:7] if jj in of.ct]
-        if len(nbs)<3: continue
-        for coord in range(3):
-            vals=[gc(of.ct[jj],coord) for jj in nbs]
+# Frame: u32 LE body length, then the body.
+#   Q  b'Q' | salt[16] | klen u8 | key[klen] | idx u32[n]   batched query, n = rest/4
+#   S  b'S'                                               server stats
+#   P  b'P'   Prometheus text (needs --prof); J  b'J'   the same as Prof JSON
+# Reply: 0x00 + payload (u32[n] packed columns, QNONE out of range; or a stats
+# line), 0x01 + error text. One Av5 per client salt; the wall is the module's,
+# so a server over a --cache wall shares its pages with every other process.
+SV_MAX=1<<20
+_SF=struct.Struct('<I')
+
+def sess_bytes(o):
+    """Approximate resident size of one session: fixed state, T's LUT, ct."""
+    c=o.ct
+    return (4096+(28672 if o.T.lut is not None else 0)
+            +(4*(c.n+len(c.ks)) if c.a is not None else 104*len(c.d)))
+
+class Pool:
+    """Av5 sessions keyed by salt, least recently used evicted past budget bytes."""
+    def __init__(self, wl, budget, sk, fast=False, prof=None, tr=None, dl=0):
+        self.w=wl; self.ss=OrderedDict(); self.used=0; self.budget=budget; self.sk=sk; self.fast=fast
+        self.pf=prof; self.tr=tr; self.dl=dl; self.pd=set()   # salts with deferred deadline work
+        self.st={'msg':0,'q':0,'new':0,'evict':0}
+
+    def handle(self, b):
+        if b[:1]==b'Q' and len(b)>=18 and len(b)>=18+b[17] and (len(b)-18-b[17])%4==0:
+            p=18+b[17]; salt=bytes(b[1:17]); key=bytes(b[18:p]) or None
+            idx=array('I',b[p:])
+            if sys.byteorder!='little': idx.byteswap()
+            e=self.ss.pop(salt,None)
+            if e is None: e=[self.w.oracle(salt,self.sk,self.fast,self.pf,self.tr,self.dl),0]; self.st['new']+=1
+            self.ss[salt]=e
+            out=e[0].query_many(idx,key)
+            if self.dl and e[0].job is not None: self.pd.add(salt)
+            n=sess_bytes(e[0]); self.used+=n-e[1]; e[1]=n
+            while self.used>self.budget and len(self.ss)>1:
+                self.used-=self.ss.popitem(last=False)[1][1]; self.st['evict']+=1
+            self.st['msg']+=1; self.st['q']+=len(idx)
+            if sys.byteorder!='little': out.byteswap()
+            return b'\0'+out.tobytes()
+        if b==b'S':
+            return b'\0'+(' '.join(f"{k}={v}" for k,v in self.st.items())
+                          +f" sessions={len(self.ss)} mb={self.used/2**20:.1f} ns={self.w.ns}").encode()
+        if b in (b'P',b'J') and self.pf is not None:
+            return b'\0'+(self.pf.prometheus() if b==b'P' else json.dumps(self.pf.snapshot())).encode()
+        return b'\1bad request'
+
+    def idle(self, ns=None):
+        """After a reply is out: deferred deadline work of pending sessions for
+        about ns (one budget by default). True while some is left."""
+        ns=self.dl if ns is None else ns; t=time.perf_counter_ns()
+        for salt in list(self.pd):
+            e=self.ss.get(salt); left=ns-(time.perf_counter_ns()-t)
+            if left<=0: break
+            if e is None or e[0].step(left): self.pd.discard(salt)
+        return bool(self.pd)
+
+def _err(e):
+    """Error reply frame for a handler exception; the connection stays up."""
+    return b'\1'+f"{type(e).__name__}: {e}".encode()
+
+async def _conn(h, r, w, idle=None):
+    try:
+        while True:
+            n,=_SF.unpack(await r.readexactly(4))
+            if n>SV_MAX: break
+            b=await r.readexactly(n)
+            try:
+                rep=h(b)
+                if not isinstance(rep,bytes): rep=await rep
+            except Exception as e: rep=_err(e)
+            w.write(_SF.pack(len(rep))+rep); await w.drain()
+            if idle is not None: idle()
+    except (asyncio.IncompleteReadError, ConnectionError): pass
+    finally: w.close()
+
+async def serve(addr, handle, idle=None):
+    """Accept loop; handle(body) → reply body, plain or awaitable; idle() runs
+    after each reply is written."""
+    h=lambda r,w: _conn(handle,r,w,idle)
+    if addr.startswith('unix:'): srv=await asyncio.start_unix_server(h,addr[5:])
+    else:
+        host,_,port=addr.rpartition(':'); srv=await asyncio.start_server(h,host or '127.0.0.1',int(port))
+    async with srv: await srv.serve_forever()
+
+# ── Worker pool (--workers N): the front process parses frames and routes each
+# salt to a fixed worker, so a session's state sequence is the same as in a
+# single process. The wall sits in one shared_memory block mapped by all.
+def _wworker(sock, pool, inherited):
+    for x in inherited: x.close()
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))   # so a trace gets flushed
+    rf=sock.makefile('rb'); wf=sock.makefile('wb')
+    try:
+        while True:
+            h=rf.read(4)
+            if len(h)<4: return   # front gone
+            b=rf.read(_SF.unpack(h)[0])
+            try: rep=pool.handle(b)
+            except Exception as e: rep=_err(e)
+            wf.write(_SF.pack(len(rep))+rep); wf.flush()
+            if pool.pd: pool.idle()
+    finally:
+        if pool.tr is not None: pool.tr.close()
+
+class Front:
+    """Routes frames to forked workers over socketpairs; replies come back in order."""
+    def __init__(self, socks): self.socks=socks; self.n=len(socks)
+
+    async def start(self):
+        self.io=[await asyncio.open_unix_connection(sock=x) for x in self.socks]
+        self.q=[deque() for _ in self.socks]
+        self.rd=[asyncio.create_task(self._read(i)) for i in range(self.n)]
+
+    async def _read(self, i):
+        r=self.io[i][0]; q=self.q[i]
+        while True:
+            n,=_SF.unpack(await r.readexactly(4)); q.popleft().set_result(await r.readexactly(n))
+
+    async def _call(self, i, b):
+        f=asyncio.get_running_loop().create_future(); self.q[i].append(f)
+        w=self.io[i][1]; w.write(_SF.pack(len(b))+b); await w.drain()
+        return await f
+
+    async def handle(self, b):
+        if b[:1]==b'Q' and len(b)>=17: return await self._call(int.from_bytes(b[1:17],'little')%self.n,b)
+        if b in (b'P',b'J'):
+            reps=await asyncio.gather(*(self._call(i,b'J') for i in range(self.n)))
+            if reps[0][:1]!=b'\0': return reps[0]
+            pf=Prof()
+            for rep in reps: pf.merge(json.loads(rep[1:]))
+            return b'\0'+(pf.prometheus() if b==b'P' else json.dumps(pf.snapshot())).encode()
+        if b!=b'S': return b'\1bad request'
+        tot={}
+        for rep in await asyncio.gather(*(self._call(i,b) for i in range(self.n))):
+            for kv in rep[1:].decode().split():
+                k,v=kv.split('='); tot[k]=float(v) if k=='ns' else tot.get(k,0)+float(v)
+        return b'\0'+(' '.join(f"{k}={v:.1f}" if k=='mb' else f"{k}={int(v)}" for k,v in tot.items())
+                      +f" workers={self.n}").encode()
+
+def serve_workers(wl, addr, n, budget, sk, prof=False, record=None, dl=0):
+    """Move the wall into shared memory, fork n workers, run the front (blocks)."""
+    shm=wl.to_shm()   # drops the private copies pre-fork
+    wl.jp             # Judas plans too: built once, shared copy-on-write
+    ctx=mp.get_context('fork'); socks=[]; procs=[]
+    for i in range(n):
+        a,b=socket.socketpair()
+        pool=Pool(wl,budget//n,sk,prof=Prof() if prof else None,
+                  tr=Recorder(f"{record}.{i}",wl.key) if record else None,dl=dl)
+        p=ctx.Process(target=_wworker,args=(b,pool,socks+[a]),daemon=True)
+        p.start(); b.close(); socks.append(a); procs.append(p)
+    async def main():
+        fr=Front(socks); await fr.start(); await serve(addr,fr.handle)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try: asyncio.run(main())
+    except KeyboardInterrupt: pass
+    finally:
+        for p in procs: p.terminate()
+        shm.unlink()
+
+async def _open(addr):
+    if addr.startswith('unix:'): return await asyncio.open_unix_connection(addr[5:])
+    host,_,port=addr.rpartition(':'); return await asyncio.open_connection(host or '127.0.0.1',int(port))
+
+async def _rpc(r, w, body):
+    w.write(_SF.pack(len(body))+body); await w.drain()
+    n,=_SF.unpack(await r.readexactly(4)); rep=await r.readexactly(n)
+    if rep[:1]!=b'\0': raise RuntimeError(rep[1:].decode())
+    return rep[1:]
+
+async def loadgen(addr, levels=(1,4,16,64), nmsg=40, batch=16, show=True):
+    """Closed-loop clients (one salt each) at increasing concurrency → [(c, q/s, p50, p99)]."""
+    r,w=await _open(addr); st=dict(kv.split('=') for kv in (await _rpc(r,w,b'S')).decode().split())
+    ns=int(st['ns'])
+    async def client(c, i, lat):
+        cr,cw=await _open(addr); g=random.Random(c<<16|i)
+        salt=hashlib.sha256(b"LOADGEN"+bytes([c&255,i&255])).digest()[:16]
+        msgs=[b'Q'+salt+b'\0'+array('I',(g.randrange(ns) for _ in range(batch))).tobytes()
+              for _ in range(nmsg)]
+        for m in msgs:
+            t=time.perf_counter(); await _rpc(cr,cw,m); lat.append(time.perf_counter()-t)
+        cw.close()
+    if show: print(f"  {ns:,} columns | {nmsg} msgs × {batch} queries per client")
+    rows=[]
+    for c in levels:
+        lat=[]; t=time.perf_counter()
+        await asyncio.gather(*(client(c,i,lat) for i in range(c)))
+        dt=time.perf_counter()-t; lat.sort()
+        rows.append((c,len(lat)*batch/dt,lat[len(lat)//2],lat[min(len(lat)-1,len(lat)*99//100)]))
+        if show: print(f"  c={c:<4}{rows[-1][1]:>9,.0f} q/s | p50 {rows[-1][2]*1e3:7.2f} ms"
+                       f"  p99 {rows[-1][3]*1e3:7.2f} ms")
+    if show: print(f"  server: {(await _rpc(r,w,b'S')).decode()}")
+    w.close(); return rows
+
+# ══════════════════════════════════════════════════════════════
+# ANALYTICS — battery metrics over bulk responses (array passes)
+# ══════════════════════════════════════════════════════════════
+# R is n responses: packed u32 words (n,) or GF(4) lanes as uint8 (n,12).
+# The battery's own metrics (a_syn, a_gap, a_closure) keep a pure-Python
+# path so it runs without NumPy; a_bias, a_rank and analyze need it.
+_LM=tuple(3<<(2*i) for i in range(12))
+
+def a_words(R):
+    """Bulk responses → packed u32 ndarray (n,)."""
+    R=np.asarray(R)
+    if R.ndim==1: return R.astype(np.uint32,copy=False)
+    return np.bitwise_or.reduce((R.astype(np.uint32)&3)<<(2*np.arange(12,dtype=np.uint32)),axis=1)
+
+def a_lanes(R):
+    """Bulk responses → GF(4) lanes, uint8 (n,12)."""
+    R=np.asarray(R)
+    if R.ndim==2: return R.astype(np.uint8,copy=False)
+    return ((R.astype(np.uint32)[:,None]>>(2*np.arange(12,dtype=np.uint32)))&3).astype(np.uint8)
+
+def a_diag(W):
+    """The battery's gap read: W holds 12 consecutive responses per column;
+    → one word per column whose lane i comes from its i-th response."""
+    if np is None: return array('I',(sum(W[k+i]&_LM[i] for i in range(12)) for k in range(0,len(W),12)))
+    return np.bitwise_or.reduce(a_words(W).reshape(-1,12)&np.asarray(_LM,np.uint32),axis=1)
+
+def a_dist(R, C):
+    """Per row, the number of coordinates where R differs from C."""
+    return _vpdist(a_words(R),a_words(C))
+
+def a_gap(R, C, real):
+    """|mean distance to C of the real rows − of the others| (the battery's gap)."""
+    if np is None:
+        d=list(map(pdist,R,C)); rd=[x for x,m in zip(d,real) if m]; dd=[x for x,m in zip(d,real) if not m]
+        return abs(sum(rd)/len(rd)-sum(dd)/len(dd))
+    d=a_dist(R,C); m=np.asarray(real,bool)
+    return abs(float(d[m].mean())-float(d[~m].mean()))
+
+def a_syn(A, B):
+    """Distinct syndromes A+B over paired responses."""
+    if np is None: return len({a^b for a,b in zip(A,B)})
+    return len(np.unique(a_words(A)^a_words(B)))
+
+def a_closure(G, lanes=3):
+    """Judas closure: each row of G is the contamination words of one line's
+    columns, zero-padded (0 is the additive identity). → share of (row, lane
+    < lanes) whose GF(4) sum is nonzero."""
+    if np is None:
+        mc=0
+        for g in G:
             t=0
-            for vv in vals: t=_AF[t*4+vv]
-            if t!=0: mc2+=1
-            mt2+=1
-        break
-cr=mc2/max(mt2,1); sf=of.s
-print(f"{sb['mn']}m+{sb['mj']}M | {us}/10syn | gap={og:.4f} | judas={cr:.3f} "
-      f"w={sf['w']} ju={sf['ju']}")
-
-# [D] Mirror+Tilt (separate — needs desperation pattern)
-print("  [D] Mirror...", end=" ", flush=True)
-od=mk(b"D")
-for _ in range(50): od.query(er.randint(0,min(100,NS-1)))
-for _ in range(30): od.query(er.randint(0,NS-1))
-sd=od.s
-print(f"mi={sd['mi']} fr={sd['fr']} ti={sd['ti']} sk={sd['sk']}")
-
-# [H] Replay
-print("  [H] Replay...", end=" ", flush=True)
-o1=mk(b"R1"); o2=mk(b"R2"); rm2=0
-for _ in range(200):
-    j=gr.randint(0,NS-1)
-    if o1.query(j)==o2.query(j): rm2+=1
-print(f"{rm2}/200 {'✓' if rm2<20 else '✗'}")
-
-# [I] Thermal
-print("  [I] Thermal...", end=" ", flush=True)
-ot=mk(b"TH")
-for j in range(300): ot.query(j)
-print(f"w={ot.s['w']} {'✓' if ot.s['w']>=3 else '✗'}")
-
-# ══════════════════════════════════════════════════════════════
-# 5. VERDICT
-# ══════════════════════════════════════════════════════════════
-tt=time.time()-t0
-Nf=(4**12-1)//3; nsf=(16**6-1)//15; gl=sum(log2(float(4**12-4**i)) for i in range(12))
-
-print(f"""
+            for w in g: t^=w
+            mc+=sum(1 for c in range(lanes) if (t>>(2*c))&3)
+        return mc/max(len(G)*lanes,1)
+    if not len(G): return 0.0
+    x=np.bitwise_xor.reduce(np.asarray(G,np.uint32),axis=1)
+    return int((((x[:,None]>>(2*np.arange(lanes,dtype=np.uint32)))&3)!=0).sum())/(len(G)*lanes)
+
+def a_bias(R):
+    """Per-coordinate value counts (12,4) and χ² against uniform GF(4) per
+    coordinate (3 dof: ≈3 when unbiased, p<0.001 past 16.3)."""
+    if np is None: raise RuntimeError("a_bias requires NumPy")
+    X=a_words(R); n=len(X); E=np.asarray(_U6)[:,:,None]==np.arange(4)   # 12-bit half → lane one-hots
+    F=np.concatenate([np.tensordot(np.bincount(h,minlength=4096),E,1) for h in (X&4095,(X>>12)&4095)])
+    return F, (((F-n/4)**2).sum(1)/(n/4) if n else np.zeros(12))
+
+def a_rank(R, m=12):
+    """GF(4) rank of each consecutive m-row block of R (a trailing partial
+    block is dropped), one Gauss–Jordan pass over all blocks at once."""
+    if np is None: raise RuntimeError("a_rank requires NumPy")
+    u=np.uint32; X=a_words(R); n=len(X)//m; X=X[:n*m].reshape(n,m).copy()
+    Q=np.asarray([_MF[a*4+_INV[b]] for b in range(4) for a in range(4)],np.intp)   # Q[4b+a] = a/b
+    ar=np.arange(n); free=np.ones((n,m),bool); rk=np.zeros(n,np.int64)
+    for i in range(12):
+        l=(X>>u(2*i))&u(3); c=(l!=0)&free; p=c.argmax(1); has=c[ar,p]
+        pv=X[ar,p]; lo=pv&u(M5); hi=(pv>>u(1))&u(M5)
+        P=np.stack([np.zeros_like(pv),pv,hi|(lo^hi)<<u(1),(lo^hi)|lo<<u(1)],1)   # {0,1,ω,ω²}·pivot
+        f=Q[(l[ar,p]<<u(2))[:,None]|l]; f[ar,p]=0; f[~has]=0   # row r ← r + f·pivot
+        X^=np.take_along_axis(P,f,1); free[ar[has],p[has]]=False; rk+=has
+    return rk
+
+def analyze(R, C=None, real=None, m=12):
+    """Summary of bulk responses R: per-coordinate χ² (max, mean), m-block
+    rank mean and histogram, and the gap when reference columns C and the
+    real-row mask are given. Millions of rows take well under a second."""
+    F,x2=a_bias(R); rk=a_rank(R,m)
+    out={'n':len(a_words(R)),'chi2_max':float(x2.max()),'chi2_mean':float(x2.mean()),
+         'rank_mean':float(rk.mean()) if len(rk) else 0.0,
+         'rank_hist':np.bincount(rk,minlength=min(m,12)+1).tolist()}
+    if C is not None: out['gap']=a_gap(R,C,real)
+    return out
+
+# ══════════════════════════════════════════════════════════════
+# BENCHMARKS (--bench NAME): equivalence check + timing, then exit
+# ══════════════════════════════════════════════════════════════
+def _bt(f, n):
+    """Best-of-5 wall time per call of f() in ns."""
+    best=float('inf')
+    for _ in range(5):
+        t=time.perf_counter(); f(); best=min(best,time.perf_counter()-t)
+    return best/n*1e9
+
+def bench_gf4(wl):
+    """SWAR section-0 kernel vs the scalar _AF/_MF reference loops."""
+    def r_pack12(vals):
+        r=0
+        for i in range(12): r|=(vals[i]&3)<<(i*2)
+        return r
+    def r_unpack12(p): return [(p>>(i*2))&3 for i in range(12)]
+    def r_pdist(a,b):
+        x=a^b; d=0
+        for i in range(12):
+            if (x>>(i*2))&3: d+=1
+        return d
+    def r_padd(a,b):
+        r=0
+        for i in range(12): r|=_AF[((a>>(i*2))&3)*4+((b>>(i*2))&3)]<<(i*2)
+        return r
+    def r_pmul(p,a):
+        r=0
+        for i in range(12): r|=_MF[a*4+((p>>(i*2))&3)]<<(i*2)
+        return r
+    def r_pfrob(p):
+        r=0
+        for i in range(12): r|=_FROB[(p>>(i*2))&3]<<(i*2)
+        return r
+    br=random.Random(2026); N=20000
+    A=[br.getrandbits(24) for _ in range(N)]; B=[br.getrandbits(24) for _ in range(N)]
+    S=[br.randint(0,3) for _ in range(N)]; U=[r_unpack12(a) for a in A]
+    ok=(all(pack12(u)==r_pack12(u) for u in U) and all(unpack12(a)==r_unpack12(a) for a in A)
+        and all(pdist(a,b)==r_pdist(a,b) and padd(a,b)==r_padd(a,b) for a,b in zip(A,B))
+        and all(pmul(a,x)==r_pmul(a,x) for a,x in zip(A,S)) and all(pfrob(a)==r_pfrob(a) for a in A))
+    print(f"\n  ═══ BENCH gf4 ═══  identical on {N:,} random columns: {'✓' if ok else '✗'}")
+    print(f"  {'primitive':<10}{'scalar ns':>11}{'SWAR ns':>10}{'speedup':>9}")
+    for nm,rf,sf,args in (('pack12',r_pack12,pack12,(U,)),('unpack12',r_unpack12,unpack12,(A,)),
+                          ('pdist',r_pdist,pdist,(A,B)),('padd',r_padd,padd,(A,B)),
+                          ('pmul',r_pmul,pmul,(A,S)),('pfrob',r_pfrob,pfrob,(A,))):
+        tr=_bt(lambda: list(map(rf,*args)),N); ts=_bt(lambda: list(map(sf,*args)),N)
+        print(f"  {nm:<10}{tr:>11.0f}{ts:>10.0f}{tr/ts:>8.1f}×")
+    return ok
+
+def bench_tmat(wl, n=3000):
+    """Packed-row T (row_op, row_op_frob, apply) vs the flat[144] scalar reference."""
+    def r_id():
+        M=[0]*144
+        for i in range(12): M[i*12+i]=1
+        return M
+    def r_row_op(T,i,j,a,fr):
+        oi=i*12; oj=j*12
+        for k in range(12): T[oi+k]=_AF[T[oi+k]*4+_MF[a*4+(_FROB[T[oj+k]] if fr else T[oj+k])]]
+    def r_apply(T,pv):
+        v=unpack12(pv); r=0
+        for i in range(12):
+            s=0; oi=i*12
+            for k in range(12): s=_AF[s*4+_MF[T[oi+k]*4+v[k]]]
+            r|=(s<<(i*2))
+        return r
+    br=random.Random(99); ops=[]
+    for _ in range(n):
+        i,j=br.sample(range(12),2); ops.append((i,j,br.randint(1,3),br.random()<0.3))
+    V=[br.getrandbits(24) for _ in range(n)]
+    F=r_id(); P=mat_id(); ok=True
+    for op,v in zip(ops,V):
+        r_row_op(F,*op); apply_row_ops(P,[op])
+        ok&=r_apply(F,v)==apply_T_to_packed(P,v)
+    def run_ref():
+        T=r_id()
+        for op in ops: r_row_op(T,*op)
+        for v in V: r_apply(T,v)
+    def run_pk():
+        T=mat_id()
+        for op in ops: row_op_frob(T,*op[:3]) if op[3] else row_op(T,*op[:3])
+        for v in V: apply_T_to_packed(T,v)
+    tr=_bt(run_ref,n); tp=_bt(run_pk,n)
+    print(f"\n  ═══ BENCH tmat ═══  identical over {n:,} mixed row ops: {'✓' if ok else '✗'}")
+    print(f"  row op + T×v: flat {tr/1e3:.1f} µs → packed {tp/1e3:.1f} µs ({tr/tp:.1f}×)")
+    return ok
+
+def _rank(vs):
+    """Brute-force GF(4) rank of packed vectors (full elimination)."""
+    piv={}
+    for v in vs:
+        for p,b in piv.items():
+            c=(v>>(p*2))&3
+            if c: v^=pmul(b,c)
+        if v:
+            p=((v|v>>1)&M5).bit_length()//2; c=(v>>(p*2))&3
+            b=pmul(v,_INV[c])
+            for q in piv:
+                cq=(piv[q]>>(p*2))&3
+                if cq: piv[q]^=pmul(b,cq)
+            piv[p]=b
+    return len(piv)
+
+def bench_wrank(wl, n=3000):
+    """Sliding-window WRank vs brute-force window rank, and vs rebuild-every-8."""
+    class OldWRank:
+        def __init__(self, win=64):
+            self.vecs=deque(maxlen=win); self.rc=0; self._rebuild()
+        def _ins(self, v):
+            vv=list(v)
+            for p in range(12):
+                if self.piv[p]>=0 and vv[p]:
+                    f=vv[p]; b=self.basis[p]
+                    for j in range(12): vv[j]=_AF[vv[j]*4+_MF[f*4+b[j]]]
+            for i in range(12):
+                if vv[i] and self.piv[i]<0:
+                    inv=_INV[vv[i]]
+                    self.basis[i]=[_MF[inv*4+vv[j]] for j in range(12)]
+                    self.piv[i]=i; self.rank+=1; break
+        def add(self, v):
+            self.vecs.append(v[:]); self._ins(v); self.rc+=1
+            if self.rc>=8: self._rebuild()
+            return self.rank
+        def _rebuild(self):
+            self.basis=[[0]*12 for _ in range(12)]; self.piv=[-1]*12; self.rank=0; self.rc=0
+            for v in self.vecs: self._ins(v)
+    br=random.Random(7); ok=True
+    # low-rank bursts (spans of 1..5 vectors) interleaved with random columns
+    span=[br.getrandbits(24) for _ in range(5)]; V=[]
+    for i in range(n):
+        if (i//40)%2: V.append(br.getrandbits(24))
+        else:
+            k=1+(i//80)%5; v=0
+            for b in span[:k]: v^=pmul(b,br.randint(0,3))
+            V.append(v)
+    print(f"\n  ═══ BENCH wrank ═══  {n:,} adds, mixed low-rank/random stream")
+    for win in (8,64,256):
+        w=WRank(win); bad=sum(w.add(v)!=_rank(V[max(0,i-win+1):i+1]) for i,v in enumerate(V))
+        ok&=bad==0
+        ow=OldWRank(win); U=[unpack12(v) for v in V]
+        stale=sum(ow.add(u)!=_rank(V[max(0,i-win+1):i+1]) for i,u in enumerate(U))
+        tn=_bt(lambda: list(map(WRank(win).add,V)),n)
+        to=_bt(lambda: list(map(OldWRank(win).add,U)),n)
+        print(f"  win={win:<4} exact {n-bad:,}/{n:,} {'✓' if not bad else '✗'} (old: {stale:,} stale)"
+              f" | {to/1e3:6.1f} → {tn/1e3:4.1f} µs/add ({to/tn:.0f}×)")
+    return ok
+
+def bench_venoms(wl, reps=5):
+    """Vector vs scalar corruption on the same geometry: time, reproducibility,
+    pre-CI distance histograms per class (tight), post-CI gap over reps seeds."""
+    if np is None: print("\n  --bench venoms needs NumPy"); return False
+    Hc,rc,_,l2,nr,nd=full_geometry(wl.sd,wl.jobs) if wl.full else sampled_geometry(wl.sr,wl.sd,wl.jobs)
+    ns=len(Hc)
+    C=np.asarray(Hc,dtype=np.uint32); R=_vmask(rc,ns); eng={'scalar':corrupt_scalar,'vec':corrupt_vec}
+    def stats(H, th):
+        d=_vpdist(np.asarray(H,dtype=np.uint32),C); T=_vmask(th,ns)
+        return ({k:np.bincount(d[m],minlength=13)/max(1,m.sum()) for k,m in
+                 (('real',R&~T),('decoy',~R&~T),('trap',T))}, abs(d[R&~T].mean()-d[~R&~T].mean()))
+    print(f"\n  ═══ BENCH venoms ═══  {ns:,} columns")
+    pre={}
+    for nm,fn in eng.items():
+        t=time.perf_counter(); H,th,_=fn(Hc,rc,l2,nr,nd,fix=False); dt=time.perf_counter()-t
+        pre[nm]=stats(H,th); print(f"  {nm:<7} venoms+traps {dt:6.2f}s ({dt/ns*1e6:5.2f} µs/col)")
+    ok=corrupt_vec(Hc,rc,l2,nr,nd)[0]==corrupt_vec(Hc,rc,l2,nr,nd)[0]
+    print(f"  vec reproducible from sg: {'✓' if ok else '✗'}")
+    print(f"  {'pre-CI':<9}{'mean':>6}{'TV':>7}   histogram d=0..12")
+    for k in ('real','decoy','trap'):
+        a=pre['scalar'][0][k]; b=pre['vec'][0][k]; tv=0.5*abs(a-b).sum(); ok&=tv<0.05 or k=='trap'
+        for e,h in (('s',a),('v',b)):
+            print(f"  {k+'/'+e:<9}{(h*np.arange(13)).sum():6.2f}{tv if e=='v' else 0:7.3f}   "
+                  +' '.join(f"{x:.2f}" for x in h))
+    gaps={}
+    for nm,fn in eng.items():
+        t=time.perf_counter()
+        gaps[nm]=[stats(*fn(Hc,rc,l2,nr,nd,sg=hashlib.sha256(sg+bytes([i])).digest())[:2])[1]
+                  for i in range(reps)]
+        dt=(time.perf_counter()-t)/reps
+        print(f"  {nm:<7} full pipeline {dt:6.2f}s | post-CI true gap over {reps} seeds: "
+              f"mean {sum(gaps[nm])/reps:.4f} max {max(gaps[nm]):.4f}")
+    ok&=max(gaps['vec'])<=max(0.1,max(gaps['scalar']))       # CI no worse than the scalar loop
+    print(f"  → {'✓ statistically equivalent' if ok else '✗ differs'}")
+    return bool(ok)
+
+def bench_ci(wl, reps=3):
+    """_sc_ci vs the pdist-per-column loop it replaced, from the same pre-CI
+    state and seeds: the wall must be identical and the gap no worse."""
+    Hc,rc,l2,nr,nd=wl.Hcp,wl.rcs,wl.l2c,wl.n_real,wl.n_dec
+    def ci0(Hp, thc, nr2):
+        NS=len(Hp); ci_perm=list(range(NS)); random.Random(42).shuffle(ci_perm)
+        for cp in range(8):
+            rs=ds=rc_=dc=0; probe=NS//5
+            for idx in range(probe):
+                j=ci_perm[(cp*probe+idx)%NS]
+                if j in thc: continue
+                d=pdist(Hp[j],Hc[j])
+                if j in rc: rs+=d; rc_+=1
+                else: ds+=d; dc+=1
+            ram=rs/max(rc_,1); dam=ds/max(dc,1); gci=abs(ram-dam)
+            if gci<0.02: break
+            r=nr2(); fr=min(0.65,gci*10)
+            for j in range(NS):
+                if j in thc: continue
+                d=pdist(Hp[j],Hc[j]); ir=j in rc
+                if (ir if ram>dam else not ir):
+                    if d>TT and r.random()<fr:
+                        ci=r.randint(0,11)
+                        if gc(Hp[j],ci)!=gc(Hc[j],ci): Hp[j]=sc(Hp[j],ci,gc(Hc[j],ci))
+                elif d<TT and r.random()<fr:
+                    ci=r.randint(0,11)
+                    if gc(Hp[j],ci)==gc(Hc[j],ci): Hp[j]=sc(Hp[j],ci,_AF[gc(Hp[j],ci)*4+r.randint(1,3)])
+        K=[(j not in thc, j in rc, pdist(h,c)) for j,(h,c) in enumerate(zip(Hp,Hc))]
+        R=[d for f,ir,d in K if f and ir]; Dd=[d for f,ir,d in K if f and not ir]
+        return abs(sum(R)/max(len(R),1)-sum(Dd)/max(len(Dd),1))
+    print(f"\n  ═══ BENCH ci ═══  {len(Hc):,} columns, {reps} seeds")
+    ok=True
+    for i in range(reps):
+        g=sg if i==0 else hashlib.sha256(sg+bytes([i])).digest()
+        H,th,_=corrupt_scalar(Hc,rc,l2,nr,nd,sg=g,fix=False); sd=_sc_seeds(g,cstages())['ci']
+        a=H[:]; it=iter(sd); t=time.perf_counter(); g0=ci0(a,th,lambda: random.Random(next(it)))
+        t0=time.perf_counter()-t; S=[H[:],th,0.0]; t=time.perf_counter()
+        _sc_run('ci',S,(Hc,rc,l2,nr,nd,g,TT),sd); t1=time.perf_counter()-t
+        same=S[0]==a; ok&=same and S[2]<=g0+1e-12
+        print(f"  seed {i}  wall identical {'✓' if same else '✗'} | gap {g0:.4f} → {S[2]:.4f}"
+              f" | {t0:5.2f}s → {t1:5.2f}s ({t0/t1:.1f}×)")
+    return bool(ok)
+
+def _tcount(f, n):
+    """apply_T_to_packed that tallies into n: tc compiles, th LUT hits, td direct."""
+    def g(T, pv):
+        had=T.lut is not None; r=f(T,pv)
+        if had: n['th']+=1
+        elif T.lut is not None: n['tc']+=1; n['th']+=1
+        else: n['td']+=1
+        return r
+    return g
+
+def bench_query(wl, n=4000):
+    """Av5.query throughput per query mix; the digest pins the output stream.
+    T×v counts come from a second, untimed run through _tcount."""
+    br=random.Random(4242); NS=wl.ns
+    mixes={'random':[br.randint(0,NS-1) for _ in range(n)],   # full-rank, mirror-prone
+           'focused':[(j*7)%2+100 for j in range(n)]}          # rank ≤2: T idles between winds
+    print(f"\n  ═══ BENCH query ═══  {n:,} enemy queries per mix")
+    for (nm,idx),fast in ((m,f) for m in mixes.items() for f in (False,True)):
+        o=Av5(wl,sa,fsk,b"BENCH",fast=fast); hd=hashlib.sha256()
+        t=time.perf_counter()
+        for j in idx: hd.update(bytes(o.query(j)))
+        dt=time.perf_counter()-t
+        g=globals(); f=g['apply_T_to_packed']; ts=dict.fromkeys(('tc','th','td'),0); g['apply_T_to_packed']=_tcount(f,ts)
+        try:
+            o=Av5(wl,sa,fsk,b"BENCH",fast=fast)
+            for j in idx: o.query(j)
+        finally: g['apply_T_to_packed']=f
+        tc,th,td=ts['tc'],ts['th'],ts['td']
+        print(f"  {nm+('/fast' if fast else '/sha'):<13}{n/dt:>8,.0f} q/s ({dt/n*1e6:5.1f} µs/q) digest={hd.hexdigest()[:16]}"
+              f" | T×v LUT {tc} compiles/{th:,} hits, {td:,} direct")
+    return True
+
+def bench_lockstep(wl, n=512, steps=80):
+    """n sessions as one Av5L vs n Av5 objects on the same streams (wide,
+    focused, narrow and phase-switching attackers, with stray out-of-range
+    and friend queries): every response, counter and final state must agree."""
+    if np is None: print("\n  ═══ BENCH lockstep ═══  needs NumPy"); return False
+    g=np.random.default_rng(2424); NS=wl.ns; t=np.arange(steps)[:,None]; k=np.arange(n)[None,:]
+    Q=np.select([k%4==0,k%4==1,k%4==2],[g.integers(0,NS,(steps,n)),100+(t+k)%7,g.integers(0,200,(steps,n))],
+                np.where((t//30)%2==1,g.integers(0,NS,(steps,n)),5000+(t+k)%11))
+    Q[g.random((steps,n))<0.01]=NS+3; F=g.random((steps,n))<0.01; salts=[b"LOCK%05d" % i for i in range(n)]
+    def state(o):
+        ct=o.ct
+        return (o.st,o.qc,o.xs.s0,o.xs.s1,list(o.T),o.mT and list(o.mT),o.wr.basis,o.wr.bt,o.wr.t,o.wr.rank,
+                list(o.dw),sorted((j,ct[j]) for j in ct.keys()),o.wi,o.nw,o.tn,o.dc2,o.ma,o.mc,o.ts,o.jr,o.s)
+    print(f"\n  ═══ BENCH lockstep ═══  {n:,} sessions × {steps} steps ({n*steps:,} queries)")
+    ok=True
+    for fast in (False,True):
+        E=wl.lockstep(salts,fast=fast); t0=time.perf_counter(); R=E.run(Q,F); tl=time.perf_counter()-t0
+        Ql=Q.T.tolist(); Fl=F.T.tolist(); S=np.empty_like(R); os_=[]; t0=time.perf_counter()
+        for i in range(n):
+            o=wl.oracle(salts[i],fast=fast); os_.append(o); q=o.query
+            for s,(j,f) in enumerate(zip(Ql[i],Fl[i])):
+                c=q(j,fsk if f else None); S[s,i]=QNONE if c is None else pack12(c)
+        ts=time.perf_counter()-t0
+        lanes=int((R==S).all(0).sum()); st=sum(state(o)==state(E.session(i)) for i,o in enumerate(os_))
+        ok&=lanes==n and st==n
+        print(f"  {'fast' if fast else 'sha':<5} Av5L {n*steps/tl:>8,.0f} q/s | Av5 {n*steps/ts:>8,.0f} q/s"
+              f" | ×{ts/tl:.1f} | {int(E.s[:,_SSK.index('sk')].sum()):,} mirror fires"
+              f" | responses {lanes}/{n} lanes, state {st}/{n}")
+        print(f"        ct {E.ct.n:,} (lane, col) entries in {E.ct.nbytes()/2**20:.1f} MiB"
+              f" (dense N×NS: {4*n*NS/2**20:.0f} MiB)")
+    print(f"  every lane = its Av5 session: {'✓' if ok else '✗'}")
+    return bool(ok)
+
+def bench_batch(wl, n=2000, burst=250):
+    """query_many vs a query() loop, friend and enemy; outputs must match."""
+    br=random.Random(5150); NS=wl.ns
+    idx=array('I',(br.randint(0,NS-1) for _ in range(n))); ok=True
+    print(f"\n  ═══ BENCH batch ═══  {n:,} queries in bursts of {burst}")
+    for nm,key in (('friend',fsk),('enemy',None)):
+        a=Av5(wl,sa,fsk,b"BATCH"); b=Av5(wl,sa,fsk,b"BATCH"); buf=array('I',bytes(4*burst))
+        loop=[pack12(a.query(j,key)) for j in idx]; bat=array('I')
+        for k in range(0,n,burst): bat.extend(b.query_many(idx[k:k+burst],key,out=buf)[:len(idx[k:k+burst])])
+        same=list(bat)==loop and a.qc==b.qc and a.st==b.st and a.s==b.s
+        if np is not None:   # ndarray indices (int64, as NumPy hands them out)
+            c=Av5(wl,sa,fsk,b"BATCH"); nb=array('I')
+            for k in range(0,n,burst): nb.extend(c.query_many(np.asarray(idx[k:k+burst],np.int64),key))
+            same&=nb==bat and c.st==b.st and c.s==b.s
+        ok&=same
+        def run_loop():
+            o=Av5(wl,sa,fsk,b"BATCH")
+            for j in idx: o.query(j,key)
+        def run_many():
+            o=Av5(wl,sa,fsk,b"BATCH")
+            for k in range(0,n,burst): o.query_many(idx[k:k+burst],key,out=buf)
+        tl=_bt(run_loop,n); tm=_bt(run_many,n)
+        print(f"  {nm:<7} identical {'✓' if same else '✗'} | query() {tl/1e3:7.2f} µs/q → "
+              f"query_many {tm/1e3:7.2f} µs/q ({tl/tm:.1f}×)")
+    return ok
+
+def bench_judas(wl, n=3000, nq=3000):
+    """_judas on the wall's JPlan vs the CSR walk and the old dict-of-lists / dict
+    path (contamination must match), then judas-heavy query mixes at jr=0.75."""
+    NS,c2l,l2c,jbank=wl.ns,wl.c2l,wl.l2c,wl.jbank
+    C2={j:list(c2l[j]) for j in range(NS) if c2l.get(j)}; L2={li:list(l2c[li]) for li in range(len(l2c))}
+    def judas0(o, j, ct):
+        lines=C2.get(j,[])
+        if not lines or o.xs.rf()>o.jr: return
+        ci_base=o.xs.next()
+        for li in lines:
+            ac=L2.get(li,[])
+            if len(ac)<2: continue
+            poison=jbank[ci_base&255]; ci_base=o.xs.next()
+            for step,aj in enumerate(ac):
+                if aj==j or step>=len(poison): continue
+                if aj not in ct: ct[aj]=0
+                jc=_MF[(ci_base>>(step*2)&3)*4+((o.qc+step)%3+1)]%DIM
+                ac2=(jc+poison[step])%DIM
+                old=ct[aj]
+                old=sc(old,jc,_AF[gc(old,jc)*4+poison[step]])
+                old=sc(old,ac2,_FROB[gc(old,ac2)])
+                ct[aj]=old
+                for delta in (1,3):
+                    nb=(aj+delta)%NS
+                    if nb not in ct: ct[nb]=0
+                    nc=_MF[(ci_base>>(delta*2)&3)*4+poison[step%len(poison)]]%DIM
+                    ct[nb]=sc(ct[nb],nc,_AF[gc(ct[nb],nc)*4+poison[(step+delta)%len(poison)]])
+    def judas1(o, j):   # CSR walk, rediscovering lines, lengths and echoes per call
+        a,b=c2l.off[j],c2l.off[j+1]
+        if a==b or o.xs.rf()>o.jr: return
+        lo=l2c.off; lx=l2c.idx; ct=o.ct.m(); st=o.s
+        ci_base=o.xs.next()
+        for li in c2l.idx[a:b]:
+            p0,p1=lo[li],lo[li+1]
+            if p1-p0<2: continue
+            poison=jbank[ci_base&255]; ci_base=o.xs.next(); pl=len(poison)
+            for step,aj in enumerate(lx[p0:min(p1,p0+pl)]):
+                if aj==j: continue
+                jc=_MF[(ci_base>>(step*2)&3)*4+((o.qc+step)%3+1)]%DIM
+                ac2=(jc+poison[step])%DIM
+                old=ct.get(aj,0)
+                old=sc(old,jc,_AF[gc(old,jc)*4+poison[step]])
+                old=sc(old,ac2,_FROB[gc(old,ac2)])
+                ct[aj]=old; st['ju']+=1
+                for delta in (1,3):
+                    nb=(aj+delta)%NS; v=ct.get(nb,0)
+                    nc=_MF[(ci_base>>(delta*2)&3)*4+poison[step]]%DIM
+                    ct[nb]=sc(v,nc,_AF[gc(v,nc)*4+poison[(step+delta)%pl]])
+            st['pd']+=1
+        o.ct.fit()
+    class Av5C(Av5): _judas=judas1
+    t=time.perf_counter(); wl.jp=JPlan(c2l,l2c,NS); tp=time.perf_counter()-t; P=wl.jp
+    br=random.Random(6161); ok=True
+    print(f"\n  ═══ BENCH judas ═══  {NS:,} columns | plan {len(P.go)-1:,} groups, {len(P.tg):,} entries"
+          f" ({(len(P.off)+len(P.go)+len(P.tg))*4/2**20:.1f} MiB) in {tp*1e3:.0f} ms")
+    print("  per call, jr=1, best of 3: dict → CSR → plan")
+    pygc.disable()
+    try:
+        for nm,idx in (('spread',[br.randint(0,NS-1) for _ in range(n)]),
+                       ('local',[br.randint(0,min(500,NS-1)) for _ in range(n)])):
+            to=tc=tn=9e9
+            for _ in range(3):
+                a=Av5(wl,sa,b"",b"J"); b=Av5(wl,sa,b"",b"J"); c=Av5(wl,sa,b"",b"J"); a.jr=b.jr=c.jr=1.0; ref={}
+                t=time.perf_counter()
+                for j in idx: judas0(a,j,ref)
+                to=min(to,time.perf_counter()-t); t=time.perf_counter()
+                for j in idx: judas1(c,j)
+                tc=min(tc,time.perf_counter()-t); t=time.perf_counter()
+                for j in idx: b._judas(j)
+                tn=min(tn,time.perf_counter()-t)
+            same=len(ref)==len(b.ct) and list(ref)==list(b.ct.keys()) and all(b.ct[k]==v for k,v in ref.items())
+            same&=list(c.ct.keys())==list(b.ct.keys()) and all(c.ct[k]==b.ct[k] for k in ref) and c.s==b.s
+            ok&=same
+            mo=sys.getsizeof(ref)+28*len(ref)
+            mn=sys.getsizeof(b.ct.d)+28*len(b.ct) if b.ct.a is None else 4*(NS+len(b.ct))
+            print(f"  {nm:<7}{len(ref):>7,} cols {'dense ' if b.ct.a is not None else 'sparse'} "
+                  f"{'✓' if same else '✗'} | {to/n*1e6:5.1f} → {tc/n*1e6:5.1f} → {tn/n*1e6:5.1f} µs/call"
+                  f" | ct {mo/1024:6.0f} → {mn/1024:5.0f} KiB")
+        # judas-heavy queries: jr held at its 0.75 ceiling, wide or line-local attackers
+        print(f"  query mixes, jr=0.75 ({nq:,} queries, best of 3): CSR → plan")
+        for nm,idx in (('wide',[br.randrange(NS) for _ in range(nq)]),
+                       ('local',[br.randint(0,min(500,NS-1)) for _ in range(nq)])):
+            for fast in (False,True):
+                bt=[9e9,9e9]; rs=[None,None]
+                for _ in range(3):
+                    for i,C in enumerate((Av5C,Av5)):
+                        o=C(wl,sa,b"",b"JQ",fast); q=o.query; r=[]; t=time.perf_counter()
+                        for j in idx: o.jr=0.75; r.append(q(j))
+                        bt[i]=min(bt[i],time.perf_counter()-t)
+                        rs[i]=(r,o.s,list(o.ct.keys()),[o.ct[k] for k in o.ct.keys()])
+                same=rs[0]==rs[1]; ok&=same
+                print(f"  {nm:<6}{'fast' if fast else 'sha':<5}{rs[1][1]['ju']/nq:>5.1f} poison/q "
+                      f"{'✓' if same else '✗'} | {bt[0]/nq*1e6:6.1f} → {bt[1]/nq*1e6:6.1f} µs/q"
+                      f" ({bt[0]/bt[1]:.2f}×)")
+    finally: pygc.enable()
+    return ok
+
+def bench_serve(wl, budget_mb=1):
+    """A forked --serve on a Unix socket: replies must match an in-process Av5 with
+    the same salt (enemy and friend), a failing handler must answer with an error
+    frame on a live connection, then loadgen; the tight budget forces evictions."""
+    d=tempfile.mkdtemp(); path=os.path.join(d,'s'); addr='unix:'+path
+    NS=wl.ns; pool=Pool(wl,budget_mb<<20,fsk)
+    def handle(b):   # b'!' stands in for a handler bug
+        if b==b'!': raise ValueError("boom")
+        return pool.handle(b)
+    pr=mp.get_context('fork').Process(target=lambda: asyncio.run(serve(addr,handle)),daemon=True)
+    pr.start()
+    async def run():
+        for _ in range(500):
+            if os.path.exists(path): break
+            await asyncio.sleep(0.02)
+        r,w=await _open(addr); g=random.Random(99); salt=b"BENCH-SERVE-0001"
+        idx=array('I',(g.randrange(NS) for _ in range(64)))
+        ok=await _rpc(r,w,b'Q'+salt+b'\0'+idx.tobytes())==Av5(wl,sa,fsk,salt).query_many(idx).tobytes()
+        try: await _rpc(r,w,b'!'); er=False
+        except RuntimeError as e: er=str(e)=="ValueError: boom"
+        ok&=er
+        ok&=await _rpc(r,w,b'Q'+salt+bytes([32])+fsk+idx.tobytes())==array('I',map(wl.Hp.__getitem__,idx)).tobytes()
+        w.close()
+        print(f"  replies match in-process Av5 (enemy + friend), handler error → error frame,"
+              f" connection kept: {'✓' if ok else '✗'}")
+        await loadgen(addr)
+        return bool(ok)
+    print(f"\n  ═══ BENCH serve ═══  forked server on {addr}, budget {budget_mb} MB")
+    try: return asyncio.run(run())
+    finally:
+        pr.terminate(); pr.join()
+        try: os.unlink(path); os.rmdir(d)
+        except OSError: pass
+
+def _mem_kb(pid):
+    """(Rss, Pss, n) in kB of pid plus its n forked children, from /proc (Linux).
+    A fork keeps the parent's cmdline; exec'd helpers such as the resource_tracker
+    SharedMemory starts don't, and are left out."""
+    pids=[pid]
+    with open(f"/proc/{pid}/cmdline",'rb') as f: cl=f.read()
+    for d in os.listdir('/proc'):
+        try:
+            if d.isdigit() and int(open(f"/proc/{d}/stat").read().rsplit(')',1)[1].split()[1])==pid:
+                with open(f"/proc/{d}/cmdline",'rb') as f:
+                    if f.read()==cl: pids.append(int(d))
+        except OSError: pass
+    rss=pss=0
+    for q in pids:
+        try:
+            for ln in open(f"/proc/{q}/smaps_rollup"):
+                if ln.startswith('Rss:'): rss+=int(ln.split()[1])
+                elif ln.startswith('Pss:'): pss+=int(ln.split()[1])
+        except OSError: pass
+    return rss,pss,len(pids)-1
+
+def bench_workers(wl, conc=16, nmsg=25):
+    """--serve --workers N for N = 1, 2, 4 … 2×cores: q/s at fixed concurrency and
+    the whole pool's PSS (the wall is one shared block, so it should barely move)."""
+    cores=os.cpu_count() or 1; ok=True; NS=wl.ns
+    ns=[1<<k for k in range(8) if 1<<k<=max(2,2*cores)]
+    print(f"\n  ═══ BENCH workers ═══  {NS:,} columns | {cores} core(s) | c={conc}, {nmsg}×16 queries each")
+    base=None
+    for n in ns:
+        d=tempfile.mkdtemp(); path=os.path.join(d,'s'); addr='unix:'+path
+        pr=mp.get_context('fork').Process(target=serve_workers,args=(wl,addr,n,64<<20,fsk)); pr.start()
+        try:
+            for _ in range(500):
+                if os.path.exists(path): break
+                time.sleep(0.02)
+            async def same(salt):
+                r,w=await _open(addr); idx=array('I',range(0,NS,max(1,NS//48)))
+                rep=await _rpc(r,w,b'Q'+salt+b'\0'+idx.tobytes()); w.close()
+                return rep==Av5(wl,sa,fsk,salt).query_many(idx).tobytes()
+            eq=all(asyncio.run(same(bytes([k])*16)) for k in range(n+1))   # hits every worker
+            (c,qps,p50,p99),=asyncio.run(loadgen(addr,(conc,),nmsg,show=False))
+            rss,pss,nk=_mem_kb(pr.pid); base=base or qps; ok&=eq and nk==n
+            print(f"  workers={n:<3}{'✓' if eq else '✗'}{qps:>8,.0f} q/s ({qps/base:4.2f}×) | p50 {p50*1e3:6.2f} ms p99 {p99*1e3:6.2f} ms"
+                  f" | pool PSS {pss/1024:6.1f} MB, RSS {rss/1024:6.1f} MB")
+        finally:
+            pr.terminate(); pr.join()
+            try: os.unlink(path); os.rmdir(d)
+            except OSError: pass
+    return ok
+
+def bench_snapshot(wl, n=1000, q=40, tail=60):
+    """snapshot → restore on n driven sessions (sha/fast, sparse/dense ct, mirror
+    armed); the restored copy must continue the identical query stream."""
+    br=random.Random(8080); ok=True; NS=wl.ns
+    ss=[]
+    for i in range(n):
+        o=Av5(wl,sa,fsk,i.to_bytes(16,'big'),fast=i&1)
+        for _ in range(br.randint(1,q)): o.query(br.randint(0,NS-1))
+        ss.append(o)
+    hv=Av5(wl,sa,fsk,b"DENSE",fast=True); hv.jr=1.0   # heavy: dense ct, mirror cycles
+    for _ in range(3000): hv.query(br.randint(0,min(NS-1,300)) if br.random()<0.5 else br.randint(0,NS-1))
+    ss.append(hv)
+    t=time.perf_counter(); blobs=[o.snapshot() for o in ss]; ts=time.perf_counter()-t
+    t=time.perf_counter(); rs=[Av5.restore(wl,b,fsk) for b in blobs]; tr=time.perf_counter()-t
+    ok&=all(r.snapshot()==b for r,b in zip(rs,blobs))
+    for o,r in zip(ss[::50]+[hv],rs[::50]+[rs[-1]]):
+        idx=[br.randint(0,NS-1) for _ in range(tail)]
+        ok&=[o.query(j) for j in idx]==[r.query(j) for j in idx] and o.s==r.s and o.snapshot()==r.snapshot()
+    sz=[len(b) for b in blobs[:-1]]
+    print(f"\n  ═══ BENCH snapshot ═══  {n:,} sessions (1–{q} queries) + 1 heavy")
+    print(f"  snapshot {ts/len(ss)*1e6:6.1f} µs/session | restore {tr/len(ss)*1e6:6.1f} µs/session"
+          f" | {sum(sz)/len(sz):,.0f} B/session avg, heavy {len(blobs[-1]):,} B"
+          f" ({'dense' if hv.ct.a is not None else 'sparse'} ct, {len(hv.ct):,} cols, mi={hv.s['mi']})")
+    try: Av5.restore(wl,blobs[0][:-1],fsk); ok=False
+    except ValueError: pass
+    for C in (Av5,Av5T):   # another wall is refused before any state is built
+        try: C.restore(Wall(wl.sr+1,wl.sd,wl.full,wl.engine),blobs[0],fsk); ok=False
+        except ValueError: pass
+    # subclasses restore with their own state; salts past 255 B round-trip
+    d=tempfile.mkdtemp(); tr=Recorder(os.path.join(d,'t'),wl.key); idx=[br.randint(0,NS-1) for _ in range(tail)]
+    try:
+        for C,kw in ((Av5P,{'pf':Prof()}),(Av5T,{'tr':tr}),(Av5D,{'dl':250_000}),(Av5,{})):
+            o=C(wl,sa,fsk,bytes(range(256))*2 if C is Av5 else b"SUB",True,**kw)
+            for _ in range(200): o.query(br.randint(0,NS-1))
+            r=C.restore(wl,o.snapshot(),fsk,**kw)
+            ok&=type(r) is C and all(getattr(r,k)==v for k,v in kw.items())
+            ok&=[o.query(j) for j in idx]==[r.query(j) for j in idx] and o.snapshot()==r.snapshot()
+    finally:
+        try: os.unlink(tr.path)
+        except OSError: pass
+        os.rmdir(d)
+    print(f"  round trip + {tail}-query continuation identical (Av5, Av5P/T/D, 512 B salt), other wall refused: {'✓' if ok else '✗'}")
+    return bool(ok)
+
+def bench_phases(wl, nq=1000, reps=5, out=None):
+    """Per-stage timings over reps runs: line builds, adjacency, corruption per
+    stage (venoms in vid order), Judas bank and plan, and µs/query per Av5 path. Reports
+    best and median; out (--json) gets them for --compare."""
+    jobs=wl.jobs; eng=corrupt_vec if wl.engine=='vec' else corrupt_scalar; NS=wl.ns
+    br=random.Random(9090); runs={}; cov={}
+    wide=[br.randrange(NS) for _ in range(nq)]               # variance trips the mirror
+    calm=[min(NS-1,(j*7)%2+100) for j in range(nq)]          # rank ≤2: jr stays at 0.35
+    def timed(k, f, *a, auto=False):
+        pygc.collect(); n=0; t=time.perf_counter()
+        while True:   # auto: repeat sub-10 ms stages for a stable per-call time
+            r=f(*a); n+=1; dt=time.perf_counter()-t
+            if not auto or dt>0.05: break
+        runs.setdefault(k,[]).append(dt/n); return r
+    def qpath(k, idx, key=None, pin=None):
+        o=Av5(wl,sa,fsk,b"PHASES"); q=o.query; pygc.collect(); t=time.perf_counter()
+        if pin is None:
+            for j in idx: q(j,key)
+        else:
+            for j in idx: pin(o); q(j)
+        runs.setdefault(k,[]).append((time.perf_counter()-t)/len(idx)*1e6); cov[k]=o.s
+    def one():
+        if wl.full:
+            pts,pos=timed('spread',full_spread,jobs); dl=timed('decoys',sample_decoys,wl.sd,jobs)
+            Hc,rc,_,l2,nr,nd=timed('adjacency',full_columns,pts,pos,dl)
+        else:
+            rl=timed('spread',sample_spread,wl.sr,jobs); dl=timed('decoys',sample_decoys,wl.sd,jobs)
+            Hc,rc,_,l2,nr,nd=timed('adjacency',line_geometry,rl,dl)
+        tm={}; pygc.collect(); eng(Hc,rc,l2,nr,nd,tm=tm)
+        for k in ('corrupt','traps',*('venom_'+v for v in vid),'ci'): runs.setdefault(k,[]).append(tm[k])
+        timed('jbank',judas_bank,sa,auto=True); wl.jp=timed('jplan',JPlan,wl.c2l,wl.l2c,NS)
+        qpath('q_friend',wide,fsk); qpath('q_normal',calm)
+        qpath('q_judas',calm,pin=lambda o: setattr(o,'jr',1.0))
+        qpath('q_mirror',wide); qpath('q_wind',calm,pin=lambda o: setattr(o,'nw',0))
+    print(f"\n  ═══ BENCH phases ═══  {NS:,} columns | engine {wl.engine} | {reps} reps", flush=True)
+    pygc.disable()   # as timeit: collector pauses are the largest noise source here
+    try:
+        for _ in range(reps): one()
+    finally: pygc.enable()
+    ok=cov['q_mirror']['ti']>0 and cov['q_wind']['w']>=nq and cov['q_judas']['ju']>cov['q_normal']['ju']
+    st={k:{'unit':'us/q' if k.startswith('q_') else 's','min':min(v),'median':sorted(v)[len(v)//2],'runs':v}
+        for k,v in runs.items()}
+    print(f"  {'stage':<13}{'best':>10}{'median':>10}")
+    for k,v in st.items(): print(f"  {k:<13}{v['min']:>10.4g}{v['median']:>10.4g} {v['unit']}")
+    print(f"  query paths exercised (tilt, wind, judas): {'✓' if ok else '✗'}")
+    if out:
+        with open(out,'w') as f:
+            json.dump({'version':1,'ns':NS,'sr':wl.sr,'sd':wl.sd,'engine':wl.engine,
+                       'full_spread':wl.full,'jobs':jobs,'reps':reps,'nq':nq,
+                       'python':sys.version.split()[0],'stages':st},f,indent=1)
+        print(f"  → {out}")
+    return ok
+
+def bench_compare(old, new, thr):
+    """Stage-by-stage diff of two --bench phases files on best-of-reps times. A
+    stage regresses when it is thr% slower and also beyond OLD's own min–median
+    spread, so one noisy run can't flag it."""
+    with open(old) as f: A=json.load(f)
+    with open(new) as f: B=json.load(f)
+    bad=[]; a,b=A['stages'],B['stages']
+    print(f"  {old} → {new}  (±{thr:g}%)")
+    for k in A, B:
+        if (k['ns'],k['engine'],k['full_spread'])!=(A['ns'],A['engine'],A['full_spread']):
+            print(f"  ! different setups: ns/engine/full-spread {A['ns']}/{A['engine']}/{A['full_spread']}"
+                  f" vs {k['ns']}/{k['engine']}/{k['full_spread']}")
+    for k in list(a)+[k for k in b if k not in a]:
+        if k not in a or k not in b: print(f"  {k:<13} only in {'new' if k in b else 'old'}"); continue
+        x,y,u=a[k]['min'],b[k]['min'],a[k]['unit']; d=(y/x-1)*100 if x else 0.0
+        reg=d>thr and y>a[k]['median']
+        if reg: bad.append(k)
+        print(f"  {k:<13}{x:>10.4g} → {y:<10.4g}{u:<5}{d:+7.1f}%"
+              +('  ✗ REGRESSION' if reg else '  (noise)' if d>thr else '  faster' if d<-thr else ''))
+    print(f"  → {'regressed: '+', '.join(bad) if bad else 'no regressions'}")
+    return not bad
+
+def bench_prof(wl, n=3000):
+    """Av5P vs Av5 on the same stream (identical output, instrumentation cost),
+    then the per-stage p50/p99 table and the head of the Prometheus dump."""
+    br=random.Random(1717); NS=wl.ns
+    idx=[br.randrange(NS) if br.random()<0.6 else 100+(k&1) for k in range(n)]
+    a=Av5(wl,sa,fsk,b"PROF"); pf=Prof(); b=Av5P(wl,sa,fsk,b"PROF",pf=pf)
+    oa=[a.query(j) for j in idx]; ob=[b.query(j) for j in idx]   # also the warmup of both
+    ok=oa==ob and a.s==b.s; T=([],[])
+    pygc.disable()
+    try:
+        for _ in range(5):   # alternate, fresh sessions each round
+            for i,mk in enumerate((lambda: Av5(wl,sa,fsk,b"PROF"), lambda: Av5P(wl,sa,fsk,b"PROF",pf=Prof()))):
+                q=mk().query; t=time.perf_counter()
+                for j in idx: q(j)
+                T[i].append(time.perf_counter()-t)
+    finally: pygc.enable()
+    ta,tb=min(T[0]),min(T[1]); ma,mb=sorted(T[0])[2],sorted(T[1])[2]
+    print(f"\n  ═══ BENCH prof ═══  {n:,} enemy queries (60% wide, 40% calm), best | median of 5, alternated")
+    print(f"  Av5 {ta/n*1e6:6.1f} | {ma/n*1e6:6.1f} µs/q · Av5P {tb/n*1e6:6.1f} | {mb/n*1e6:6.1f} µs/q"
+          f" ({(tb/ta-1)*100:+.0f}% | {(mb/ma-1)*100:+.0f}%) | stream identical {'✓' if ok else '✗'}")
+    sn=pf.snapshot()
+    print(f"  {'stage':<8}{'count':>7}{'mean':>10}{'p50 ≤':>10}{'p99 ≤':>10}")
+    for k,v in sn['stages'].items():
+        if v['count']: print(f"  {k:<8}{v['count']:>7,}{v['sum_ns']/v['count']/1e3:>8.1f}µs"
+                             f"{v['p50_ns']/1e3:>8.1f}µs{v['p99_ns']/1e3:>8.1f}µs")
+    print(f"  net allocated blocks: {sn['alloc']['sum_blocks']:+,} over {n:,} queries")
+    pm=pf.prometheus().splitlines(); ok&=pm[-1].endswith(f" {n}")
+    print("  "+"\n  ".join(pm[:4]+['…']+pm[-3:]))
+    return bool(ok)
+
+def bench_trace(wl, n=6000):
+    """A mixed multi-session workload (single/batch, friend/enemy, out of range
+    on either side, an evicted salt starting over, salts past 255 B) run plain, then recorded; the recorded
+    stream and its replays (mmap and chunked reads) must be identical."""
+    NS=wl.ns; g=random.Random(2020); salts=[b"T%02d" % i for i in range(10)]+[bytes(range(256))+b"L300"*11,b"L"*1000]; ops=[]
+    for _ in range(n):
+        x=g.random(); si=g.randrange(12)
+        if x<0.60: ops.append((si,'q',g.randrange(NS),False))
+        elif x<0.70: ops.append((si,'q',g.randrange(NS),True))
+        elif x<0.705: ops.append((si,'q',NS+g.randrange(9),False))
+        elif x<0.71: ops.append((si,'q',-1-g.randrange(9),False))
+        elif x<0.72: ops.append((si,'m',[g.randrange(NS),-1-g.randrange(9),NS+g.randrange(9),g.randrange(NS)],False))
+        elif x<0.96: ops.append((si,'m',array('I',(g.randrange(NS) for _ in range(g.randint(1,32)))),False))
+        elif x<0.995: ops.append((si,'m',array('I',(g.randrange(NS) for _ in range(g.randint(1,32)))),True))
+        else: ops.append((si,'new',None,False))
+    def run(tr=None):
+        ss={}; made=[]; hd=hashlib.sha256(); t=time.perf_counter()
+        def sess(si):
+            o=ss[si]=wl.oracle(salts[si],fast=si&1,tr=tr); made.append(o); return o
+        for si,op,a,fr in ops:
+            o=ss.get(si) or sess(si); key=fsk if fr else None
+            if op=='q':
+                c=o.query(a,key); hd.update(struct.pack('<I',QNONE if c is None else pack12(c)))
+            elif op=='m': hd.update(o.query_many(a,key).tobytes())
+            else: sess(si)
+        dt=time.perf_counter()-t
+        if tr: tr.close()
+        st=dict.fromkeys(_SSK,0)
+        for o in made:
+            for k,v in o.s.items(): st[k]+=v
+        return hd.hexdigest(),st,dt
+    d=tempfile.mkdtemp(); path=os.path.join(d,'t.trace')
+    try:
+        d0,s0,t0=run(); d1,s1,t1=run(Recorder(path,wl.key)); sz=os.path.getsize(path)
+        r=replay(wl,path)
+        with open(path,'rb') as f: blob=f.read()
+        a=[w for ch in _trace_chunks(open(path,'rb'),1000) for w in ch]
+        b=[w for ch in _trace_chunks(io.BytesIO(blob[_TRH.size:]),999) for w in ch]
+        try: replay(Wall(wl.sr+1,wl.sd),path); bad=False
+        except ValueError: bad=True
+    finally:
+        try: os.unlink(path); os.rmdir(d)
+        except OSError: pass
+    nq=r['queries']; ok=d0==d1==r['digest'] and s0==s1==r['s'] and a==b and bad
+    print(f"\n  ═══ BENCH trace ═══  {len(ops):,} ops → {nq:,} queries over {r['sessions']} sessions")
+    print(f"  plain {t0/nq*1e6:6.1f} µs/q | recording {t1/nq*1e6:6.1f} µs/q ({(t1/t0-1)*100:+.1f}%)"
+          f" | trace {sz:,} B ({sz/nq:.2f} B/q)")
+    print(f"  replay {nq/r['seconds']:,.0f} q/s | digest {r['digest'][:16]} | counters ju={r['s']['ju']:,} mi={r['s']['mi']}")
+    print(f"  live = recorded = replayed (digest, Av5.s), mmap = chunked reads, wrong wall refused:"
+          f" {'✓' if ok else '✗'}")
+    return bool(ok)
+
+def bench_analytics(wl, nc=1000, big=2_000_000):
+    """ANALYTICS vs the battery's per-coordinate loops on live responses (12
+    repeat queries per column), then throughput with the responses tiled to
+    big rows."""
+    if np is None: print("\n  --bench analytics needs NumPy"); return False
+    NS=wl.ns; Hcp=wl.Hcp; rcs=wl.rcs; g=random.Random(2121); o=wl.oracle(b"ANALYTICS")
+    J=g.sample(range(NS),nc); W=o.query_many([j for j in J for _ in range(12)])
+    C=[Hcp[j] for j in J]; real=[j in rcs for j in J]; ct=o.ct
+    G=[]
+    for jc in ct.keys():
+        for li in wl.c2l.get(jc,[]):
+            nbs=[ct[jj] for jj in wl.l2c.get(li,[])[:7] if jj in ct]
+            if len(nbs)>=3: G.append(nbs+[0]*(7-len(nbs))); break
+    def r_gap(W,C,real):
+        d=[sum(1 for i in range(12) if gc(W[12*k+i],i)!=gc(C[k],i)) for k in range(len(C))]
+        rd=[x for x,m in zip(d,real) if m]; dd=[x for x,m in zip(d,real) if not m]
+        return abs(sum(rd)/len(rd)-sum(dd)/len(dd))
+    def r_syn(A,B): return len({tuple(_AF[gc(a,i)*4+gc(b,i)] for i in range(12)) for a,b in zip(A,B)})
+    def r_closure(G):
+        mc=0
+        for nbs in G:
+            for coord in range(3):
+                t=0
+                for w in nbs: t=_AF[t*4+gc(w,coord)]
+                if t: mc+=1
+        return mc/max(3*len(G),1)
+    def r_bias(W):
+        F=[[0]*4 for _ in range(12)]
+        for w in W:
+            for i,v in enumerate(unpack12(w)): F[i][v]+=1
+        return F
+    def r_rank(W,m=12): return [_rank(W[k:k+m]) for k in range(0,len(W)-m+1,m)]
+    A,B=W[0::2],W[1::2]; F,_=a_bias(W)
+    ok=(r_gap(W,C,real)==a_gap(a_diag(W),C,real) and r_syn(A,B)==a_syn(A,B)
+        and r_closure(G)==a_closure(G) and r_bias(W)==F.tolist() and r_rank(W)==a_rank(W).tolist())
+    print(f"\n  ═══ BENCH analytics ═══  {len(W):,} live responses ({nc:,} columns × 12), {len(G):,} Judas lines")
+    print(f"  identical to the per-coordinate loops (gap, syn, closure, bias, rank): {'✓' if ok else '✗'}")
+    k=big//len(W)+1; Wb=np.tile(np.asarray(W,np.uint32),k)[:big-big%12]; nb=len(Wb); cb=nb//12
+    Cb=np.tile(np.asarray(C,np.uint32),k)[:cb]; Rb=np.tile(np.asarray(real),k)[:cb]
+    Gb=np.tile(np.asarray(G,np.uint32),(max(1,nb//(7*len(G))),1)) if G else np.zeros((0,7),np.uint32)
+    def vt(f): t=time.perf_counter(); f(); return time.perf_counter()-t
+    print(f"  {'metric':<9}{'loops rows/s':>14}{'array rows/s':>15}{'speedup':>9}   ({nb:,} rows)")
+    for nm,n,ts,n2,tv in (
+            ('gap',len(W),vt(lambda: r_gap(W,C,real)),nb,vt(lambda: a_gap(a_diag(Wb),Cb,Rb))),
+            ('syn',len(W),vt(lambda: r_syn(A,B)),nb,vt(lambda: a_syn(Wb[0::2],Wb[1::2]))),
+            ('closure',7*len(G),vt(lambda: r_closure(G)),Gb.size,vt(lambda: a_closure(Gb))),
+            ('bias',len(W),vt(lambda: r_bias(W)),nb,vt(lambda: a_bias(Wb))),
+            ('rank',len(W),vt(lambda: r_rank(W)),nb,vt(lambda: a_rank(Wb)))):
+        print(f"  {nm:<9}{n/ts:>14,.0f}{n2/tv:>15,.0f}{n2/tv/(n/ts):>8.0f}×")
+    a=analyze(Wb); t=vt(lambda: analyze(Wb))
+    print(f"  analyze: {nb:,} rows in {t*1e3:.0f} ms | χ² max {a['chi2_max']:.1f} | rank mean {a['rank_mean']:.2f}")
+    return bool(ok)
+
+def bench_deadline(wl, n=6000, dl=250_000):
+    """Av5 vs Av5D (budget dl ns) on a wide, mirror-tripping stream: identical
+    responses, counters and final state; per-query latency against the budget."""
+    br=random.Random(2222); NS=wl.ns
+    idx=[br.randrange(NS) if br.random()<0.8 else 100+(k&1) for k in range(n)]
+    def run(o):
+        lat=[]; out=[]; now=time.perf_counter_ns; q=o.query
+        pygc.collect(); pygc.disable()
+        try:
+            for j in idx: t=now(); out.append(q(j)); lat.append(now()-t)
+        finally: pygc.enable()
+        lat.sort(); return out,lat,o
+    run(wl.oracle(b"WARM",dl=dl)); run(wl.oracle(b"WARM"))
+    pf=Prof(); oa,la,a=run(wl.oracle(b"DEADLINE")); ob,lb,b=run(wl.oracle(b"DEADLINE",pf=pf,dl=dl))
+    ok=oa==ob and a.s==b.s and a.snapshot()==b.snapshot()
+    print(f"\n  ═══ BENCH deadline ═══  {n:,} enemy queries (80% wide) | budget {dl/1e3:g} µs | {a.s['sk']} mass Judas")
+    print(f"  responses, counters and final state identical: {'✓' if ok else '✗'}")
+    print(f"  {'':<6}{'p50':>9}{'p99':>9}{'p99.9':>9}{'max':>9}  over budget   total")
+    for nm,l in (('Av5',la),('Av5D',lb)):
+        q=lambda x: l[min(n-1,int(x*n))]/1e3; ov=sum(1 for x in l if x>dl)
+        print(f"  {nm:<6}{q(0.5):>7.0f}µs{q(0.99):>7.0f}µs{q(0.999):>7.0f}µs{l[-1]/1e3:>7.0f}µs"
+              f"  {ov:>5,} ({ov/n*100:4.1f}%)  {sum(l)/1e9:6.2f}s")
+    d=pf.snapshot()['stages']['defer']
+    print(f"  deferred work: {d['sum_ns']/1e6:.1f} ms over {d['count']:,} queries | {b.cc/1e3:.1f} µs per mass-Judas column")
+    return bool(ok)
+
+def bench_stages(wl):
+    """Stage cache in a fresh directory: a cold build, a warm one, a CI threshold
+    change (only ci reruns) and a decoy change (spread reused). Each must equal
+    the same build without a cache."""
+    d=tempfile.mkdtemp(); c=dict(sr=wl.sr,full=wl.full,engine=wl.engine,jobs=wl.jobs)
+    def same(A, B):
+        f=lambda x: (sorted(x) if isinstance(x,(set,Bits)) else (list(x.off),list(x.idx)) if isinstance(x,Adj)
+                     else x if isinstance(x,(int,float)) else list(x))
+        return all(f(a)==f(b) for a,b in zip(A,B))
+    runs=(('cold',{}),('warm',{}),(f'tt={TT+1}',{'tt':TT+1}),(f'sd={wl.sd+1}',{'sd':wl.sd+1}))
+    cols=[]; ok=True
+    try:
+        for nm,kw in runs:
+            kw={'sd':wl.sd,**kw}; rep=[]; t=time.perf_counter()
+            W=build_staged(**c,**kw,cache=d,rep=rep); t=time.perf_counter()-t
+            ok&=same(W,build_staged(**c,**kw)); cols.append((nm,t,rep))
+    finally:
+        sd=os.path.join(d,'stages')
+        for f in os.listdir(sd) if os.path.isdir(sd) else (): os.unlink(os.path.join(sd,f))
+        for x in (sd,d):
+            try: os.rmdir(x)
+            except OSError: pass
+    print(f"\n  ═══ BENCH stages ═══  {wl.engine} engine | {'full spread' if wl.full else f'{wl.sr:,}r+{wl.sd:,}d'}")
+    print(f"  {'stage':<11}"+''.join(f"{nm:>16}" for nm,_,_ in cols))
+    for i,(k,_,_) in enumerate(cols[0][2]):
+        print(f"  {k:<11}"+''.join(f"{r[i][1]*1e3:>10.1f}ms {r[i][2]:>4}" for _,_,r in cols))
+    print(f"  {'total':<11}"+''.join(f"{t*1e3:>10.1f}ms     " for _,t,_ in cols))
+    print(f"  every run = uncached build of the same parameters: {'✓' if ok else '✗'}")
+    return bool(ok)
+
+BENCH={'gf4':bench_gf4,'tmat':bench_tmat,'wrank':bench_wrank,'venoms':bench_venoms,'query':bench_query,
+       'batch':bench_batch,'ci':bench_ci,'judas':bench_judas,
+       'serve':bench_serve,'workers':bench_workers,
+       'snapshot':bench_snapshot,'phases':bench_phases,
+       'prof':bench_prof,'trace':bench_trace,'analytics':bench_analytics,
+       'deadline':bench_deadline,'stages':bench_stages,'lockstep':bench_lockstep}
+# ══════════════════════════════════════════════════════════════
+# 4. FUSED ATTACK BATTERY
+# ══════════════════════════════════════════════════════════════
+def attacks(wl, tag=b"", seeds=(42,666,7777), say=None, rec=None):
+    """Attacks [A]…[I] on wl → metrics. Sessions are salted tag+name and the
+    attacker RNGs seeded from seeds, so (tag, seeds) names one sample; the
+    defaults are the CLI battery. say (e.g. print) gets its progress lines;
+    a Recorder rec gets every query."""
+    Hp,Hcp,rcs,c2l,l2c,n_real,NS=wl.Hp,wl.Hcp,wl.rcs,wl.c2l,wl.l2c,wl.n_real,wl.ns
+    say=say or (lambda *a, **k: None); sk=fsk
+    def mk(salt=None): return wl.oracle(tag+salt,sk,tr=rec)
+
+    # [A] Friend
+    say("  [A] Friend...", end=" ", flush=True)
+    o=mk(b"F"); tr=random.Random(seeds[0]); fok=0
+    for _ in range(500):
+        j=tr.randint(0,NS-1)
+        if o.query(j,key=sk)==unpack12(Hp[j]): fok+=1
+    say(f"{fok}/500 {'✓' if fok==500 else '✗'}")
+
+    # [B+C+E+G] FUSED: Convergence + Syndromes + Gap + Judas on SHARED oracle
+    say("  [B+C+E+G] Fused...", end=" ", flush=True)
+    of=mk(b"FUSED"); er=random.Random(seeds[1])
+    ec=[]
+    for li in range(min(100,n_real)): ec.extend(l2c[li])
+
+    # Phase 1: 500 convergence queries
+    for j in ec[:500]: of.query(j)
+    sb=dict(of.s)
+
+    # Phases 2–4 gather packed responses in bulk, then score them (ANALYTICS)
+    # Phase 2: 10 syndrome epochs (reuse same oracle)
+    j_a,j_b=ec[0],ec[5]; SA=array('I'); SB=array('I')
+    for _ in range(10):
+        r=of.query_many([er.randint(0,NS-1) for _ in range(30)]+[j_a,j_b])
+        SA.append(r[30]); SB.append(r[31])
+    us=a_syn(SA,SB)
+
+    # Phase 3: Gap measurement (reuse same oracle): coordinate i of a column
+    # is read from its i-th of 12 repeat queries
+    gr=random.Random(seeds[2])
+    J=gr.sample(sorted(rcs),min(200,len(rcs))); nr=len(J)
+    J+=gr.sample([j for j in range(NS) if j not in rcs],min(200,NS-len(rcs)))
+    og=a_gap(a_diag(of.query_many([j for j in J for _ in range(12)])),[Hcp[j] for j in J],
+             [k<nr for k in range(len(J))])
+
+    # Phase 4: Judas measurement
+    ct=of.ct; G=[]
+    for jc in list(ct.keys())[:300]:
+        for li in c2l.get(jc,[]):
+            nbs=[ct[jj] for jj in l2c.get(li,[])[:7] if jj in ct]
+            if len(nbs)<3: continue
+            G.append(nbs+[0]*(7-len(nbs))); break
+    cr=a_closure(G); sf=of.s
+    say(f"{sb['mn']}m+{sb['mj']}M | {us}/10syn | gap={og:.4f} | judas={cr:.3f} "
+        f"w={sf['w']} ju={sf['ju']}")
+
+    # [D] Mirror+Tilt (separate — needs desperation pattern)
+    say("  [D] Mirror...", end=" ", flush=True)
+    od=mk(b"D")
+    for _ in range(50): od.query(er.randint(0,min(100,NS-1)))
+    for _ in range(30): od.query(er.randint(0,NS-1))
+    sd=od.s
+    say(f"mi={sd['mi']} fr={sd['fr']} ti={sd['ti']} sk={sd['sk']}")
+
+    # [H] Replay
+    say("  [H] Replay...", end=" ", flush=True)
+    o1=mk(b"R1"); o2=mk(b"R2"); rm2=0
+    for _ in range(200):
+        j=gr.randint(0,NS-1)
+        if o1.query(j)==o2.query(j): rm2+=1
+    say(f"{rm2}/200 {'✓' if rm2<20 else '✗'}")
+
+    # [I] Thermal
+    say("  [I] Thermal...", end=" ", flush=True)
+    ot=mk(b"TH")
+    for j in range(300): ot.query(j)
+    say(f"w={ot.s['w']} {'✓' if ot.s['w']>=3 else '✗'}")
+
+    return {'friend':fok,'mn':sb['mn'],'mj':sb['mj'],'syn':us,'gap':og,'judas':cr,
+            'w':sf['w'],'ds':sf['ds'],'ju':sf['ju'],'mi':sd['mi'],'fr':sd['fr'],'ti':sd['ti'],'sk':sd['sk'],
+            'replay':rm2,'thermal':ot.s['w']}
+
+def battery(wl, t0, rec=None):
+    """The fused attack battery on wl and the verdict (the default CLI run)."""
+    print(f"\n  ═══ ATTACKS (fused) ═══")
+    m=attacks(wl,say=print,rec=rec)
+
+    # ── 5. VERDICT ──
+    tt=time.time()-t0
+    Nf=(4**12-1)//3; gl=sum(log2(float(4**12-4**i)) for i in range(12))
+
+    print(f"""
 {'='*72}
   AEGIS AZAZEL v5 — BEAST 4 · SONIC BOOM
   7 Hells + Tilt · WRank · LazyT · XS128+ · Fused · Cascade Echo
 {'='*72}
 
-  PG(11,4) = {Nf:,} pts | GL(12,4) = {gl:.0f}-bit | {NS:,} cols
+  PG(11,4) = {Nf:,} pts | GL(12,4) = {gl:.0f}-bit | {wl.ns:,} cols
 
-  HELLS: {sb['mn']}m+{sb['mj']}M | {us}/10 syn | gap={og:.4f} | j={cr:.3f}
-         w={sf['w']} ds={sf['ds']} | mi={sd['mi']} ti={sd['ti']} sk={sd['sk']}
-         replay={rm2}/200 | thermal={ot.s['w']}w
+  HELLS: {m['mn']}m+{m['mj']}M | {m['syn']}/10 syn | gap={m['gap']:.4f} | j={m['judas']:.3f}
+         w={m['w']} ds={m['ds']} | mi={m['mi']} ti={m['ti']} sk={m['sk']}
+         replay={m['replay']}/200 | thermal={m['thermal']}w
   SHUFFLE: {'→'.join(vid)}
 
   Runtime: {tt:.1f}s {'💥 SONIC BOOM' if tt<3.5 else '🏎️ F1' if tt<5.0 else '✈️'}
@@ -714,3 +3331,112 @@ print(f"""
   SIG: {hashlib.sha256(asig+sa).hexdigest()[:48]}
 {'='*72}
 """)
+
+# ══════════════════════════════════════════════════════════════
+# SWEEP — the battery over many salts and attacker seeds (--sweep N)
+# ══════════════════════════════════════════════════════════════
+SWEEP_OK={'friend':lambda v: v==500,'replay':lambda v: v<20,'thermal':lambda v: v>=3}   # battery ✓ marks
+
+def sweep_sample(k):
+    """(tag, seeds) of sample k. Sample 0 is the CLI battery itself."""
+    if k==0: return b"", (42,666,7777)
+    h=hashlib.sha256(b"AZAZEL_SWEEP"+k.to_bytes(8,'big')).digest()
+    return h[:8], tuple(int.from_bytes(h[8+8*i:16+8*i],'big') for i in range(3))
+
+_sw=None   # the wall, inherited by forked sweep workers
+def _sweep_init(wl):
+    global _sw; _sw=wl
+def _sweep_one(k): return k, attacks(_sw,*sweep_sample(k))
+
+def sweep(wl, n, jobs=1, start=0):
+    """Samples start..start+n-1 → (k, metrics), yielded as they finish (any
+    order with jobs>1). Workers are forked after the wall is loaded, so a
+    cached wall's pages are shared rather than copied."""
+    wl.load(); ks=range(start,start+n)
+    if jobs<=1 or 'fork' not in mp.get_all_start_methods():
+        for k in ks: yield k, attacks(wl,*sweep_sample(k))
+        return
+    with mp.get_context('fork').Pool(jobs,_sweep_init,(wl,)) as pool:
+        yield from pool.imap_unordered(_sweep_one,ks,chunksize=max(1,min(8,n//(jobs*8))))
+
+def sweep_stats(rows):
+    """Per metric over the metric dicts rows: n, mean, 95% CI half-width (normal),
+    sd, min, p5, p50, p95, max; plus pass rates of the battery's ✓ checks."""
+    out={}
+    for k in rows[0]:
+        v=sorted(r[k] for r in rows); n=len(v); mu=sum(v)/n
+        sdv=sqrt(sum((x-mu)**2 for x in v)/(n-1)) if n>1 else 0.0
+        q=lambda p: v[min(n-1,int(p*n))]
+        out[k]={'n':n,'mean':mu,'ci95':1.96*sdv/sqrt(n),'sd':sdv,'min':v[0],
+                'p5':q(0.05),'p50':q(0.5),'p95':q(0.95),'max':v[-1]}
+    for k,f in SWEEP_OK.items(): out[k]['pass']=sum(map(f,(r[k] for r in rows)))/len(rows)
+    return out
+
+def run_sweep(wl, n, jobs=1, out=None):
+    """CLI --sweep: stream progress (and JSON lines to out), then the table."""
+    wl.load()
+    print(f"\n  ═══ SWEEP ═══  {n:,} battery samples | {wl.ns:,} columns | {jobs} job(s)", flush=True)
+    rows=[]; f=open(out,'w') if out else None; tty=sys.stdout.isatty(); t=time.perf_counter()
+    try:
+        for k,m in sweep(wl,n,jobs):
+            rows.append(m)
+            if f: f.write(json.dumps({'k':k,**m})+"\n"); f.flush()
+            if tty: print(f"\r  {len(rows):>6,}/{n:,}  {len(rows)/(time.perf_counter()-t):6.1f}/s",end="",flush=True)
+    finally:
+        if f: f.close()
+    dt=time.perf_counter()-t; st=sweep_stats(rows)
+    print(f"\r  {n:,} samples in {dt:.1f}s ({n/dt:.1f}/s)")
+    print(f"  {'metric':<9}{'mean':>10}{'±95%':>10}{'sd':>10}{'p5':>10}{'p50':>10}{'p95':>10}{'min':>10}{'max':>10}  pass")
+    for k,v in st.items():
+        print(f"  {k:<9}"+''.join(f"{v[c]:>10.5g}" for c in ('mean','ci95','sd','p5','p50','p95','min','max'))
+              +(f"  {v['pass']*100:5.1f}%" if 'pass' in v else ""))
+    if out: print(f"  → {out}")
+    return all(v.get('pass',1.0)==1.0 for v in st.values())
+
+def main(argv=None):
+    a=ap.parse_args(argv)
+    if a.compare: return 0 if bench_compare(*a.compare,a.threshold) else 1
+    t0=time.time()
+    print("=" * 72)
+    print("  AEGIS AZAZEL v5 — BEAST 4 · SONIC BOOM")
+    print("  7 Hells + Tilt · Incremental Rank · Lazy T · XorShift · Fused Battery")
+    print("  'Light as the wind. Fast and lethal.'")
+    print("=" * 72)
+    wl=Wall.from_args(a)   # built on first use: gf4/tmat/wrank never touch it
+    if a.record and (a.prof or a.deadline): ap.error("--record excludes --prof and --deadline")
+    dl=int(a.deadline*1000)
+    tr=Recorder(a.record,wl.key) if a.record and not a.workers else None
+    if a.bench:
+        if a.bench not in BENCH: ap.error(f"--bench: choose from {', '.join(BENCH)}")
+        kw={'reps':a.reps,'out':a.json} if a.bench=='phases' else {'dl':dl} if a.bench=='deadline' and dl else {}
+        return 0 if BENCH[a.bench](wl,**kw) else 1
+    if a.serve:
+        wl.load()
+        print(f"\n  ═══ SERVE ═══  {a.serve} | {wl.ns:,} columns | budget {a.budget_mb} MB"
+              +(f" | {a.workers} workers" if a.workers else "")+(f" | deadline {a.deadline:g} µs" if dl else ""),
+              flush=True)
+        if a.workers: serve_workers(wl,a.serve,a.workers,a.budget_mb<<20,fsk,a.prof,a.record,dl)
+        else:
+            pool=Pool(wl,a.budget_mb<<20,fsk,prof=Prof() if a.prof else None,tr=tr,dl=dl)
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+            try: asyncio.run(serve(a.serve,pool.handle,pool.idle if dl else None))
+            except KeyboardInterrupt: pass
+            finally:
+                if tr: tr.close()
+        return 0
+    if a.loadgen:
+        print(f"\n  ═══ LOADGEN ═══  {a.loadgen}", flush=True)
+        asyncio.run(loadgen(a.loadgen)); return 0
+    if a.sweep: return 0 if run_sweep(wl,a.sweep,a.jobs,a.json) else 1
+    if a.replay:
+        ok=True
+        for path in a.replay: ok&=run_replay(wl,path)
+        return 0 if ok else 1
+    wl.load()
+    print(f"\n  ═══ SONIC BOOM ORACLE ═══")
+    print(f"  {wl.ns:,} cols | WRank | LazyT | XS128+ | JBank[256]")
+    battery(wl, t0, tr)
+    if tr: tr.close(); print(f"  trace → {a.record}")
+    return 0
+
+if __name__=='__main__': sys.exit(main())